@@ -0,0 +1,232 @@
+import asyncio
+import httpx
+from analyzers.llm_interpreter import NameInterpreter, SYSTEM_PROMPT, BATCH_SYSTEM_PROMPT, console
+from utils.config import get_env
+from utils.resilience import ProviderError
+from utils import tracing
+
+class AsyncNameInterpreter:
+    """Asyncio interpretation backend for OpenAI and Ollama.
+
+    Reuses the provider, model and prompt building of a NameInterpreter, shares
+    one pooled HTTP client across requests and bounds the requests in flight.
+    With batch_size > 1 several names share one JSON-formatted request.
+    """
+
+    def __init__(self, interpreter=None, concurrency=None, timeout=None, batch_size=None):
+        self.interpreter = interpreter or NameInterpreter()
+        self.concurrency = concurrency or get_env("LLM_CONCURRENCY", 8, int)
+        self.timeout = timeout or self.interpreter.timeout
+        self.batch_size = batch_size or self.interpreter.batch_size
+        # Provider requests sent, and names that needed a single-name retry after a batched request
+        self.requests = 0
+        self.fallbacks = 0
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._http = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency
+            )
+        )
+        self._openai = None
+        if self.interpreter.provider == "openai":
+            from openai import AsyncOpenAI
+            # Retries are left to the interpreter's guard
+            self._openai = AsyncOpenAI(api_key=self.interpreter.api_key, http_client=self._http, max_retries=0)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the shared connection pool."""
+        if self._openai is not None:
+            await self._openai.close()
+        await self._http.aclose()
+
+    async def generate_interpretations(self, batch):
+        """Interpret every analysis dict in batch concurrently, preserving order.
+
+        With batch_size > 1 uncached names are sent batch_size at a time in one
+        request with a JSON reply; names whose entry is missing or invalid
+        are retried one by one. Results are cached per name either way.
+        """
+        if self.batch_size <= 1:
+            return await asyncio.gather(*(self.generate_interpretation(data) for data in batch))
+
+        cache = self.interpreter.cache
+        results = [None] * len(batch)
+        pending = []
+        for i, analysis_data in enumerate(batch):
+            cache_key = self.interpreter.prompt_key(analysis_data)
+            cached = cache.get(cache_key) if cache is not None else None
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append((i, analysis_data, cache_key))
+
+        groups = [pending[start:start + self.batch_size] for start in range(0, len(pending), self.batch_size)]
+        await asyncio.gather(*(self._generate_group(group, results) for group in groups))
+        return results
+
+    async def _generate_group(self, group, results):
+        """Interpret one micro-batch into results, retrying failed items as single requests."""
+        if len(group) == 1:
+            index, analysis_data, _ = group[0]
+            results[index] = await self.generate_interpretation(analysis_data)
+            return
+
+        interpretations = [None] * len(group)
+        async with self._semaphore:
+            try:
+                prompt = self.interpreter._create_batch_prompt([analysis_data for _, analysis_data, _ in group])
+                raw_response = await self.interpreter.guard.call_async(
+                    lambda: self._request_json(prompt, len(group)),
+                    tokens=self.interpreter.estimate_tokens(prompt, len(group))
+                )
+                interpretations = self.interpreter._parse_batch_response(raw_response, len(group))
+            except asyncio.TimeoutError:
+                console.print(f"[red]Batched interpretation of {len(group)} names timed out[/red]")
+            except Exception as e:
+                console.print(f"[red]Batched interpretation error: {e}[/red]")
+
+        cache = self.interpreter.cache
+        retries = []
+        for (index, analysis_data, cache_key), interpretation in zip(group, interpretations):
+            if interpretation is None:
+                retries.append((index, analysis_data))
+                continue
+            results[index] = interpretation
+            if cache is not None:
+                cache.set(cache_key, interpretation)
+
+        self.fallbacks += len(retries)
+        interpreted = await asyncio.gather(*(self.generate_interpretation(data) for _, data in retries))
+        for (index, _), interpretation in zip(retries, interpreted):
+            results[index] = interpretation
+
+    async def generate_interpretation(self, analysis_data):
+        """Generate one interpretation, waiting for a free slot first."""
+        cache = self.interpreter.cache
+        prompt, cache_key = self.interpreter._prompt_and_key(analysis_data)
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        async with self._semaphore:
+            try:
+                raw_interpretation = await self.interpreter.guard.call_async(
+                    lambda: self._request(prompt), tokens=self.interpreter.estimate_tokens(prompt)
+                )
+                interpretation = raw_interpretation.strip()
+                if cache is not None:
+                    cache.set(cache_key, interpretation)
+                return interpretation
+            except asyncio.TimeoutError:
+                console.print(f"[red]Interpretation timed out for {analysis_data.get('name', 'Unknown')}[/red]")
+                tracing.count('llm_fallbacks')
+                return self.interpreter.fallback_interpretation(analysis_data)
+            except Exception as e:
+                console.print(f"[red]Interpretation error: {e}[/red]")
+                tracing.count('llm_fallbacks')
+                return self.interpreter.fallback_interpretation(analysis_data)
+
+    async def _request(self, prompt):
+        """One provider request; the timeout cancels it in flight and counts as a failed attempt."""
+        if self.interpreter.provider == "openai":
+            request = self._generate_openai(prompt)
+        elif self.interpreter.provider == "ollama":
+            request = self._generate_ollama(prompt)
+        else:
+            raise ValueError(f"Unsupported provider: {self.interpreter.provider}")
+        return await asyncio.wait_for(request, timeout=self.timeout)
+
+    async def _request_json(self, prompt, count):
+        """One batched request for count names; a batch is given proportionally more time."""
+        if self.interpreter.provider == "openai":
+            request = self._generate_openai_json(prompt, count)
+        elif self.interpreter.provider == "ollama":
+            request = self._generate_ollama_json(prompt, count)
+        else:
+            raise ValueError(f"Unsupported provider: {self.interpreter.provider}")
+        return await asyncio.wait_for(request, timeout=self.timeout * count)
+
+    async def _generate_openai(self, prompt):
+        """Generate interpretation using the async OpenAI client."""
+        self.requests += 1
+        response = await self._openai.chat.completions.create(
+            model=self.interpreter.model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=self.interpreter.temperature,
+            max_tokens=self.interpreter.openai_max_tokens
+        )
+        return response.choices[0].message.content.strip()
+
+    async def _generate_openai_json(self, prompt, count):
+        """Generate a batched JSON reply for count names using the async OpenAI client."""
+        self.requests += 1
+        response = await self._openai.chat.completions.create(
+            model=self.interpreter.model,
+            messages=[
+                {"role": "system", "content": BATCH_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=self.interpreter.temperature,
+            # The JSON sections are terser than free text, but each name still needs its share
+            max_tokens=min(self.interpreter.openai_max_tokens * count, 4096),
+            response_format={"type": "json_object"}
+        )
+        return response.choices[0].message.content
+
+    async def _generate_ollama_json(self, prompt, count):
+        """Generate a batched JSON reply for count names using Ollama's JSON mode."""
+        self.requests += 1
+        response = await self._http.post(
+            f"{self.interpreter.base_url}/api/generate",
+            json={
+                "model": self.interpreter.model,
+                "system": BATCH_SYSTEM_PROMPT,
+                "prompt": prompt,
+                "format": "json",
+                "stream": False,
+                "options": {
+                    "temperature": self.interpreter.temperature,
+                    "num_predict": self.interpreter.ollama_num_predict * count
+                }
+            },
+            timeout=self.timeout * count
+        )
+        if response.status_code != 200:
+            raise ProviderError(f"Ollama API error: {response.text}", response.status_code)
+        return response.json()["response"]
+
+    async def _generate_ollama(self, prompt):
+        """Generate interpretation using the Ollama HTTP API."""
+        self.requests += 1
+        response = await self._http.post(
+            f"{self.interpreter.base_url}/api/generate",
+            json={
+                "model": self.interpreter.model,
+                "prompt": prompt,
+                "stream": False,
+                "options": {
+                    "temperature": self.interpreter.temperature,
+                    "num_predict": self.interpreter.ollama_num_predict
+                }
+            }
+        )
+        if response.status_code != 200:
+            raise ProviderError(f"Ollama API error: {response.text}", response.status_code)
+
+        interpretation = response.json()["response"].strip()
+        if not interpretation:
+            raise ValueError("Empty response from Ollama")
+
+        return self.interpreter.clean_text(interpretation.split('\n'))
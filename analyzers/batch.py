@@ -0,0 +1,329 @@
+import csv
+import os
+import time
+from analyzers.name_analyzer import NameAnalyzer, BATCH_COLUMNS, append_result_row
+from analyzers.name_token import NameToken
+from analyzers.parallel import ParallelNameAnalyzer
+from analyzers.dedup import DedupNameAnalyzer
+from analyzers.llm_interpreter import NameInterpreter
+
+# Arrow types for each batch column so every chunk writes the same schema
+COLUMN_TYPES = {
+    'name': 'string',
+    'destiny_number': 'int32',
+    'consonant_count': 'int32',
+    'vowel_count': 'int32',
+    'total_length': 'int32',
+    'base_frequency': 'float64',
+    'resonance_strength': 'float64',
+    'coherence': 'float64',
+    'harmonic_count': 'int32',
+    'frequency_range': 'float64',
+    'strongest_harmonic': 'float64',
+    'frequency_character': 'string',
+    'cultural_influence': 'float64',
+    'resonance_profile': 'string',
+    'harmonic_ratio': 'float64',
+    'vibration_type': 'string',
+    'error': 'string',
+    'dominant_culture': 'string',
+    'interpretation': 'string'
+}
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet support requires pyarrow. Install it with: pip install pyarrow")
+    return pyarrow
+
+def read_names(path, column='name', chunk_size=10000):
+    """Stream names from a CSV, Parquet or plain text file one at a time."""
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == '.parquet':
+        pa = _require_pyarrow()
+        parquet_file = pa.parquet.ParquetFile(path)
+        for record_batch in parquet_file.iter_batches(batch_size=chunk_size, columns=[column]):
+            for name in record_batch.column(0).to_pylist():
+                yield name or ''
+        return
+
+    with open(path, newline='', encoding='utf-8') as handle:
+        if extension == '.csv':
+            reader = csv.reader(handle)
+            header = next(reader, None)
+            if header is None:
+                return
+            if column in header:
+                index = header.index(column)
+            else:
+                # No matching header: treat the first row as data
+                index = 0
+                if header:
+                    yield header[0]
+            for row in reader:
+                yield row[index] if len(row) > index else ''
+        else:
+            for line in handle:
+                yield line.rstrip('\r\n')
+
+class ColumnWriter:
+    """Append result column chunks to a Parquet or CSV file."""
+
+    def __init__(self, path, columns=BATCH_COLUMNS):
+        self.path = path
+        self.columns = columns
+        self.format = 'parquet' if path.lower().endswith('.parquet') else 'csv'
+        self._writer = None
+        self._handle = None
+        self._schema = None
+
+    def write(self, columns):
+        if self.format == 'parquet':
+            self._write_parquet(columns)
+        else:
+            self._write_csv(columns)
+
+    def _write_parquet(self, columns):
+        pa = _require_pyarrow()
+        if self._writer is None:
+            self._schema = pa.schema([(key, getattr(pa, COLUMN_TYPES[key])()) for key in self.columns])
+            self._writer = pa.parquet.ParquetWriter(self.path, self._schema)
+        arrays = [pa.array(columns[key], type=self._schema.field(key).type)
+                  for key in self.columns]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def _write_csv(self, columns):
+        if self._handle is None:
+            self._handle = open(self.path, 'w', newline='', encoding='utf-8')
+            self._writer = csv.writer(self._handle)
+            self._writer.writerow(self.columns)
+        self._writer.writerows(zip(*(columns[key] for key in self.columns)))
+
+    def close(self):
+        if self.format == 'parquet' and self._writer is not None:
+            self._writer.close()
+        if self._handle is not None:
+            self._handle.close()
+
+def analysis_data_for_row(columns, index):
+    """Rebuild the analysis dict NameInterpreter expects from one row of result columns."""
+    return {
+        'name': columns['name'][index],
+        'numerology': {'destiny_number': columns['destiny_number'][index]},
+        'phonetics': {
+            'consonant_count': columns['consonant_count'][index],
+            'vowel_count': columns['vowel_count'][index],
+            'total_length': columns['total_length'][index]
+        },
+        'vibration': {
+            'base_frequency': columns['base_frequency'][index],
+            'resonance_strength': columns['resonance_strength'][index],
+            'frequency_character': columns['frequency_character'][index],
+            'resonance_profile': columns['resonance_profile'][index]
+        }
+    }
+
+def run_batch(input_path, output_path, column='name', chunk_size=10000, analyzer=None, workers=1,
+              interpret=False, concurrency=None, dedup=True, llm_batch_size=None):
+    """Analyze every name in input_path and write columnar results to output_path.
+
+    With dedup=True each distinct lowercased name is analyzed once and its
+    results are copied to every matching row. With interpret=True every row
+    also gets an LLM interpretation, with up to `concurrency` requests in
+    flight per chunk and `llm_batch_size` names per request.
+    """
+    if analyzer is None:
+        analyzer = ParallelNameAnalyzer(workers) if workers > 1 else NameAnalyzer(use_llm=False)
+    # Lookup table hits are counted by the analyzer, or summed from the workers' shards
+    lookup_analyzer = None
+    if isinstance(analyzer, ParallelNameAnalyzer) or (isinstance(analyzer, NameAnalyzer) and analyzer.lookup_table is not None):
+        lookup_analyzer = analyzer
+    if dedup:
+        analyzer = DedupNameAnalyzer(analyzer)
+    interpreter = NameInterpreter() if interpret else None
+    output_columns = BATCH_COLUMNS + ['interpretation'] if interpret else BATCH_COLUMNS
+    writer = ColumnWriter(output_path, columns=output_columns)
+    rows = 0
+    start_time = time.perf_counter()
+
+    try:
+        names = read_names(input_path, column=column, chunk_size=chunk_size)
+        for columns in analyzer.analyze_many(names, chunk_size=chunk_size):
+            if interpreter is not None:
+                columns['interpretation'] = _interpret_chunk(interpreter, columns, concurrency, llm_batch_size)
+            writer.write(columns)
+            rows += len(columns['name'])
+    finally:
+        writer.close()
+        if isinstance(analyzer, (ParallelNameAnalyzer, DedupNameAnalyzer)):
+            analyzer.close()
+        if interpreter is not None:
+            interpreter.close()
+
+    elapsed = time.perf_counter() - start_time
+    return {
+        'rows': rows,
+        'seconds': elapsed,
+        'names_per_second': rows / elapsed if elapsed > 0 else 0.0,
+        'analyzed': analyzer.analyzed if dedup else rows,
+        'dedup_ratio': analyzer.dedup_ratio if dedup else 1.0,
+        'lookup': lookup_analyzer.lookup_stats() if lookup_analyzer is not None else None
+    }
+
+def _interpret_chunk(interpreter, columns, concurrency, batch_size=None):
+    """Interpret each distinct name of a chunk once and copy the text to its duplicates."""
+    first_rows = {}
+    for i, name in enumerate(columns['name']):
+        first_rows.setdefault(name, i)
+    batch = [analysis_data_for_row(columns, i) for i in first_rows.values()]
+    interpretations = interpreter.generate_interpretations(batch, concurrency=concurrency, batch_size=batch_size)
+    by_name = dict(zip(first_rows, interpretations))
+    return [by_name[name] for name in columns['name']]
+
+def _analyzer_results(analyzer_name, analyzer, tokens):
+    """One analyzer's JSON-serializable result for each NameToken."""
+    if analyzer_name == 'numerology':
+        return [{'destiny_number': number} for number in analyzer._destiny_numbers(tokens)]
+    if analyzer_name == 'phonetics':
+        return [analyzer._analyze_phonetics(token) for token in tokens]
+    if analyzer_name == 'vibration':
+        return analyzer._vibrations(tokens)
+    if analyzer_name == 'cultural':
+        from analyzers.cultural_patterns import CulturalAnalyzer
+        # Blank names have no letters to find patterns in
+        return [CulturalAnalyzer.analyze(token).to_dict() if token.text.strip() else None for token in tokens]
+    raise ValueError(f"Unknown analyzer: {analyzer_name}")
+
+def _safe_analyzer_results(analyzer_name, analyzer, names):
+    """_analyzer_results for a list of names, and the names that failed, whose results are None.
+
+    If the batch call raises, the names are retried one at a time so one bad
+    row cannot fail the rest.
+    """
+    try:
+        return _analyzer_results(analyzer_name, analyzer, [NameToken(name) for name in names]), set()
+    except Exception as e:
+        print(f"Reanalysis error ({analyzer_name}): {str(e)}")
+    values = []
+    failed = set()
+    for name in names:
+        try:
+            values.extend(_analyzer_results(analyzer_name, analyzer, [NameToken(name)]))
+        except Exception as e:
+            print(f"Reanalysis error ({analyzer_name}) for {name!r}: {str(e)}")
+            values.append(None)
+            failed.add(name)
+    return values, failed
+
+def run_reanalysis(input_path, output_path=None, column='name', chunk_size=10000, store=None,
+                   interpret=False, concurrency=None, llm_batch_size=None, prune=False):
+    """Bring the stored results for every name in input_path up to date, recomputing only what changed.
+
+    Each analyzer's stored results are looked up under its current
+    fingerprint (see analyzers/fingerprint.py); only names without one are
+    recomputed. With interpret=True, interpretations are stored under their
+    prompt's cache key, so a name is re-interpreted only when its prompt
+    inputs changed. The current results are written to output_path if given.
+    """
+    from analyzers.fingerprint import ANALYZERS, analyzer_fingerprints
+    from utils.result_store import ResultStore
+
+    own_store = store is None
+    store = store or ResultStore()
+    analyzer = NameAnalyzer(use_llm=False)
+    fingerprints = analyzer_fingerprints()
+    interpreter = NameInterpreter() if interpret else None
+    counts = {name: {'computed': 0, 'reused': 0} for name in ANALYZERS + (['interpretation'] if interpret else [])}
+    output_columns = BATCH_COLUMNS + ['dominant_culture'] + (['interpretation'] if interpret else [])
+    writer = ColumnWriter(output_path, columns=output_columns) if output_path else None
+    rows = 0
+    start_time = time.perf_counter()
+
+    def process(names):
+        columns = _reanalyze_chunk(analyzer, store, fingerprints, names, output_columns, counts)
+        if interpreter is not None:
+            columns['interpretation'] = _reinterpret_chunk(
+                interpreter, store, columns, concurrency, llm_batch_size, counts['interpretation']
+            )
+        if writer is not None:
+            writer.write(columns)
+        return len(names)
+
+    try:
+        chunk = []
+        for name in read_names(input_path, column=column, chunk_size=chunk_size):
+            chunk.append(name)
+            if len(chunk) >= chunk_size:
+                rows += process(chunk)
+                chunk = []
+        if chunk:
+            rows += process(chunk)
+        if prune:
+            for analyzer_name in ANALYZERS:
+                store.prune(analyzer_name, fingerprints[analyzer_name])
+    finally:
+        if writer is not None:
+            writer.close()
+        if own_store:
+            store.close()
+        if interpreter is not None:
+            interpreter.close()
+
+    elapsed = time.perf_counter() - start_time
+    return {
+        'rows': rows,
+        'seconds': elapsed,
+        'fingerprints': fingerprints,
+        'counts': counts
+    }
+
+def _reanalyze_chunk(analyzer, store, fingerprints, names, output_columns, counts):
+    """Result columns for a chunk, from stored results where the fingerprint still matches."""
+    distinct = list(dict.fromkeys(names))
+    results = {}
+    for analyzer_name, fingerprint in fingerprints.items():
+        stored = store.get_many(analyzer_name, fingerprint, distinct)
+        missing = [name for name in distinct if name not in stored]
+        if missing:
+            values, failed = _safe_analyzer_results(analyzer_name, analyzer, missing)
+            # Failed names are not stored, so the next run tries them again
+            store.put_many(analyzer_name, fingerprint,
+                           ((name, value) for name, value in zip(missing, values) if name not in failed))
+            stored.update(zip(missing, values))
+        counts[analyzer_name]['computed'] += len(missing)
+        counts[analyzer_name]['reused'] += len(distinct) - len(missing)
+        results[analyzer_name] = stored
+
+    columns = {column: [] for column in output_columns}
+    for name in names:
+        append_result_row(columns, name, (results['numerology'][name] or {}).get('destiny_number'),
+                          results['phonetics'][name], results['vibration'][name])
+        columns['dominant_culture'].append((results['cultural'][name] or {}).get('dominant_culture'))
+    return columns
+
+def _reinterpret_chunk(interpreter, store, columns, concurrency, batch_size, counts):
+    """Interpretations for a chunk, generating only those whose prompt has no stored result."""
+    first_rows = {}
+    for i, name in enumerate(columns['name']):
+        first_rows.setdefault(name, i)
+    batch = {name: analysis_data_for_row(columns, i) for name, i in first_rows.items()}
+    keys = {name: interpreter.prompt_key(data) for name, data in batch.items()}
+
+    interpretations = store.get_keyed('interpretation', keys.items())
+    missing = [name for name in batch if name not in interpretations]
+    if missing:
+        generated = interpreter.generate_interpretations(
+            [batch[name] for name in missing], concurrency=concurrency, batch_size=batch_size
+        )
+        interpretations.update(zip(missing, generated))
+        # Fallbacks are not stored, so those names are tried again on the next run
+        store.put_keyed('interpretation', [
+            (name, keys[name], text) for name, text in zip(missing, generated)
+            if not interpreter.is_fallback(text)
+        ])
+    counts['computed'] += len(missing)
+    counts['reused'] += len(batch) - len(missing)
+    return [interpretations[name] for name in columns['name']]
@@ -1,5 +1,63 @@
 from collections import defaultdict
+from functools import lru_cache
 import re
+from analyzers.pattern_automaton import PatternAutomaton
+from analyzers.pattern_index import get_pattern_index
+from analyzers.name_token import lowercase
+
+# Lowercased names whose CulturalResult is kept in memory
+CULTURAL_CACHE_SIZE = 4096
+
+class CulturalResult:
+    """Immutable cultural analysis of one name, shared by every caller asking for it.
+
+    patterns holds (culture, type, pattern, meaning) tuples in table order and
+    special_meanings (type, pattern, meaning) tuples. Endings and roots are
+    counted per culture in the same pass that collects the cultural roots, so
+    the dominant culture is the one with the most of them; ties go to the
+    culture matched first, i.e. the earliest in PATTERNS.
+    """
+
+    __slots__ = ('name', 'patterns', 'special_meanings', 'structure_notes', 'character_essence',
+                 'culture_counts', 'cultural_roots', 'dominant_culture')
+
+    def __init__(self, name, patterns, special_meanings, structure_notes, character_essence):
+        culture_counts = {}
+        for culture, match_type, _, _ in patterns:
+            count = culture_counts.get(culture, 0)
+            culture_counts[culture] = count + 1 if match_type in ('endings', 'root') else count
+
+        values = {
+            'name': name,
+            'patterns': patterns,
+            'special_meanings': special_meanings,
+            'structure_notes': structure_notes,
+            'character_essence': character_essence,
+            'culture_counts': tuple(culture_counts.items()),
+            'cultural_roots': tuple(culture_counts),
+            'dominant_culture': max(culture_counts, key=culture_counts.get) if culture_counts else None
+        }
+        for key, value in values.items():
+            object.__setattr__(self, key, value)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("CulturalResult is immutable")
+
+    def __delattr__(self, key):
+        raise AttributeError("CulturalResult is immutable")
+
+    def to_dict(self):
+        """The analyze_cultural_elements dict, built fresh so callers may modify it."""
+        return {
+            'patterns': [{'type': match_type, 'pattern': pattern, 'meaning': meaning}
+                         for _, match_type, pattern, meaning in self.patterns],
+            'cultural_roots': list(self.cultural_roots),
+            'special_meanings': [{'type': match_type, 'pattern': pattern, 'meaning': meaning}
+                                 for match_type, pattern, meaning in self.special_meanings],
+            'structure_notes': list(self.structure_notes),
+            'dominant_culture': self.dominant_culture,
+            'character_essence': list(self.character_essence)
+        }
 
 class CulturalAnalyzer:
     """Analyzer for cultural name patterns and their significance."""
@@ -77,95 +135,89 @@ class CulturalAnalyzer:
         r'([aeiou])\1': 'contains spiritual resonance'
     }
 
+    # Compiled at import time by compile_patterns()
+    AUTOMATON = None
+    STRUCTURE_REGEXES = []
+    # Memory-mapped index of external dictionaries (see analyzers/pattern_index.py), if compiled
+    EXTERNAL_INDEX = None
+
     @staticmethod
-    def analyze_cultural_elements(name):
-        """Analyze cultural elements in a name."""
-        name = name.lower()
-        results = {
-            'patterns': [],
-            'cultural_roots': set(),
-            'special_meanings': [],
-            'structure_notes': [],
-            'dominant_culture': None,
-            'character_essence': []
-        }
-        
-        # Check for cultural patterns
+    def compile_patterns():
+        """Compile PATTERNS, COMBINATIONS and STRUCTURES for analyze_cultural_elements."""
+        automaton = PatternAutomaton()
+        # Values are added in the order the tables were originally scanned, so
+        # matches come back in the same order as well
         for culture, patterns in CulturalAnalyzer.PATTERNS.items():
-            matches = []
-            
-            # Check endings and elements
-            for section in ['endings', 'elements']:
-                if section in patterns:
-                    for pattern, meaning in patterns[section].items():
-                        if pattern in name:
-                            matches.append({
-                                'type': section,
-                                'pattern': pattern,
-                                'meaning': meaning
-                            })
-                            results['cultural_roots'].add(culture)
-            
-            # Check roots if available
-            if 'roots' in patterns:
-                for root, meaning in patterns['roots'].items():
-                    if root in name:
-                        matches.append({
-                            'type': 'root',
-                            'pattern': root,
-                            'meaning': meaning
-                        })
-                        results['cultural_roots'].add(culture)
-            
-            if matches:
-                results['patterns'].extend(matches)
-        
-        # Analyze special combinations
+            for section, match_type in [('endings', 'endings'), ('elements', 'elements'), ('roots', 'root')]:
+                for pattern, meaning in patterns.get(section, {}).items():
+                    automaton.add(pattern, (culture, match_type, pattern, meaning))
         for comb_type, combinations in CulturalAnalyzer.COMBINATIONS.items():
             for pattern, meaning in combinations.items():
-                if pattern in name:
-                    results['special_meanings'].append({
-                        'type': comb_type,
-                        'pattern': pattern,
-                        'meaning': meaning
-                    })
+                automaton.add(pattern, (None, comb_type, pattern, meaning))
+        CulturalAnalyzer.AUTOMATON = automaton.build()
+        CulturalAnalyzer.STRUCTURE_REGEXES = [
+            (re.compile(pattern), meaning) for pattern, meaning in CulturalAnalyzer.STRUCTURES.items()
+        ]
+        try:
+            CulturalAnalyzer.EXTERNAL_INDEX = get_pattern_index()
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Pattern index error: {str(e)}")
+            CulturalAnalyzer.EXTERNAL_INDEX = None
+        # Memoized results were computed against the previous tables
+        CulturalAnalyzer._analyze_lowercase.cache_clear()
+
+    @staticmethod
+    def analyze(name):
+        """Analyze cultural elements in a name (a string or NameToken), returning a shared, memoized CulturalResult."""
+        return CulturalAnalyzer._analyze_lowercase(lowercase(name))
+
+    @staticmethod
+    @lru_cache(maxsize=CULTURAL_CACHE_SIZE)
+    def _analyze_lowercase(name):
+        # One pass of the automaton finds every ending, element, root and combination
+        matches = CulturalAnalyzer.AUTOMATON.matches(name)
+        patterns = [match for match in matches if match[0] is not None]
+        special_meanings = tuple((section, pattern, meaning) for culture, section, pattern, meaning in matches
+                                 if culture is None)
+        
+        # Add patterns from external dictionaries not already covered by the built-in tables
+        if CulturalAnalyzer.EXTERNAL_INDEX is not None:
+            seen = {match[:3] for match in patterns}
+            patterns.extend(match for match in CulturalAnalyzer.EXTERNAL_INDEX.matches(name)
+                            if match[:3] not in seen)
         
         # Analyze name structure
-        for pattern, meaning in CulturalAnalyzer.STRUCTURES.items():
-            if re.search(pattern, name):
-                results['structure_notes'].append(meaning)
+        structure_notes = tuple(meaning for regex, meaning in CulturalAnalyzer.STRUCTURE_REGEXES
+                                if regex.search(name))
         
         # Determine character essence based on first and last letters
         first_char = name[0]
         last_char = name[-1]
+        character_essence = (
+            "Begins with spiritual energy" if first_char in 'aeiou' else "Begins with grounding force",
+            "Concludes with open possibilities" if last_char in 'aeiou' else "Concludes with practical manifestation"
+        )
         
-        if first_char in 'aeiou':
-            results['character_essence'].append("Begins with spiritual energy")
-        else:
-            results['character_essence'].append("Begins with grounding force")
-            
-        if last_char in 'aeiou':
-            results['character_essence'].append("Concludes with open possibilities")
-        else:
-            results['character_essence'].append("Concludes with practical manifestation")
-        
-        # Determine dominant culture if any
-        if results['cultural_roots']:
-            results['dominant_culture'] = max(results['cultural_roots'], 
-                                           key=lambda x: sum(1 for p in results['patterns'] 
-                                                          if p.get('type') in ['endings', 'roots']))
-        
-        results['cultural_roots'] = list(results['cultural_roots'])
-        return results
+        return CulturalResult(name, tuple(patterns), special_meanings, structure_notes, character_essence)
+
+    @staticmethod
+    def analyze_cultural_elements(name):
+        """Analyze cultural elements in a name."""
+        return CulturalAnalyzer.analyze(name).to_dict()
 
     @staticmethod
     def get_unique_interpretation(name, patterns):
         """Generate unique interpretation based on name patterns."""
-        name = name.lower()
+        name = lowercase(name)
         interpretations = []
         
-        # Get cultural analysis
-        analysis = CulturalAnalyzer.analyze_cultural_elements(name)
+        # Reuse the caller's analysis when given, otherwise the memoized one
+        if isinstance(patterns, CulturalResult):
+            analysis = patterns.to_dict()
+        elif isinstance(patterns, dict):
+            analysis = patterns
+        else:
+            analysis = CulturalAnalyzer.analyze(name).to_dict()
         
         # Add cultural essence
         if analysis['dominant_culture']:
@@ -196,3 +248,5 @@ class CulturalAnalyzer:
             interpretations.append(f"The {special['pattern']} in your name suggests {special['meaning']}")
         
         return interpretations
+
+CulturalAnalyzer.compile_patterns()
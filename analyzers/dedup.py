@@ -0,0 +1,85 @@
+from collections import OrderedDict
+from analyzers.name_analyzer import BATCH_COLUMNS
+
+def normalize_name(name):
+    """Dedup key for a name: its lowercased form, unless lowercasing changes its length.
+
+    Lowercasing leaves every batch column unchanged, HumanName's split into
+    first, middle and last name included, except where it changes the
+    length ('İ' becomes 'i' plus a combining dot), which changes
+    total_length; such names are their own key.
+    """
+    lowered = name.lower()
+    return lowered if len(lowered) == len(name) else name
+
+class DedupNameAnalyzer:
+    """Analyze each distinct normalized name once and fan the results out to every row.
+
+    Wraps a NameAnalyzer or ParallelNameAnalyzer and produces the same columns
+    in the same order; only the 'name' column keeps each row's original
+    spelling. Results are kept in a bounded LRU cache across chunks, so the
+    most frequent names of a skewed list are analyzed once per run.
+    """
+
+    def __init__(self, analyzer, max_entries=200000):
+        self.analyzer = analyzer
+        self.max_entries = max_entries
+        self._results = OrderedDict()
+        self.rows = 0
+        self.analyzed = 0
+
+    @property
+    def dedup_ratio(self):
+        """Rows produced per name actually analyzed."""
+        return self.rows / self.analyzed if self.analyzed else 1.0
+
+    def stats(self):
+        return {
+            'rows': self.rows,
+            'analyzed': self.analyzed,
+            'dedup_ratio': self.dedup_ratio
+        }
+
+    def close(self):
+        if hasattr(self.analyzer, 'close'):
+            self.analyzer.close()
+
+    def analyze_many(self, names, chunk_size=10000):
+        """Analyze an iterable of names, yielding one dict of result columns per chunk."""
+        chunk = []
+        for name in names:
+            chunk.append(name)
+            if len(chunk) >= chunk_size:
+                yield self._analyze_chunk(chunk)
+                chunk = []
+        if chunk:
+            yield self._analyze_chunk(chunk)
+
+    def _analyze_chunk(self, names):
+        keys = [normalize_name(name) for name in names]
+        results = self._results
+
+        # Analyze the keys this run has not seen (or has evicted), once each
+        missing = list(dict.fromkeys(key for key in keys if key not in results))
+        if missing:
+            for columns in self.analyzer.analyze_many(missing, chunk_size=len(missing)):
+                value_columns = [columns[column] for column in BATCH_COLUMNS[1:]]
+                for i, key in enumerate(columns['name']):
+                    results[key] = tuple(values[i] for values in value_columns)
+            self.analyzed += len(missing)
+
+        columns = {column: [] for column in BATCH_COLUMNS}
+        columns['name'] = list(names)
+        rows = []
+        for key in keys:
+            results.move_to_end(key)
+            rows.append(results[key])
+        for column, values in zip(BATCH_COLUMNS[1:], zip(*rows)):
+            columns[column] = list(values)
+
+        # Evict least recently used keys only after the chunk has been fanned out
+        while len(results) > self.max_entries:
+            results.popitem(last=False)
+
+        self.rows += len(names)
+        return columns
@@ -0,0 +1,64 @@
+import hashlib
+import inspect
+import json
+
+# Analyzers whose per-name results are versioned, in output order
+ANALYZERS = ['numerology', 'phonetics', 'vibration', 'cultural']
+
+def fingerprint(*parts):
+    """Short stable hash of source code strings and JSON-serializable tables."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=repr)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+def _sources(*objects):
+    return [inspect.getsource(obj) for obj in objects]
+
+def _tables(cls):
+    """A class's upper-case data tables (LETTER_QUALITIES, PATTERNS, ...) as currently loaded."""
+    return {
+        key: value for key, value in vars(cls).items()
+        if key.isupper() and isinstance(value, (dict, list, tuple, str, int, float))
+    }
+
+def _package_version(package):
+    try:
+        from importlib.metadata import version
+        return version(package)
+    except Exception:
+        return None
+
+def analyzer_fingerprints():
+    """{analyzer: fingerprint} over each analyzer's code and tables.
+
+    A fingerprint changes whenever its module source changes, including
+    edits to comments, or when a table is modified at runtime. Vibration
+    also covers the CMUdict version, and cultural covers the checksums of
+    the external pattern index.
+    """
+    from analyzers import name_analyzer, name_token, numerology, vibration, phoneme_index
+    from analyzers import cultural_patterns, pattern_automaton, pattern_index
+    NameAnalyzer = name_analyzer.NameAnalyzer
+    VibrationAnalyzer = vibration.VibrationAnalyzer
+    CulturalAnalyzer = cultural_patterns.CulturalAnalyzer
+
+    # Every analyzer reads names through NameToken
+    token = _sources(name_token)
+    external = CulturalAnalyzer.EXTERNAL_INDEX
+    return {
+        'numerology': fingerprint(
+            token, _sources(numerology, NameAnalyzer._analyze_numerology, NameAnalyzer._destiny_numbers)
+        ),
+        'phonetics': fingerprint(token, _sources(NameAnalyzer._analyze_phonetics)),
+        'vibration': fingerprint(
+            token,
+            _sources(vibration, phoneme_index, NameAnalyzer._analyze_vibration, NameAnalyzer._vibrations),
+            _tables(VibrationAnalyzer),
+            _package_version('cmudict')
+        ),
+        'cultural': fingerprint(
+            token,
+            _sources(cultural_patterns, pattern_automaton, pattern_index),
+            _tables(CulturalAnalyzer),
+            {culture: shard['checksum'] for culture, shard in external.manifest['shards'].items()} if external else None
+        )
+    }
@@ -1,53 +1,141 @@
-from collections import Counter
 import numpy as np
-from rich.table import Table
-
-def analyze_frequency(name):
-    """Calculate frequency patterns in a name using numpy."""
-    # Remove spaces and convert to lowercase
-    name = name.lower().replace(" ", "")
-    
-    if not name:
+from analyzers.name_token import NameToken
+
+def character_count_matrix(names, alphabet=None):
+    """Count each name's lowercased characters (spaces excluded) with one np.bincount.
+
+    names can be strings or NameTokens. Returns (alphabet, counts): the sorted
+    list of characters that head the columns, by default every character that
+    occurs in the batch, and an (n_names, len(alphabet)) int64 count matrix.
+    Characters outside a given alphabet are not counted.
+    """
+    tokens = [NameToken.of(name) for name in names]
+    lengths = np.array([len(token.lowered) for token in tokens], dtype=np.int64)
+    codes = np.frombuffer(''.join(token.lowered for token in tokens).encode('utf-32-le'), dtype=np.uint32)
+    rows = np.repeat(np.arange(len(tokens)), lengths)
+
+    keep = codes != ord(' ')
+    if alphabet is None:
+        alphabet_codes = np.unique(codes[keep])
+    else:
+        alphabet_codes = np.array(sorted({ord(char) for char in alphabet} - {ord(' ')}), dtype=np.uint32)
+
+    columns = np.searchsorted(alphabet_codes, codes)
+    in_alphabet = columns < len(alphabet_codes)
+    in_alphabet[in_alphabet] = alphabet_codes[columns[in_alphabet]] == codes[in_alphabet]
+    keep &= in_alphabet
+
+    width = len(alphabet_codes)
+    counts = np.bincount(rows[keep] * width + columns[keep], minlength=len(tokens) * width)
+    return [chr(code) for code in alphabet_codes], counts.reshape(len(tokens), width)
+
+def frequency_statistics(alphabet, counts):
+    """Row-wise frequency statistics of a count matrix from character_count_matrix.
+
+    Returns a dict of float64 arrays: total, average_frequency, mean, median,
+    std and entropy (mean, median and std are over the character code
+    points). Rows with no characters get NaN.
+    """
+    codes = np.array([ord(char) for char in alphabet], dtype=np.float64)
+    counts = np.asarray(counts, dtype=np.int64)
+    total = counts.sum(axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        frequencies = counts / total[:, None]
+        present = counts > 0
+        unique = present.sum(axis=1)
+        log_frequencies = np.log2(frequencies, where=present, out=np.zeros_like(frequencies))
+        entropy = -(frequencies * log_frequencies).sum(axis=1)
+        average_frequency = frequencies.sum(axis=1) / unique
+
+        mean = counts @ codes / total
+        variance = (counts * (codes[None, :] - mean[:, None]) ** 2).sum(axis=1) / total
+
+    # The median is the middle code point (or the average of the two middle ones)
+    cumulative = np.cumsum(counts, axis=1)
+    lower = np.argmax(cumulative > ((total - 1) // 2)[:, None], axis=1)
+    upper = np.argmax(cumulative > (total // 2)[:, None], axis=1)
+    median = (codes[lower] + codes[upper]) / 2 if len(codes) else np.zeros(len(total))
+
+    empty = total == 0
+    for values in (entropy, average_frequency, mean, variance, median):
+        values[empty] = np.nan
+    return {
+        'total': total,
+        'average_frequency': average_frequency,
+        'mean': mean,
+        'median': median,
+        'std': np.sqrt(variance),
+        'entropy': entropy
+    }
+
+def analyze_frequency_batch(names, alphabet=None):
+    """Frequency analysis for many names at once.
+
+    Returns the alphabet, the (n_names, alphabet) 'counts' matrix and the
+    frequency_statistics arrays, computed with whole-matrix operations.
+    """
+    alphabet, counts = character_count_matrix(names, alphabet)
+    results = frequency_statistics(alphabet, counts)
+    results['alphabet'] = alphabet
+    results['counts'] = counts
+    return results
+
+def render_frequency_chart(distribution, max_bar_length=20):
+    """Text bar chart of a character_distribution, most frequent characters first."""
+    viz_lines = []
+    for char, freq in sorted(distribution.items(), key=lambda x: x[1], reverse=True):
+        bar_length = int(freq * max_bar_length)
+        bar = "█" * bar_length
+        viz_lines.append(f"{char}: {freq:.3f} {bar}")
+    return "\n".join(viz_lines)
+
+def analyze_frequency(name, visualize=False):
+    """Calculate frequency patterns in a name (a string or NameToken) using numpy.
+
+    Counts come from one np.bincount over the code points, and every statistic
+    is computed from those counts. The bar chart in 'visualization' is only
+    rendered with visualize=True; otherwise it is None and
+    render_frequency_chart can draw it later.
+    """
+    token = NameToken.of(name)
+    # Code points of the lowercased name, without spaces
+    values = np.frombuffer(token.codes, dtype=np.uint8 if token.is_ascii else np.uint32)
+    values = values[values != ord(' ')]
+    total_chars = len(values)
+
+    if not total_chars:
         return {
             "average_frequency": 0,
             "character_distribution": {},
             "statistics": {},
             "visualization": None
         }
-    
-    # Count character frequencies using numpy
-    unique_chars = np.array(list(set(name)))
-    counts = np.array([name.count(char) for char in unique_chars])
-    total_chars = len(name)
-    
-    # Calculate frequency distribution
+
+    if token.is_ascii:
+        counts = np.bincount(values)
+        codes = np.flatnonzero(counts)
+        counts = counts[codes]
+    else:
+        # Code points can be large, so count the distinct ones instead of binning them all
+        codes, counts = np.unique(values, return_counts=True)
+
     frequencies = counts / total_chars
-    
-    # Calculate statistics using numpy
-    ascii_values = np.array([ord(char) for char in name])
+    mean = (codes @ counts) / total_chars
+    cumulative = np.cumsum(counts)
+    middle = codes[np.searchsorted(cumulative, [(total_chars - 1) // 2, total_chars // 2], side='right')]
     stats = {
-        "mean": np.mean(ascii_values),
-        "median": np.median(ascii_values),
-        "std": np.std(ascii_values),
-        "entropy": -np.sum(frequencies * np.log2(frequencies))
+        "mean": mean,
+        "median": middle.mean(),
+        "std": np.sqrt(((codes - mean) ** 2 @ counts) / total_chars),
+        "entropy": -(frequencies @ np.log2(frequencies))
     }
-    
-    # Create frequency visualization
-    distribution = dict(zip(unique_chars, frequencies))
-    
-    # Create visualization string
-    viz_lines = []
-    max_bar_length = 20
-    
-    for char, freq in sorted(distribution.items(), key=lambda x: x[1], reverse=True):
-        bar_length = int(freq * max_bar_length)
-        bar = "█" * bar_length
-        viz_lines.append(f"{char}: {freq:.3f} {bar}")
-    
+    distribution = dict(zip(map(chr, codes.tolist()), frequencies.tolist()))
+
     # Convert numpy types to Python native types for JSON serialization
     return {
         "average_frequency": float(np.mean(frequencies)),
-        "character_distribution": {k: float(v) for k, v in distribution.items()},
+        "character_distribution": distribution,
         "statistics": {k: float(v) for k, v in stats.items()},
-        "visualization": "\n".join(viz_lines)
+        "visualization": render_frequency_chart(distribution) if visualize else None
     }
@@ -1,18 +1,43 @@
 import os
-from openai import OpenAI
-import requests
 from rich.console import Console
 from rich.panel import Panel
 from dotenv import load_dotenv
 import threading
-import time
+import itertools
 import json
+import re
+from utils.config import get_env
+from utils.interpretation_cache import InterpretationCache
+from utils.resilience import ProviderGuard, ProviderError, Fallback
+from utils import tracing
 
 # Load environment variables at the start
 load_dotenv(override=True)  # Add override=True to ensure values are updated
 
 console = Console()
 
+SYSTEM_PROMPT = """You are a name analysis expert. Structure your response with these exact section headers:
+
+Overall Impression:
+Key Strengths:
+Growth Areas:
+Life Path Insights:
+Deeper Analysis:
+
+For Key Strengths and Growth Areas, use numbered points (1., 2., etc.)."""
+
+BATCH_SYSTEM_PROMPT = """You are a name analysis expert. You interpret several names in one reply and answer with a single JSON object only."""
+
+# JSON keys of a batched interpretation and the section headers they are rendered under
+BATCH_SECTIONS = [
+    ('overall_impression', 'Overall Impression'),
+    ('key_strengths', 'Key Strengths'),
+    ('growth_areas', 'Growth Areas'),
+    ('life_path_insights', 'Life Path Insights'),
+    ('deeper_analysis', 'Deeper Analysis')
+]
+LIST_SECTIONS = {'key_strengths', 'growth_areas'}
+
 class NameInterpreter:
     def __init__(self):
         """Initialize LLM interpreter based on environment configuration."""
@@ -21,21 +46,42 @@ class NameInterpreter:
         self.provider = raw_provider.lower().strip().split('#')[0].strip()
         
         console.print(f"[yellow]Using LLM Provider: {self.provider}[/yellow]")
+
+        # Generation settings shared by the sync and async backends
+        self.temperature = 0.7
+        self.openai_max_tokens = 1000
+        self.ollama_num_predict = 500
+        self.timeout = get_env("LLM_TIMEOUT", 30.0, float)
+        # Names packed into one request by generate_interpretations (1 = one request per name)
+        self.batch_size = get_env("LLM_BATCH_SIZE", 1, int)
+        # Rate limits, retries and the circuit breaker, shared with the async backend
+        self.guard = ProviderGuard.from_env()
+        self.template_fallback = get_env("LLM_TEMPLATE_FALLBACK", "true").lower() not in ("false", "0", "no")
+        # Connection pools, created on first use: a blocking client for single Ollama requests,
+        # and async interpreters on a background event loop for generate_interpretations
+        self._http = None
+        self._loop = None
+        self._loop_thread = None
+        self._async_interpreters = {}
         
         if self.provider == "openai":
             self.api_key = os.getenv("OPENAI_API_KEY")
             if not self.api_key:
                 raise ValueError("OpenAI API key not found. Please set OPENAI_API_KEY in your .env file.")
-            self.client = OpenAI(api_key=self.api_key)
+            # Imported here: the openai package alone takes most of a second to import
+            from openai import OpenAI
+            # Retries are left to self.guard
+            self.client = OpenAI(api_key=self.api_key, max_retries=0)
             self.model = "gpt-3.5-turbo"
             console.print("[green]Successfully initialized OpenAI client[/green]")
         elif self.provider == "ollama":
             raw_model = os.getenv("OLLAMA_MODEL", "mistral")
             self.model = raw_model.strip().split('#')[0].strip()
             console.print(f"[yellow]Debug: Using Ollama model: {self.model}[/yellow]")
-            self.base_url = "http://localhost:11434"
+            self.base_url = get_env("OLLAMA_BASE_URL", "http://localhost:11434").rstrip('/')
             
             # Test Ollama connection and model availability
+            import requests
             try:
                 # Check if service is running
                 response = requests.get(f"{self.base_url}/api/tags")
@@ -57,6 +103,10 @@ class NameInterpreter:
         
         console.print(f"\n[cyan]Using {self.provider.upper()} model: {self.model}[/cyan]")
 
+        # Interpretations are cached on disk and shared by the CLI and the Streamlit app
+        cache_enabled = get_env("INTERPRETATION_CACHE_ENABLED", "true").lower() not in ("false", "0", "no")
+        self.cache = InterpretationCache() if cache_enabled else None
+
         # Add interpretation templates
         self.interpretation_templates = {
             'high_resonance': {
@@ -79,18 +129,19 @@ class NameInterpreter:
             }
         }
 
+    @tracing.traced('interpret')
     def generate_interpretation(self, analysis_data):
         """Generate interpretation using selected LLM provider."""
         try:
-            prompt = self._create_prompt(analysis_data)
+            with tracing.span('interpret.prompt'):
+                prompt, cache_key = self._prompt_and_key(analysis_data)
+            if self.cache is not None:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    return cached
             
-            # Generate interpretation
-            if self.provider == "openai":
-                raw_interpretation = self._generate_openai(prompt)
-            elif self.provider == "ollama":
-                raw_interpretation = self._generate_ollama(prompt)
-            else:
-                raise ValueError(f"Unsupported provider: {self.provider}")
+            # Generate interpretation, with rate limiting and retries
+            raw_interpretation = self.guard.call(lambda: self._generate(prompt), tokens=self.estimate_tokens(prompt))
             
             # Clean up the raw interpretation and return it directly
             cleaned_text = raw_interpretation.strip()
@@ -98,32 +149,227 @@ class NameInterpreter:
             # Debug output to console
             console.print("[yellow]Generated interpretation:[/yellow]")
             console.print(Panel(cleaned_text, title="Interpretation", border_style="green"))
+
+            if self.cache is not None:
+                self.cache.set(cache_key, cleaned_text)
             
             return cleaned_text
             
         except Exception as e:
             console.print(f"[red]Interpretation error: {e}[/red]")
-            return "Unable to generate interpretation."
+            tracing.count('llm_fallbacks')
+            return self.fallback_interpretation(analysis_data)
 
-    def _generate_openai(self, prompt):
-        """Generate interpretation using OpenAI."""
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": """You are a name analysis expert. Structure your response with these exact section headers:
+    def _generate(self, prompt):
+        """One request to the configured provider."""
+        if self.provider == "openai":
+            return self._generate_openai(prompt)
+        if self.provider == "ollama":
+            return self._generate_ollama(prompt)
+        raise ValueError(f"Unsupported provider: {self.provider}")
+
+    def estimate_tokens(self, prompt, count=1):
+        """Rough token cost of a request for the rate limiter: ~4 characters per prompt token plus the reply limit."""
+        max_tokens = self.openai_max_tokens if self.provider == "openai" else self.ollama_num_predict
+        return len(prompt) // 4 + max_tokens * count
+
+    def fallback_interpretation(self, analysis_data):
+        """Rule-based interpretation from interpretation_templates, used when the provider fails.
+
+        Falls back to a fixed message if LLM_TEMPLATE_FALLBACK is off. The
+        result is a Fallback string, which is_fallback recognizes; it is never
+        cached, so the LLM is asked again once it recovers.
+        """
+        if not self.template_fallback:
+            return Fallback("Unable to generate interpretation.")
+        vibration = analysis_data.get('vibration', {}) or {}
+        numerology = analysis_data.get('numerology', {}) or {}
+        template = self.interpretation_templates.get(
+            f"{vibration.get('resonance_profile')}_resonance", self.interpretation_templates['medium_resonance']
+        )
+        destiny_number = numerology.get('destiny_number', 'Unknown')
+        strengths = '\n'.join(f"{number}. {point}" for number, point in enumerate(template['strengths'], 1))
+        challenges = '\n'.join(f"{number}. {point}" for number, point in enumerate(template['challenges'], 1))
+        return Fallback(f"""Overall Impression:
+{template['summary']}.
 
-Overall Impression:
 Key Strengths:
+{strengths}
+
 Growth Areas:
+{challenges}
+
 Life Path Insights:
+{template['life_path']}.
+
 Deeper Analysis:
+Destiny Number {destiny_number} points to {self._get_numerology_meaning(destiny_number)}, and the name's {vibration.get('frequency_character', 'balanced')} vibration shapes how that energy is expressed.""")
+
+    @staticmethod
+    def is_fallback(interpretation):
+        """True if an interpretation came from fallback_interpretation rather than the provider."""
+        return isinstance(interpretation, Fallback)
+
+    def stream_interpretation(self, analysis_data):
+        """Yield interpretation text chunks as the provider produces them.
+
+        Cached interpretations are yielded in one piece; a complete streamed
+        interpretation is stored in the cache once the stream ends.
+        """
+        # Spans cannot stay open across a yield, so only the prompt and the requests are timed
+        with tracing.span('interpret.prompt'):
+            prompt, cache_key = self._prompt_and_key(analysis_data)
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        parts = []
+        try:
+            # Only opening the stream is retried; a stream that breaks midway is not restarted
+            chunks = self.guard.call(lambda: self._open_stream(prompt), tokens=self.estimate_tokens(prompt))
+            for chunk in chunks:
+                if chunk:
+                    parts.append(chunk)
+                    yield chunk
+        except Exception as e:
+            console.print(f"[red]Interpretation error: {e}[/red]")
+            if not parts:
+                tracing.count('llm_fallbacks')
+                yield self.fallback_interpretation(analysis_data)
+            return
+
+        interpretation = ''.join(parts).strip()
+        if interpretation and self.cache is not None:
+            if self.provider == "ollama":
+                # Cache the form _generate_ollama stores under the same key
+                interpretation = self.clean_text(interpretation.split('\n'))
+            self.cache.set(cache_key, interpretation)
+
+    def _open_stream(self, prompt):
+        """Start a provider stream and wait for its first chunk, so connection errors surface here."""
+        if self.provider == "openai":
+            chunks = self._stream_openai(prompt)
+        elif self.provider == "ollama":
+            chunks = self._stream_ollama(prompt)
+        else:
+            raise ValueError(f"Unsupported provider: {self.provider}")
+        for chunk in chunks:
+            return itertools.chain([chunk], chunks)
+        return iter(())
+
+    def _stream_openai(self, prompt):
+        """Stream interpretation tokens from OpenAI."""
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=self.temperature,
+            max_tokens=self.openai_max_tokens,
+            stream=True
+        )
+        for event in stream:
+            if event.choices and event.choices[0].delta.content:
+                yield event.choices[0].delta.content
+
+    def _stream_ollama(self, prompt):
+        """Stream interpretation tokens from Ollama's newline-delimited JSON responses."""
+        import requests
+        with requests.post(
+            f"{self.base_url}/api/generate",
+            json={
+                "model": self.model,
+                "prompt": prompt,
+                "stream": True,
+                "options": {
+                    "temperature": self.temperature,
+                    "num_predict": self.ollama_num_predict
+                }
+            },
+            stream=True,
+            timeout=self.timeout
+        ) as response:
+            if response.status_code != 200:
+                raise ProviderError(f"Ollama API error: {response.text}", response.status_code)
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                if data.get("error"):
+                    raise ConnectionError(f"Ollama API error: {data['error']}")
+                yield data.get("response", "")
+                if data.get("done"):
+                    break
+
+    def prompt_key(self, analysis_data):
+        """Key the interpretation of analysis_data is cached under; it changes whenever its prompt would."""
+        return self._prompt_and_key(analysis_data)[1]
 
-For Key Strengths and Growth Areas, use numbered points (1., 2., etc.)."""},
+    def _prompt_and_key(self, analysis_data):
+        prompt = self._create_prompt(analysis_data)
+        return prompt, self._cache_key(prompt)
+
+    def _cache_key(self, prompt):
+        """Cache key for a prompt under the current provider settings."""
+        return InterpretationCache.make_key(prompt, self.provider, self.model, self.temperature)
+
+    def generate_interpretations(self, batch, concurrency=None, batch_size=None):
+        """Interpret a list of analysis dicts, keeping up to `concurrency` requests in flight.
+
+        With batch_size > 1 (default: LLM_BATCH_SIZE) that many names share
+        each request; see AsyncNameInterpreter.generate_interpretations.
+        """
+        import asyncio
+        from analyzers.async_interpreter import AsyncNameInterpreter
+
+        if self._loop is None:
+            # A loop of our own, so this works from inside a running event loop and
+            # every call of a batch run shares one connection pool
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(target=self._loop.run_forever, name='llm-interpreter-loop', daemon=True)
+            self._loop_thread.start()
+        key = (concurrency, batch_size)
+        async_interpreter = self._async_interpreters.get(key)
+        if async_interpreter is None:
+            async_interpreter = self._async_interpreters[key] = AsyncNameInterpreter(
+                self, concurrency=concurrency, batch_size=batch_size
+            )
+        future = asyncio.run_coroutine_threadsafe(async_interpreter.generate_interpretations(batch), self._loop)
+        return future.result()
+
+    def close(self):
+        """Close the connection pools and the cache, and stop the background event loop."""
+        import asyncio
+
+        if self._loop is not None:
+            for async_interpreter in self._async_interpreters.values():
+                asyncio.run_coroutine_threadsafe(async_interpreter.aclose(), self._loop).result()
+            self._async_interpreters = {}
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
+            self._loop.close()
+            self._loop = self._loop_thread = None
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+
+    def _generate_openai(self, prompt):
+        """Generate interpretation using OpenAI."""
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.7,
-                max_tokens=1000
+                temperature=self.temperature,
+                max_tokens=self.openai_max_tokens
             )
             
             return response.choices[0].message.content.strip()
@@ -133,54 +379,25 @@ For Key Strengths and Growth Areas, use numbered points (1., 2., etc.)."""},
             raise
 
     def _generate_ollama(self, prompt):
-        """Generate interpretation using Ollama with timeout."""
-        def request_target():
-            nonlocal response_data
+        """Generate interpretation using Ollama with a blocking request on a pooled connection."""
+        import httpx
+
+        with console.status("[cyan]Generating interpretation with Ollama...[/cyan]"):
             try:
-                response = requests.post(
+                response = self._http_client().post(
                     f"{self.base_url}/api/generate",
                     json={
                         "model": self.model,
                         "prompt": prompt,
                         "stream": False,
                         "options": {
-                            "temperature": 0.7,
-                            "num_predict": 500
+                            "temperature": self.temperature,
+                            "num_predict": self.ollama_num_predict
                         }
-                    },
-                    timeout=30
+                    }
                 )
-                response_data['response'] = response
-            except Exception as e:
-                response_data['error'] = e
-
-        with console.status("[cyan]Generating interpretation with Ollama...[/cyan]") as status:
-            try:
-                # Initialize response data
-                response_data = {'response': None, 'error': None}
-                interrupted = False
-                
-                # Create and start request thread
-                request_thread = threading.Thread(target=request_target)
-                request_thread.daemon = True  # Allow the thread to be killed
-                request_thread.start()
-                
-                # Wait for response with timeout
-                start_time = time.time()
-                while request_thread.is_alive():
-                    if time.time() - start_time > 30:  # 30 seconds timeout
-                        raise RequestTimeout("Request took too long")
-                    if interrupted: 
-                        raise KeyboardInterrupt
-                    time.sleep(0.1)
-                
-                # Check for errors
-                if response_data['error']:
-                    raise response_data['error']
-                
-                response = response_data['response']
                 if response.status_code != 200:
-                    raise ConnectionError(f"Ollama API error: {response.text}")
+                    raise ProviderError(f"Ollama API error: {response.text}", response.status_code)
                 
                 interpretation = response.json()["response"].strip()
                 if not interpretation:
@@ -191,11 +408,19 @@ For Key Strengths and Growth Areas, use numbered points (1., 2., etc.)."""},
             except KeyboardInterrupt:
                 console.print("\n[red]Operation cancelled by user[/red]")
                 raise
-            except RequestTimeout:
+            except httpx.TimeoutException as e:
                 console.print("\n[red]Request timed out. Cancelling...[/red]")
-                raise ConnectionError("Request timed out")
-            except Exception as e:
-                raise ConnectionError(f"Ollama error: {str(e)}")
+                raise ConnectionError("Request timed out") from e
+            except httpx.TransportError as e:
+                # Only transport failures become retryable errors; bad replies and bugs propagate as they are
+                raise ConnectionError(f"Ollama error: {str(e)}") from e
+
+    def _http_client(self):
+        """Blocking HTTP client for Ollama, created on first use and kept for its open connections."""
+        if self._http is None:
+            import httpx
+            self._http = httpx.Client(timeout=self.timeout)
+        return self._http
 
     def _create_prompt(self, analysis_data):
         """Create a structured prompt for the LLM based on analysis data."""
@@ -249,6 +474,80 @@ Keep each section concise and focused. Use natural language and avoid technical
             console.print(f"[red]Error creating prompt: {str(e)}[/red]")
             return f"Please analyze the name '{analysis_data.get('name', 'Unknown')}' in natural language paragraphs."
 
+    def _create_batch_prompt(self, batch):
+        """Create one prompt for several analysis dicts, asking for a JSON reply keyed by item id."""
+        lines = []
+        for item_id, analysis_data in enumerate(batch):
+            numerology = analysis_data.get('numerology', {}) or {}
+            vibration = analysis_data.get('vibration', {}) or {}
+            phonetics = analysis_data.get('phonetics', {}) or {}
+            destiny_number = numerology.get('destiny_number', 'Unknown')
+            lines.append(
+                f"[{item_id}] {analysis_data.get('name', 'Unknown')}: "
+                f"Destiny Number {destiny_number} ({self._get_numerology_meaning(destiny_number)}); "
+                f"{vibration.get('base_frequency', 'Unknown')} Hz, {vibration.get('resonance_strength', 'Unknown')} resonance, "
+                f"{vibration.get('frequency_character', 'Unknown')} character; "
+                f"{phonetics.get('consonant_count', 'Unknown')} consonants, {phonetics.get('vowel_count', 'Unknown')} vowels, "
+                f"{self._analyze_sound_pattern(phonetics)}"
+            )
+        names = '\n'.join(lines)
+        return f"""Provide a structured analysis for each of the following names, based on its data:
+
+{names}
+
+Reply with one JSON object containing an entry for every name, using the same ids:
+{{"interpretations": [{{"id": 0, "overall_impression": "...", "key_strengths": ["...", "...", "..."], "growth_areas": ["...", "..."], "life_path_insights": "...", "deeper_analysis": "..."}}]}}
+
+Give three key strengths and two growth areas. Keep each section concise and focused. Use natural language and avoid technical jargon.
+"""
+
+    def _parse_batch_response(self, text, count):
+        """Validate a batched JSON reply; returns one interpretation, or None if invalid, per item.
+
+        Valid items are rendered with the same section headers as a
+        single-name interpretation.
+        """
+        results = [None] * count
+        try:
+            data = json.loads(text)
+        except ValueError:
+            # Tolerate prose or code fences around the JSON object
+            start, end = text.find('{'), text.rfind('}')
+            try:
+                data = json.loads(text[start:end + 1]) if 0 <= start < end else None
+            except ValueError:
+                data = None
+        items = data.get('interpretations') if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            return results
+
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            item_id = item.get('id')
+            if isinstance(item_id, str) and item_id.strip().isdigit():
+                item_id = int(item_id)
+            if type(item_id) is not int or not 0 <= item_id < count or results[item_id] is not None:
+                continue
+            sections = []
+            for key, header in BATCH_SECTIONS:
+                value = item.get(key)
+                if key in LIST_SECTIONS:
+                    if not isinstance(value, list) or not all(isinstance(point, str) and point.strip() for point in value):
+                        break
+                    points = [re.sub(r'^\s*\d+[.)]\s*', '', point).strip() for point in value]
+                    body = '\n'.join(f"{number}. {point}" for number, point in enumerate(points, 1))
+                elif isinstance(value, str) and value.strip():
+                    body = value.strip()
+                else:
+                    break
+                if not body:
+                    break
+                sections.append(f"{header}:\n{body}")
+            else:
+                results[item_id] = '\n\n'.join(sections)
+        return results
+
     def _analyze_sound_pattern(self, phonetics):
         """Analyze the sound pattern of the name."""
         consonants = phonetics.get('consonant_count', 0)
@@ -324,6 +623,3 @@ Keep each section concise and focused. Use natural language and avoid technical
         except Exception as e:
             console.print(f"[red]Error in formatting: {str(e)}[/red]")
             return "No interpretation available."
-
-class RequestTimeout(Exception):
-    pass
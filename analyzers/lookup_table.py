@@ -0,0 +1,323 @@
+import hashlib
+import os
+import numpy as np
+from utils.array_store import save_arrays, load_meta, load_arrays
+from utils.config import get_env
+
+DEFAULT_LOOKUP_TABLE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'lookup_table'
+)
+
+# Analyzers whose results the table holds; it is stale once any of their fingerprints change
+TABLE_ANALYZERS = ['numerology', 'phonetics', 'vibration']
+
+# Vibration values stored as float64; some are ints in live results (round() of an int stays
+# an int), and strongest_harmonic is None for names without harmonics
+FLOAT_FIELDS = [
+    'base_frequency', 'resonance_strength', 'coherence', 'frequency_range',
+    'strongest_harmonic', 'cultural_influence', 'harmonic_ratio'
+]
+
+# Fixed-width record of every stored result, 69 bytes with no padding; bit i of
+# int_mask is set when FLOAT_FIELDS[i] was an int, and of none_mask when it was None
+RECORD_TYPE = np.dtype([
+    ('destiny_number', 'u1'),
+    ('int_mask', 'u1'),
+    ('none_mask', 'u1'),
+    ('consonant_count', 'u2'),
+    ('vowel_count', 'u2'),
+    ('total_length', 'u2'),
+    ('harmonic_count', 'u2'),
+    ('frequency_character', 'u1'),
+    ('resonance_profile', 'u1'),
+    ('base_frequency', 'f8'),
+    ('resonance_strength', 'f8'),
+    ('coherence', 'f8'),
+    ('frequency_range', 'f8'),
+    ('strongest_harmonic', 'f8'),
+    ('cultural_influence', 'f8'),
+    ('harmonic_ratio', 'f8')
+])
+
+# Record fields holding a result value
+VALUE_FIELDS = [field for field in RECORD_TYPE.names if field not in ('int_mask', 'none_mask')]
+
+# Record fields stored as codes into the category lists kept in meta.json
+CATEGORY_FIELDS = ['frequency_character', 'resonance_profile']
+
+# Average names per displacement bucket, and slots per stored name
+BUCKET_SIZE = 4
+LOAD_FACTOR = 0.9
+# Displacements tried per bucket before the build starts over with a new seed, 64 at a time
+MAX_DISPLACEMENT = 1 << 20
+DISPLACEMENT_BATCH = 64
+
+def _hashes(key, seed):
+    """Bucket hash and the two slot hashes (the second odd) of a key, from one BLAKE2b digest."""
+    value = int.from_bytes(hashlib.blake2b(key, digest_size=16, key=seed).digest(), 'little')
+    return value & 0xFFFFFFFFFFFFFFFF, (value >> 64) & 0xFFFFFFFF, (value >> 96) | 1
+
+class LookupTable:
+    """Precomputed numerology, phonetics and vibration results for a fixed list of names.
+
+    A memory-mapped key/value file: a hash-and-displace perfect hash sends
+    each lowercased name to its own slot (slot = (f1 + d * f2) % size, with one
+    displacement d per bucket of names), and each slot holds the name's key
+    bytes and one fixed-width RECORD_TYPE record. A lookup is one hash, one
+    key comparison and one record read, whatever the table size; names that
+    are not in the table get an empty slot or a different key and miss.
+    """
+
+    VERSION = 1
+
+    # Array files making up a table directory
+    ARRAYS = ['displacements', 'keys', 'key_offsets', 'records']
+
+    def __init__(self, path):
+        self.path = path
+        meta = load_meta(path, self.VERSION, "Lookup table")
+
+        self.fingerprints = meta['fingerprints']
+        self.categories = meta['categories']
+        self.size = meta['size']
+        self._seed = bytes.fromhex(meta['seed'])
+        self._count = meta['count']
+        for name, array in load_arrays(path, self.ARRAYS).items():
+            setattr(self, name, array)
+        self._keys = memoryview(self.keys)
+        self._key_offsets = memoryview(self.key_offsets)
+        self._displacements = memoryview(self.displacements)
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, name):
+        return self._find(name) >= 0
+
+    def _find(self, name):
+        """Return the name's slot, or -1."""
+        key = name.lower()
+        # Lowercasing that changes the length would change total_length
+        if len(key) != len(name):
+            return -1
+        key = key.encode('utf-8')
+        bucket, f1, f2 = _hashes(key, self._seed)
+        slot = (f1 + self._displacements[bucket % len(self._displacements)] * f2) % self.size
+        if self._keys[self._key_offsets[slot]:self._key_offsets[slot + 1]] != key:
+            return -1
+        return slot
+
+    def get_row(self, name):
+        """(destiny_number, phonetics, vibration) for append_result_row, or None if the name is not stored."""
+        slot = self._find(name)
+        if slot < 0:
+            return None
+        (destiny_number, int_mask, none_mask, consonant_count, vowel_count, total_length, harmonic_count,
+         frequency_character, resonance_profile, *floats) = self.records[slot].item()
+        if int_mask or none_mask:
+            floats = [None if none_mask >> i & 1 else int(value) if int_mask >> i & 1 else value
+                      for i, value in enumerate(floats)]
+        phonetics = {
+            'consonant_count': consonant_count,
+            'vowel_count': vowel_count,
+            'total_length': total_length,
+            'analysis_type': 'phonetic'
+        }
+        base_frequency, resonance_strength, coherence, frequency_range, strongest_harmonic, \
+            cultural_influence, harmonic_ratio = floats
+        vibration = {
+            'base_frequency': base_frequency,
+            'resonance_strength': resonance_strength,
+            'coherence': coherence,
+            'harmonic_count': harmonic_count,
+            'frequency_range': frequency_range,
+            'strongest_harmonic': strongest_harmonic,
+            'frequency_character': self.categories['frequency_character'][frequency_character],
+            'cultural_influence': cultural_influence,
+            'resonance_profile': self.categories['resonance_profile'][resonance_profile],
+            'harmonic_ratio': harmonic_ratio,
+            'analysis_type': 'vibration'
+        }
+        return destiny_number, phonetics, vibration
+
+    def get(self, name):
+        """The numerology, phonetics and vibration results of analyze_name, or None if the name is not stored."""
+        row = self.get_row(name)
+        if row is None:
+            return None
+        destiny_number, phonetics, vibration = row
+        return {
+            'numerology': {'destiny_number': destiny_number, 'analysis_type': 'numerology'},
+            'phonetics': phonetics,
+            'vibration': vibration
+        }
+
+    def coverage(self, names):
+        """(found, total) over an iterable of names, e.g. a sample of production traffic."""
+        found = total = 0
+        for name in names:
+            total += 1
+            found += self._find(name) >= 0
+        return found, total
+
+    @classmethod
+    def build(cls, path, names, limit=None, chunk_size=10000):
+        """Analyze names (most common first) and write the results of the first `limit` distinct ones.
+
+        Names are stored lowercased. Names whose analysis reports an error,
+        or whose results do not fit a record, are left out and keep being
+        analyzed live.
+        """
+        from analyzers.name_analyzer import NameAnalyzer
+        from analyzers.fingerprint import analyzer_fingerprints
+
+        keys = []
+        seen = set()
+        for name in names:
+            key = name.strip().lower() if name else ''
+            if key and len(key) == len(name.strip()) and key not in seen:
+                seen.add(key)
+                keys.append(key)
+                if limit and len(keys) >= limit:
+                    break
+        seen = None
+
+        # Analyze with live code only, never from an existing table
+        analyzer = NameAnalyzer(use_llm=False, use_lookup=False)
+        categories = {field: {} for field in CATEGORY_FIELDS}
+        stored_keys = []
+        record_chunks = []
+        for columns in analyzer.analyze_many(keys, chunk_size=chunk_size):
+            stored = [i for i in range(len(columns['name'])) if cls._storable(columns, i)]
+            records = np.zeros(len(stored), dtype=RECORD_TYPE)
+            for mask, matches in (('int_mask', lambda value: isinstance(value, int)),
+                                  ('none_mask', lambda value: value is None)):
+                records[mask] = [
+                    sum(1 << bit for bit, field in enumerate(FLOAT_FIELDS) if matches(columns[field][i]))
+                    for i in stored
+                ]
+            for field in VALUE_FIELDS:
+                values = [columns[field][i] for i in stored]
+                if field in FLOAT_FIELDS:
+                    values = [np.nan if value is None else value for value in values]
+                if field in CATEGORY_FIELDS:
+                    lookup = categories[field]
+                    values = [lookup.setdefault(value, len(lookup)) for value in values]
+                records[field] = values
+            stored_keys.extend(columns['name'][i] for i in stored)
+            record_chunks.append(records)
+        records = np.concatenate(record_chunks) if record_chunks else np.zeros(0, dtype=RECORD_TYPE)
+        encoded = [key.encode('utf-8') for key in stored_keys]
+
+        size = max(1, int(len(encoded) / LOAD_FACTOR) + 1)
+        bucket_count = max(1, len(encoded) // BUCKET_SIZE)
+        for attempt in range(8):
+            seed = hashlib.blake2b(f"{attempt}".encode(), digest_size=16).digest()
+            placed = cls._place(encoded, seed, size, bucket_count)
+            if placed is not None:
+                break
+        else:
+            raise ValueError("Could not build a perfect hash for these names")
+        displacements, slots = placed
+
+        # Lay keys and records out in slot order; empty slots get an empty key
+        slot_rows = np.full(size, -1, dtype=np.int64)
+        slot_rows[slots] = np.arange(len(encoded))
+        key_lengths = np.zeros(size, dtype=np.int64)
+        key_lengths[slots] = [len(key) for key in encoded]
+        key_offsets = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(key_lengths, out=key_offsets[1:])
+        slot_records = np.zeros(size, dtype=RECORD_TYPE)
+        slot_records[slots] = records
+        key_data = b''.join(encoded[row] for row in slot_rows if row >= 0)
+
+        fingerprints = analyzer_fingerprints()
+        arrays = {
+            'displacements': displacements,
+            'keys': np.frombuffer(key_data, dtype=np.uint8),
+            'key_offsets': key_offsets,
+            'records': slot_records
+        }
+        meta = {
+            'version': cls.VERSION,
+            'seed': seed.hex(),
+            'size': size,
+            'count': len(encoded),
+            'fingerprints': {name: fingerprints[name] for name in TABLE_ANALYZERS},
+            'categories': {field: list(lookup) for field, lookup in categories.items()}
+        }
+        save_arrays(path, arrays, meta)
+        return cls(path)
+
+    @staticmethod
+    def _storable(columns, i):
+        """True if row i of analyze_many columns is error-free and fits RECORD_TYPE."""
+        if columns['error'][i] is not None or columns['vibration_type'][i] != 'vibration':
+            return False
+        if any(columns[field][i] is None for field in VALUE_FIELDS if field not in FLOAT_FIELDS):
+            return False
+        return (1 <= columns['destiny_number'][i] <= 9
+                and all(0 <= columns[field][i] <= 0xFFFF
+                        for field in ('consonant_count', 'vowel_count', 'total_length', 'harmonic_count')))
+
+    @staticmethod
+    def _place(encoded, seed, size, bucket_count):
+        """Hash-and-displace: (displacements, slot of each key), or None if a bucket cannot be placed."""
+        hashes = np.array([_hashes(key, seed) for key in encoded], dtype=np.uint64).reshape(-1, 3)
+        bucket_of = hashes[:, 0] % np.uint64(bucket_count)
+        order = np.argsort(bucket_of, kind='stable')
+        bounds = np.searchsorted(bucket_of[order], np.arange(bucket_count + 1, dtype=np.uint64))
+
+        displacements = np.zeros(bucket_count, dtype=np.uint32)
+        slots = np.zeros(len(encoded), dtype=np.int64)
+        taken = np.zeros(size, dtype=bool)
+        # Displacements tried together for one bucket
+        trials = np.arange(DISPLACEMENT_BATCH, dtype=np.uint64)[:, None]
+        # Largest buckets first, while the table is still mostly empty
+        for bucket in np.argsort(-np.diff(bounds), kind='stable'):
+            rows = order[bounds[bucket]:bounds[bucket + 1]]
+            if not len(rows):
+                break
+            f1, f2 = hashes[rows, 1], hashes[rows, 2]
+            for base in range(0, MAX_DISPLACEMENT, DISPLACEMENT_BATCH):
+                # One row of candidate slots per displacement
+                candidates = ((f1 + (trials + np.uint64(base)) * f2) % np.uint64(size)).astype(np.int64)
+                free = ~taken[candidates].any(axis=1)
+                if len(rows) > 1:
+                    ordered = np.sort(candidates, axis=1)
+                    free &= (ordered[:, 1:] != ordered[:, :-1]).all(axis=1)
+                hits = np.flatnonzero(free)
+                if len(hits):
+                    break
+            else:
+                return None
+            displacements[bucket] = base + hits[0]
+            taken[candidates[hits[0]]] = True
+            slots[rows] = candidates[hits[0]]
+        return displacements, slots
+
+# Process-wide table, opened on first use
+_table = None
+_table_checked = False
+
+def get_lookup_table(path=None):
+    """Open the shared lookup table, or None if none has been built or it is out of date."""
+    global _table, _table_checked
+    if not _table_checked:
+        _table_checked = True
+        path = path or get_env("LOOKUP_TABLE_PATH", DEFAULT_LOOKUP_TABLE_PATH)
+        if not os.path.isdir(path):
+            return None
+        try:
+            table = LookupTable(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Lookup table error: {str(e)}")
+            return None
+        from analyzers.fingerprint import analyzer_fingerprints
+        fingerprints = analyzer_fingerprints()
+        if any(table.fingerprints.get(name) != fingerprints[name] for name in TABLE_ANALYZERS):
+            print(f"Lookup table at {path} was built by older analyzers; rebuild it with: "
+                  f"python main.py lookup <names> --build")
+            return None
+        _table = table
+    return _table
@@ -1,5 +1,9 @@
+import numpy as np
 from analyzers.vibration import VibrationAnalyzer
-from analyzers.llm_interpreter import NameInterpreter
+from analyzers.numerology import pack_names, segment_totals
+from analyzers.name_token import NameToken
+from analyzers.lookup_table import get_lookup_table
+from utils import tracing
 
 class NameProfile:
     def __init__(self, name):
@@ -35,19 +39,84 @@ class NameProfile:
             'insights': self.insights
         }
 
+# Flat result columns produced by analyze_many, in output order
+BATCH_COLUMNS = [
+    'name',
+    'destiny_number',
+    'consonant_count',
+    'vowel_count',
+    'total_length',
+    'base_frequency',
+    'resonance_strength',
+    'coherence',
+    'harmonic_count',
+    'frequency_range',
+    'strongest_harmonic',
+    'frequency_character',
+    'cultural_influence',
+    'resonance_profile',
+    'harmonic_ratio',
+    'vibration_type',
+    'error'
+]
+
+def append_result_row(columns, name, destiny_number, phonetics, vibration):
+    """Append one row of BATCH_COLUMNS from a name's phonetics and vibration results."""
+    phonetics = phonetics or {}
+    vibration = vibration or {}
+    errors = [d['error'] for d in (phonetics, vibration) if 'error' in d]
+
+    columns['name'].append(name)
+    columns['destiny_number'].append(destiny_number)
+    columns['consonant_count'].append(phonetics.get('consonant_count'))
+    columns['vowel_count'].append(phonetics.get('vowel_count'))
+    columns['total_length'].append(phonetics.get('total_length'))
+    for key in BATCH_COLUMNS[5:-2]:
+        columns[key].append(vibration.get(key))
+    columns['vibration_type'].append(vibration.get('analysis_type') if 'error' not in vibration else None)
+    columns['error'].append('; '.join(errors) if errors else None)
+
 class NameAnalyzer:
-    def __init__(self):
+    def __init__(self, use_llm=True, use_lookup=True):
         self.vibration_analyzer = VibrationAnalyzer()
-        self.interpreter = NameInterpreter()
+        # The LLM client is created on first use; batch jobs never create one
+        self.use_llm = use_llm
+        self._interpreter = None
+        # Precomputed results for common names, if a lookup table has been built
+        self.lookup_table = get_lookup_table() if use_lookup else None
+        self.lookup_hits = 0
+        self.lookup_misses = 0
 
-    def analyze_name(self, name):
+    @property
+    def interpreter(self):
+        """The NameInterpreter, created (and its provider checked) on first access; None without LLM."""
+        if self.use_llm and self._interpreter is None:
+            from analyzers.llm_interpreter import NameInterpreter
+            self._interpreter = NameInterpreter()
+        return self._interpreter
+
+    @tracing.traced('analyze_name')
+    def analyze_name(self, name, interpret=True):
+        """Analyze a name; with interpret=False the LLM step is left to stream_interpretation."""
         try:
             profile = NameProfile(name)
             
-            # Run individual analyses
-            numerology_data = self._analyze_numerology(name)
-            phonetics_data = self._analyze_phonetics(name)
-            vibration_data = self._analyze_vibration(name)
+            with tracing.span('analyze_name.lookup'):
+                stored = self._lookup(name)
+            if stored is not None:
+                numerology_data, phonetics_data, vibration_data = (
+                    stored['numerology'], stored['phonetics'], stored['vibration']
+                )
+            else:
+                # Parse once and share the token between the analyses
+                with tracing.span('analyze_name.parse'):
+                    token = NameToken(name)
+                with tracing.span('analyze_name.numerology'):
+                    numerology_data = self._analyze_numerology(token)
+                with tracing.span('analyze_name.phonetics'):
+                    phonetics_data = self._analyze_phonetics(token)
+                with tracing.span('analyze_name.vibration'):
+                    vibration_data = self._analyze_vibration(token)
             
             # Update profile with analyses
             profile.add_analysis('numerology', numerology_data)
@@ -63,6 +132,8 @@ class NameAnalyzer:
             }
             
             # Generate interpretation
+            if not interpret or not self.use_llm:
+                return profile
             try:
                 interpretation = self.interpreter.generate_interpretation(analysis_data)
                 if interpretation:
@@ -83,9 +154,141 @@ class NameAnalyzer:
             profile.add_analysis('error', {'message': str(e)})
             return profile
 
+    def stream_interpretation(self, profile):
+        """Yield interpretation chunks for an analyzed profile, then store the full text on it."""
+        if self.interpreter is None:
+            return
+        analyses = profile.analyses
+        analysis_data = {
+            'name': profile.name,
+            'numerology': analyses.get('numerology'),
+            'phonetics': analyses.get('phonetics'),
+            'vibration': analyses.get('vibration')
+        }
+        parts = []
+        for chunk in self.interpreter.stream_interpretation(analysis_data):
+            parts.append(chunk)
+            yield chunk
+        interpretation = ''.join(parts).strip()
+        if interpretation:
+            profile.add_analysis('interpretation', interpretation)
+            profile.add_insight(interpretation)
+
+    def analyze_many(self, names, chunk_size=10000):
+        """Analyze an iterable of names, yielding one dict of result columns per chunk."""
+        chunk = []
+        for name in names:
+            chunk.append(name)
+            if len(chunk) >= chunk_size:
+                yield self._analyze_chunk(chunk)
+                chunk = []
+        if chunk:
+            yield self._analyze_chunk(chunk)
+
+    def analyze_profiles(self, names, chunk_size=10000):
+        """Analyze an iterable of names into one columnar ProfileBatch."""
+        from analyzers.profile_batch import ProfileBatch
+        return ProfileBatch.from_names(names, self, chunk_size)
+
+    def lookup_stats(self):
+        """Names answered from the lookup table and names analyzed live since this analyzer was created."""
+        total = self.lookup_hits + self.lookup_misses
+        return {
+            'hits': self.lookup_hits,
+            'misses': self.lookup_misses,
+            'coverage': self.lookup_hits / total if total else 0.0
+        }
+
+    def _lookup(self, name):
+        """Stored analyze_name results for a name, or None if it has to be analyzed live."""
+        if self.lookup_table is None:
+            return None
+        stored = self.lookup_table.get(name)
+        if stored is None:
+            self.lookup_misses += 1
+            tracing.count('lookup_misses')
+        else:
+            self.lookup_hits += 1
+            tracing.count('lookup_hits')
+        return stored
+
+    @tracing.traced('analyze_chunk')
+    def _analyze_chunk(self, names):
+        """Run the deterministic analyses for a chunk of names into flat columns."""
+        columns = {column: [] for column in BATCH_COLUMNS}
+        with tracing.span('analyze_chunk.lookup', names=len(names)):
+            stored_rows = [self.lookup_table.get_row(name) for name in names] if self.lookup_table is not None else None
+        missing = names
+        if stored_rows is not None:
+            missing = [name for name, row in zip(names, stored_rows) if row is None]
+            self.lookup_misses += len(missing)
+            self.lookup_hits += len(names) - len(missing)
+            tracing.count('lookup_misses', len(missing))
+            tracing.count('lookup_hits', len(names) - len(missing))
+
+        with tracing.span('analyze_chunk.parse', names=len(missing)):
+            tokens = [NameToken(name) for name in missing]
+        with tracing.span('analyze_chunk.numerology', names=len(missing)):
+            destiny_numbers = self._destiny_numbers(tokens)
+        with tracing.span('analyze_chunk.vibration', names=len(missing)):
+            vibrations = self._vibrations(tokens)
+        computed = zip(tokens, destiny_numbers, vibrations)
+        if stored_rows is None:
+            for token, destiny_number, vibration in computed:
+                self._append_row(columns, token, destiny_number, vibration)
+            return columns
+
+        # Stored rows and computed ones, in input order
+        for name, row in zip(names, stored_rows):
+            if row is None:
+                self._append_row(columns, *next(computed))
+            else:
+                append_result_row(columns, name, *row)
+        return columns
+
+    def _destiny_numbers(self, tokens):
+        """Vectorized _analyze_numerology; non-ASCII names keep the scalar path."""
+        buffer, offsets = pack_names(tokens)
+        totals = segment_totals(buffer, offsets)
+        destiny_numbers = np.where(totals % 9 == 0, 9, totals % 9).tolist()
+        for i, token in enumerate(tokens):
+            if not token.is_ascii:
+                destiny_numbers[i] = self._analyze_numerology(token).get('destiny_number')
+        return destiny_numbers
+
+    def _vibrations(self, tokens):
+        """Batched _analyze_vibration; non-ASCII names keep the scalar path."""
+        results = [None] * len(tokens)
+        ascii_indices = []
+        for i, token in enumerate(tokens):
+            if token.is_ascii:
+                ascii_indices.append(i)
+            else:
+                results[i] = self._analyze_vibration(token)
+
+        try:
+            batch_results = self.vibration_analyzer.analyze_name_vibration_batch(
+                [tokens[i] for i in ascii_indices]
+            )
+        except Exception as e:
+            print(f"Vibration batch error: {str(e)}")
+            batch_results = [self._analyze_vibration(tokens[i]) for i in ascii_indices]
+        else:
+            for result in batch_results:
+                if result:
+                    result['analysis_type'] = 'vibration'
+
+        for i, result in zip(ascii_indices, batch_results):
+            results[i] = result
+        return results
+
+    def _append_row(self, columns, token, destiny_number, vibration):
+        """Append one flat result row for a name's token."""
+        append_result_row(columns, token.text, destiny_number, self._analyze_phonetics(token), vibration)
+
     def _analyze_numerology(self, name):
         try:
-            number = sum(ord(c.lower()) - ord('a') + 1 for c in name if c.isalpha())
+            number = NameToken.of(name).letter_total
             return {
                 'destiny_number': number % 9 or 9,
                 'analysis_type': 'numerology'
@@ -96,12 +299,14 @@ class NameAnalyzer:
 
     def _analyze_phonetics(self, name):
         try:
-            consonants = sum(1 for c in name.lower() if c in 'bcdfghjklmnpqrstvwxyz')
-            vowels = sum(1 for c in name.lower() if c in 'aeiou')
+            token = NameToken.of(name)
+            # Consonants here include y; vowels are a, e, i, o and u
+            consonants = token.consonant_count + token.semivowel_count
+            vowels = token.vowel_count
             return {
                 'consonant_count': consonants,
                 'vowel_count': vowels,
-                'total_length': len(name),
+                'total_length': len(token.text),
                 'analysis_type': 'phonetic'
             }
         except Exception as e:
@@ -0,0 +1,95 @@
+import re
+from array import array
+from collections import Counter
+
+# Character classes in NameToken.mask
+VOWEL = 1       # a e i o u
+SEMIVOWEL = 2   # y, a vowel to some analyzers and a consonant to others
+CONSONANT = 4   # the remaining ASCII letters
+
+# Byte -> character class, for bytes.translate over lowercased ASCII
+CLASS_TABLE = bytearray(256)
+for _char in 'aeiou':
+    CLASS_TABLE[ord(_char)] = VOWEL
+CLASS_TABLE[ord('y')] = SEMIVOWEL
+for _char in 'bcdfghjklmnpqrstvwxz':
+    CLASS_TABLE[ord(_char)] = CONSONANT
+CLASS_TABLE = bytes(CLASS_TABLE)
+
+_PART = re.compile(r'\S+')
+
+class NameToken:
+    """A name parsed once and shared by every analyzer.
+
+    Holds the original text, its lowercased form and code points (bytes for
+    ASCII names, an array('I') otherwise), the (start, end) bounds of each
+    whitespace-separated part, and a per-character class mask (VOWEL, SEMIVOWEL,
+    CONSONANT or 0) with its counts. The character histogram and the
+    HumanName parse are built on first use, since only some analyzers need them.
+    """
+
+    __slots__ = ('text', 'lowered', 'codes', 'parts', 'mask', 'vowel_count', 'semivowel_count',
+                 'consonant_count', '_histogram', '_human_name')
+
+    def __init__(self, name):
+        self.text = name
+        lowered = name.lower()
+        self.lowered = lowered
+        if lowered.isascii():
+            self.codes = lowered.encode('ascii')
+            self.mask = self.codes.translate(CLASS_TABLE)
+        else:
+            self.codes = array('I')
+            self.codes.frombytes(lowered.encode('utf-32-le'))
+            # One '?' (class 0) per non-ASCII code point keeps the mask aligned with codes
+            self.mask = lowered.encode('ascii', 'replace').translate(CLASS_TABLE)
+        self.parts = tuple(match.span() for match in _PART.finditer(lowered))
+        self._histogram = None
+        self.vowel_count = self.mask.count(VOWEL)
+        self.semivowel_count = self.mask.count(SEMIVOWEL)
+        self.consonant_count = self.mask.count(CONSONANT)
+        self._human_name = None
+
+    def __repr__(self):
+        return f"NameToken({self.text!r})"
+
+    def __len__(self):
+        return len(self.text)
+
+    @classmethod
+    def of(cls, name):
+        """Return name itself if it is already a NameToken, else parse it."""
+        return name if isinstance(name, cls) else cls(name)
+
+    @property
+    def is_ascii(self):
+        return isinstance(self.codes, bytes)
+
+    @property
+    def words(self):
+        """Lowercased whitespace-separated parts, like lowered.split()."""
+        return [self.lowered[start:end] for start, end in self.parts]
+
+    @property
+    def histogram(self):
+        """Counter of the lowercased characters, built on first access."""
+        if self._histogram is None:
+            self._histogram = Counter(self.lowered)
+        return self._histogram
+
+    @property
+    def letter_total(self):
+        """Sum of ord(c) - 96 over the alphabetic characters (a=1 ... z=26 for ASCII)."""
+        return sum((ord(char) - 96) * count for char, count in self.histogram.items() if char.isalpha())
+
+    @property
+    def human_name(self):
+        """nameparser.HumanName of the original text, parsed on first access."""
+        if self._human_name is None:
+            from nameparser import HumanName
+            self._human_name = HumanName(self.text)
+        return self._human_name
+
+def lowercase(name):
+    """Lowercased text of a name given as a string or a NameToken."""
+    return name.lowered if isinstance(name, NameToken) else name.lower()
@@ -1,5 +1,10 @@
 import numpy as np
 from nameparser import HumanName
+from analyzers.name_token import NameToken, lowercase
+
+# Byte -> letter value lookup (a=1 ... z=26, everything else 0) for packed buffers
+BYTE_LETTER_VALUES = np.zeros(256, dtype=np.int64)
+BYTE_LETTER_VALUES[97:123] = np.arange(1, 27)
 
 class NumerologyAnalyzer:
     # Master numbers have special significance
@@ -16,17 +21,22 @@ class NumerologyAnalyzer:
         16: "Overcoming ego and accepting life changes",
         19: "Learning independence and self-reliance"
     }
+
+    # A=1, B=2, etc.
+    LETTER_VALUES = {chr(i): (i - 96) for i in range(97, 123)}
+
+    # Reduction lookup tables, grown on demand: (keep_masters) -> array
+    _reduction_tables = {}
     
     @staticmethod
     def calculate_number(name):
-        """Calculate numerological value of a name with special number recognition."""
-        # Parse the name properly
-        parsed_name = HumanName(name)
+        """Calculate numerological value of a name (a string or NameToken) with special number recognition."""
+        # Parse the name properly (once per token)
+        parsed_name = NameToken.of(name).human_name
         # Use full name for calculation
         full_name = f"{parsed_name.first} {parsed_name.middle} {parsed_name.last}".strip()
         
-        # A=1, B=2, etc. using numpy
-        values = {chr(i): (i - 96) for i in range(97, 123)}
+        values = NumerologyAnalyzer.LETTER_VALUES
         
         # Calculate values for each part of the name
         first_value = sum(values.get(char.lower(), 0) for char in parsed_name.first if char.isalpha())
@@ -44,17 +54,15 @@ class NumerologyAnalyzer:
                 "meaning": NumerologyAnalyzer.KARMIC_DEBT[total]
             }
         
-        # Reduce to final number
-        destiny = total
-        while destiny > 9:
-            # Check for master numbers before reduction
-            if destiny in NumerologyAnalyzer.MASTER_NUMBERS:
-                break
-            destiny = sum(int(d) for d in str(destiny))
+        # Reduce to final number, stopping at master numbers
+        destiny = int(NumerologyAnalyzer.reduce_numbers(np.array([total]))[0])
         
         # Calculate challenge numbers
+        # Letter sums of ASCII parts are the same as the challenge sums, so reuse them
         challenge_numbers = NumerologyAnalyzer.calculate_challenge_numbers(
-            parsed_name.first, parsed_name.last
+            parsed_name.first, parsed_name.last,
+            first_total=first_value if parsed_name.first.isascii() else None,
+            last_total=last_value if parsed_name.last.isascii() else None
         )
         
         return {
@@ -75,8 +83,8 @@ class NumerologyAnalyzer:
         }
     
     @staticmethod
-    def calculate_challenge_numbers(first_name, last_name):
-        """Calculate challenge numbers from first and last name."""
+    def calculate_challenge_numbers(first_name, last_name, first_total=None, last_total=None):
+        """Calculate challenge numbers from first and last name, optionally with their letter sums."""
         def reduce_number(num):
             while num > 9:
                 num = sum(int(d) for d in str(num))
@@ -86,10 +94,12 @@ class NumerologyAnalyzer:
             return None
             
         # Calculate reduced values
-        first_reduced = reduce_number(sum(ord(c.lower()) - 96 
-                                        for c in first_name if c.isalpha()))
-        last_reduced = reduce_number(sum(ord(c.lower()) - 96 
-                                       for c in last_name if c.isalpha()))
+        if first_total is None:
+            first_total = sum(ord(c.lower()) - 96 for c in first_name if c.isalpha())
+        if last_total is None:
+            last_total = sum(ord(c.lower()) - 96 for c in last_name if c.isalpha())
+        first_reduced = reduce_number(first_total)
+        last_reduced = reduce_number(last_total)
         
         # Challenge numbers
         first_challenge = abs(first_reduced - last_reduced)
@@ -102,6 +112,97 @@ class NumerologyAnalyzer:
             "overall_challenge": reduce_number(first_challenge + second_challenge)
         }
 
+    @staticmethod
+    def reduce_numbers(numbers, keep_masters=True):
+        """Reduce an array of non-negative totals to single digits with one table lookup."""
+        numbers = np.asarray(numbers, dtype=np.int64)
+        limit = int(numbers.max()) + 1 if numbers.size else 1
+        table = NumerologyAnalyzer._reduction_tables.get(keep_masters)
+        if table is None or len(table) < limit:
+            table = NumerologyAnalyzer._build_reduction_table(max(limit, 1024), keep_masters)
+            NumerologyAnalyzer._reduction_tables[keep_masters] = table
+        return table[numbers]
+
+    @staticmethod
+    def _build_reduction_table(size, keep_masters):
+        """Precompute the repeated digit-sum result for every total below size."""
+        table = np.arange(size, dtype=np.int64)
+        masters = np.array(list(NumerologyAnalyzer.MASTER_NUMBERS), dtype=np.int64)
+        while True:
+            pending = table > 9
+            if keep_masters:
+                pending &= ~np.isin(table, masters)
+            if not pending.any():
+                return table
+            remaining = table[pending]
+            digit_sum = np.zeros_like(remaining)
+            while remaining.any():
+                digit_sum += remaining % 10
+                remaining //= 10
+            table[pending] = digit_sum
+
+    @staticmethod
+    def calculate_batch(buffer, offsets, first=None, last=None):
+        """Vectorized numerology for many names packed into one uint8 buffer.
+
+        buffer/offsets come from pack_names; name i is buffer[offsets[i]:offsets[i + 1]].
+        Optional (buffer, offsets) pairs for first and last names enable challenge
+        numbers. Only the letters a-z carry value, as in calculate_number, so names
+        with non-ASCII letters can differ from calculate_challenge_numbers.
+        """
+        totals = segment_totals(buffer, offsets)
+        destiny = NumerologyAnalyzer.reduce_numbers(totals)
+        master_numbers = np.array(list(NumerologyAnalyzer.MASTER_NUMBERS), dtype=np.int64)
+        karmic_numbers = np.array(list(NumerologyAnalyzer.KARMIC_DEBT), dtype=np.int64)
+
+        results = {
+            "total": totals,
+            "destiny": destiny,
+            "is_master_number": np.isin(destiny, master_numbers),
+            # 0 means no karmic debt
+            "karmic_debt": np.where(np.isin(totals, karmic_numbers), totals, 0)
+        }
+
+        if first is not None and last is not None:
+            first_totals = segment_totals(*first)
+            last_totals = segment_totals(*last)
+            first_reduced = NumerologyAnalyzer.reduce_numbers(first_totals, keep_masters=False)
+            last_reduced = NumerologyAnalyzer.reduce_numbers(last_totals, keep_masters=False)
+            # Reduced values are single digits, so both challenges share one difference
+            first_challenge = np.abs(first_reduced - last_reduced)
+            results.update({
+                "has_challenges": (np.diff(first[1]) > 0) & (np.diff(last[1]) > 0),
+                "first_challenge": first_challenge,
+                "second_challenge": first_challenge.copy(),
+                "overall_challenge": NumerologyAnalyzer.reduce_numbers(
+                    2 * first_challenge, keep_masters=False
+                )
+            })
+
+        return results
+
+def pack_names(names):
+    """Pack lowercased UTF-8 names (strings or NameTokens) into one uint8 buffer plus an int64 offsets array."""
+    encoded = [lowercase(name).encode('utf-8') for name in names]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(data) for data in encoded], out=offsets[1:])
+    buffer = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return buffer, offsets
+
+def segment_totals(buffer, offsets):
+    """Sum letter values for every [offsets[i], offsets[i + 1]) segment of a packed buffer."""
+    cumulative = np.zeros(len(buffer) + 1, dtype=np.int64)
+    np.cumsum(BYTE_LETTER_VALUES[buffer], out=cumulative[1:])
+    return cumulative[offsets[1:]] - cumulative[offsets[:-1]]
+
+def get_numerology_batch(names):
+    """Vectorized numerology for a list of names, parsed with HumanName like calculate_number."""
+    parsed = [name.human_name if isinstance(name, NameToken) else HumanName(name) for name in names]
+    full = pack_names(f"{p.first} {p.middle} {p.last}" for p in parsed)
+    first = pack_names(p.first for p in parsed)
+    last = pack_names(p.last for p in parsed)
+    return NumerologyAnalyzer.calculate_batch(*full, first=first, last=last)
+
 def get_numerology(name):
     """Get complete numerological analysis of a name."""
     result = NumerologyAnalyzer.calculate_number(name)
@@ -0,0 +1,116 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from analyzers.name_analyzer import NameAnalyzer, BATCH_COLUMNS
+from analyzers.phoneme_index import get_phoneme_index
+
+# Per-process analyzer, created once by the pool initializer
+_worker_analyzer = None
+
+def _init_worker():
+    """Map the shared phoneme index and build the analyzer once per worker process."""
+    global _worker_analyzer
+    get_phoneme_index()
+    _worker_analyzer = NameAnalyzer(use_llm=False)
+
+def _analyze_shard(names):
+    """Analyze one shard in a worker and send back its result columns and lookup table (hits, misses)."""
+    analyzer = _worker_analyzer
+    hits, misses = analyzer.lookup_hits, analyzer.lookup_misses
+    columns = analyzer._analyze_chunk(names)
+    if analyzer.lookup_table is None:
+        return columns, None
+    return columns, (analyzer.lookup_hits - hits, analyzer.lookup_misses - misses)
+
+class ParallelNameAnalyzer:
+    """Shard batch analysis across a process pool.
+
+    Produces the same rows, in the same order, as NameAnalyzer.analyze_many.
+    Each worker returns one dict of columns per shard rather than a dict per name,
+    and every worker maps the same on-disk phoneme index instead of parsing CMUdict.
+    """
+
+    def __init__(self, workers=None, shard_size=1000):
+        self.workers = workers or os.cpu_count() or 1
+        self.shard_size = shard_size
+        self._executor = None
+        # Lookup table hits and misses reported by the workers; None until one has a table
+        self.lookup_hits = None
+        self.lookup_misses = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def lookup_stats(self):
+        """Names the workers answered from the lookup table and analyzed live, or None without a table."""
+        if self.lookup_hits is None:
+            return None
+        total = self.lookup_hits + self.lookup_misses
+        return {
+            'hits': self.lookup_hits,
+            'misses': self.lookup_misses,
+            'coverage': self.lookup_hits / total if total else 0.0
+        }
+
+    def _get_executor(self):
+        if self._executor is None:
+            # Build the phoneme index once here so workers only have to map it
+            get_phoneme_index()
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        return self._executor
+
+    def analyze_many(self, names, chunk_size=10000):
+        """Analyze an iterable of names, yielding one dict of result columns per chunk."""
+        executor = self._get_executor()
+        # Bound the shards in flight so huge inputs are never fully materialized
+        max_pending = self.workers * 2
+        pending = deque()
+        columns = {column: [] for column in BATCH_COLUMNS}
+
+        for shard in self._shards(names):
+            pending.append(executor.submit(_analyze_shard, shard))
+            if len(pending) >= max_pending:
+                self._extend(columns, *pending.popleft().result())
+                while len(columns['name']) >= chunk_size:
+                    chunk, columns = self._split(columns, chunk_size)
+                    yield chunk
+
+        while pending:
+            self._extend(columns, *pending.popleft().result())
+            while len(columns['name']) >= chunk_size:
+                chunk, columns = self._split(columns, chunk_size)
+                yield chunk
+
+        if columns['name']:
+            yield columns
+
+    def _shards(self, names):
+        shard = []
+        for name in names:
+            shard.append(name)
+            if len(shard) >= self.shard_size:
+                yield shard
+                shard = []
+        if shard:
+            yield shard
+
+    def _extend(self, columns, shard_columns, lookup):
+        for column in BATCH_COLUMNS:
+            columns[column].extend(shard_columns[column])
+        if lookup is not None:
+            self.lookup_hits = (self.lookup_hits or 0) + lookup[0]
+            self.lookup_misses = (self.lookup_misses or 0) + lookup[1]
+
+    @staticmethod
+    def _split(columns, size):
+        head = {column: values[:size] for column, values in columns.items()}
+        tail = {column: values[size:] for column, values in columns.items()}
+        return head, tail
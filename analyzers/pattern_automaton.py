@@ -0,0 +1,83 @@
+from collections import deque
+
+class PatternAutomaton:
+    """Aho-Corasick automaton for matching many substrings in one pass.
+
+    Patterns are added with a value and compiled once by build(); search(text)
+    then walks the text a single time, in time linear in its length plus the
+    number of matches, however many patterns were added.
+    """
+
+    def __init__(self):
+        # Trie of states: goto[state] maps a character to the next state
+        self.goto = [{}]
+        self.fail = [0]
+        # Values of patterns ending at each state (including via failure links after build)
+        self.outputs = [[]]
+        self.values = []
+        self._built = False
+
+    def __len__(self):
+        return len(self.values)
+
+    def add(self, pattern, value):
+        """Add a pattern and return its value ID (the order in which values were added)."""
+        if not pattern:
+            raise ValueError("Patterns must be non-empty")
+        state = 0
+        for char in pattern:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+            state = next_state
+        value_id = len(self.values)
+        self.values.append(value)
+        self.outputs[state].append(value_id)
+        self._built = False
+        return value_id
+
+    def build(self):
+        """Compute failure links breadth-first and merge outputs along them."""
+        queue = deque()
+        for state in self.goto[0].values():
+            self.fail[state] = 0
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.outputs[next_state] = self.outputs[next_state] + self.outputs[self.fail[next_state]]
+
+        # Tuples are cheaper to iterate during search
+        self.outputs = [tuple(sorted(output)) for output in self.outputs]
+        self._built = True
+        return self
+
+    def search(self, text):
+        """Return the sorted IDs of every value whose pattern occurs in text."""
+        if not self._built:
+            self.build()
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return sorted(found)
+
+    def matches(self, text):
+        """Values of every pattern occurring in text, in the order they were added."""
+        return [self.values[value_id] for value_id in self.search(text)]
@@ -0,0 +1,297 @@
+import csv
+import hashlib
+import json
+import os
+import re
+import shutil
+from bisect import bisect_left
+import numpy as np
+from analyzers.pattern_automaton import PatternAutomaton
+from utils.array_store import save_arrays, load_arrays
+from utils.config import get_env
+
+DEFAULT_PATTERN_INDEX_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'pattern_index'
+)
+
+# Dictionary sections and the match type analyze_cultural_elements reports for them
+SECTIONS = ['endings', 'elements', 'roots']
+MATCH_TYPES = {'endings': 'endings', 'elements': 'elements', 'roots': 'root'}
+
+# Joins the parts of a multi-part meaning in the string table
+MEANING_SEPARATOR = '\x1f'
+
+def load_pattern_file(path):
+    """Read a JSON or TSV pattern dictionary into {culture: {section: {pattern: meaning}}}.
+
+    JSON files use the same shape as CulturalAnalyzer.PATTERNS, with meanings
+    given as a string or a list of strings. TSV files have one pattern per line:
+    culture, section, pattern, then one or more meaning columns; blank lines
+    and lines starting with # are skipped.
+    """
+    if path.lower().endswith('.json'):
+        with open(path, encoding='utf-8') as handle:
+            data = json.load(handle)
+    else:
+        data = {}
+        with open(path, encoding='utf-8', newline='') as handle:
+            for line_number, row in enumerate(csv.reader(handle, delimiter='\t'), 1):
+                if not row or not row[0].strip() or row[0].startswith('#'):
+                    continue
+                if len(row) < 4:
+                    raise ValueError(f"{path}:{line_number}: expected culture, section, pattern and meaning")
+                culture, section, pattern, *meaning = [value.strip() for value in row]
+                data.setdefault(culture, {}).setdefault(section, {})[pattern] = (
+                    meaning[0] if len(meaning) == 1 else meaning
+                )
+
+    patterns = {}
+    for culture, sections in data.items():
+        for section, entries in sections.items():
+            if section not in SECTIONS:
+                raise ValueError(f"{path}: unknown section '{section}' for culture '{culture}'")
+            target = patterns.setdefault(culture, {}).setdefault(section, {})
+            for pattern, meaning in entries.items():
+                target[pattern.lower()] = tuple(meaning) if isinstance(meaning, (list, tuple)) else meaning
+    return patterns
+
+def _checksum(sections):
+    """Stable hash of a culture's dictionary, used to skip unchanged shards."""
+    canonical = json.dumps(sections, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+class PatternShard:
+    """One culture's compiled automaton and string table, memory-mapped from disk."""
+
+    # Array files making up a shard directory
+    ARRAYS = [
+        'text', 'text_offsets',
+        'entry_pattern', 'entry_meaning', 'entry_section', 'entry_multi',
+        'state_offsets', 'edge_chars', 'edge_targets', 'fail',
+        'output_offsets', 'outputs'
+    ]
+
+    def __init__(self, path, culture):
+        self.path = path
+        self.culture = culture
+        for name, array in load_arrays(path, self.ARRAYS).items():
+            setattr(self, name, array)
+        # Memoryviews for the scalar search loop
+        self._state_offsets = memoryview(self.state_offsets)
+        self._edge_chars = memoryview(self.edge_chars)
+        self._edge_targets = memoryview(self.edge_targets)
+        self._fail = memoryview(self.fail)
+        self._output_offsets = memoryview(self.output_offsets)
+        self._outputs = memoryview(self.outputs)
+
+    def __len__(self):
+        return len(self.entry_pattern)
+
+    def _string(self, index):
+        return bytes(self.text[self.text_offsets[index]:self.text_offsets[index + 1]]).decode('utf-8')
+
+    def entry(self, entry_id):
+        """(match_type, pattern, meaning) for an entry ID."""
+        meaning = self._string(self.entry_meaning[entry_id])
+        if self.entry_multi[entry_id]:
+            meaning = tuple(meaning.split(MEANING_SEPARATOR))
+        return MATCH_TYPES[SECTIONS[self.entry_section[entry_id]]], self._string(self.entry_pattern[entry_id]), meaning
+
+    def search(self, text):
+        """Sorted IDs of the entries whose pattern occurs in text."""
+        state_offsets, chars, targets = self._state_offsets, self._edge_chars, self._edge_targets
+        fail, output_offsets, outputs = self._fail, self._output_offsets, self._outputs
+        found = set()
+        state = 0
+        for char in text:
+            code = ord(char)
+            while True:
+                low, high = state_offsets[state], state_offsets[state + 1]
+                position = bisect_left(chars, code, low, high)
+                if position < high and chars[position] == code:
+                    state = targets[position]
+                    break
+                if state == 0:
+                    break
+                state = fail[state]
+            if output_offsets[state] != output_offsets[state + 1]:
+                found.update(outputs[output_offsets[state]:output_offsets[state + 1]])
+        return sorted(found)
+
+    def matches(self, text):
+        """(match_type, pattern, meaning) for every pattern in text, in dictionary order."""
+        return [self.entry(entry_id) for entry_id in self.search(text)]
+
+    @staticmethod
+    def build(path, sections):
+        """Compile one culture's {section: {pattern: meaning}} into a shard directory."""
+        strings = {}
+        entry_pattern, entry_meaning, entry_section, entry_multi = [], [], [], []
+
+        def intern(value):
+            return strings.setdefault(value, len(strings))
+
+        automaton = PatternAutomaton()
+        for section_id, section in enumerate(SECTIONS):
+            for pattern, meaning in sections.get(section, {}).items():
+                multi = isinstance(meaning, tuple)
+                automaton.add(pattern, len(entry_pattern))
+                entry_pattern.append(intern(pattern))
+                entry_meaning.append(intern(MEANING_SEPARATOR.join(meaning) if multi else meaning))
+                entry_section.append(section_id)
+                entry_multi.append(multi)
+        automaton.build()
+
+        # Flatten the trie: each state's edges sorted by character code
+        state_offsets = [0]
+        edge_chars, edge_targets = [], []
+        for edges in automaton.goto:
+            for char, target in sorted(edges.items(), key=lambda item: ord(item[0])):
+                edge_chars.append(ord(char))
+                edge_targets.append(target)
+            state_offsets.append(len(edge_chars))
+        output_offsets = [0]
+        outputs = []
+        for output in automaton.outputs:
+            outputs.extend(output)
+            output_offsets.append(len(outputs))
+
+        encoded = [value.encode('utf-8') for value in strings]
+        text_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(data) for data in encoded], out=text_offsets[1:])
+        arrays = {
+            'text': np.frombuffer(b''.join(encoded), dtype=np.uint8),
+            'text_offsets': text_offsets,
+            'entry_pattern': np.array(entry_pattern, dtype=np.int32),
+            'entry_meaning': np.array(entry_meaning, dtype=np.int32),
+            'entry_section': np.array(entry_section, dtype=np.uint8),
+            'entry_multi': np.array(entry_multi, dtype=np.uint8),
+            'state_offsets': np.array(state_offsets, dtype=np.int32),
+            'edge_chars': np.array(edge_chars, dtype=np.int32),
+            'edge_targets': np.array(edge_targets, dtype=np.int32),
+            'fail': np.array(automaton.fail, dtype=np.int32),
+            'output_offsets': np.array(output_offsets, dtype=np.int32),
+            'outputs': np.array(outputs, dtype=np.int32)
+        }
+        save_arrays(path, arrays)
+
+class PatternIndex:
+    """Versioned on-disk index of external cultural-pattern dictionaries.
+
+    Each culture is compiled into its own shard (an Aho-Corasick automaton
+    plus a string table, stored as .npy arrays) listed in manifest.json.
+    Shards are memory-mapped when the index is opened, and updating or adding
+    a culture only rewrites that culture's shard and the manifest.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'manifest.json'), encoding='utf-8') as handle:
+            self.manifest = json.load(handle)
+        if self.manifest.get('version') != self.VERSION:
+            raise ValueError(
+                f"Pattern index at {path} has version {self.manifest.get('version')}, expected {self.VERSION}"
+            )
+        self.shards = [
+            PatternShard(os.path.join(path, shard['directory']), culture)
+            for culture, shard in self.manifest['shards'].items()
+        ]
+
+    def __len__(self):
+        return sum(len(shard) for shard in self.shards)
+
+    @property
+    def cultures(self):
+        return [shard.culture for shard in self.shards]
+
+    def matches(self, name):
+        """(culture, match_type, pattern, meaning) for every external pattern in a lowercased name."""
+        results = []
+        for shard in self.shards:
+            for match_type, pattern, meaning in shard.matches(name):
+                results.append((shard.culture, match_type, pattern, meaning))
+        return results
+
+    @staticmethod
+    def _read_manifest(path):
+        try:
+            with open(os.path.join(path, 'manifest.json'), encoding='utf-8') as handle:
+                manifest = json.load(handle)
+        except (OSError, ValueError):
+            return {'version': PatternIndex.VERSION, 'shards': {}}
+        if manifest.get('version') != PatternIndex.VERSION:
+            # Old format: every shard gets rebuilt
+            return {'version': PatternIndex.VERSION, 'shards': {}}
+        return manifest
+
+    @staticmethod
+    def _write_manifest(path, manifest):
+        temp_path = os.path.join(path, f'manifest.json.tmp-{os.getpid()}')
+        with open(temp_path, 'w', encoding='utf-8') as handle:
+            json.dump(manifest, handle, indent=2, ensure_ascii=False)
+        os.replace(temp_path, os.path.join(path, 'manifest.json'))
+
+    @classmethod
+    def update(cls, path, patterns):
+        """Compile {culture: {section: {pattern: meaning}}} into the index at path.
+
+        Only cultures whose dictionaries changed are recompiled; other shards
+        are left in place. Returns the list of cultures that were rebuilt.
+        """
+        os.makedirs(path, exist_ok=True)
+        manifest = cls._read_manifest(path)
+        rebuilt = []
+        replaced = []
+        for culture, sections in patterns.items():
+            if not re.fullmatch(r'[\w-]+', culture):
+                raise ValueError(f"Invalid culture name: '{culture}'")
+            checksum = _checksum(sections)
+            shard = manifest['shards'].get(culture)
+            if shard and shard['checksum'] == checksum and os.path.isdir(os.path.join(path, shard['directory'])):
+                continue
+            # Each version of a shard gets its own directory, so the live one is never rewritten
+            directory = f"{culture}-{checksum[:16]}"
+            PatternShard.build(os.path.join(path, directory), sections)
+            if shard and shard['directory'] != directory:
+                replaced.append(shard['directory'])
+            manifest['shards'][culture] = {
+                'directory': directory,
+                'checksum': checksum,
+                'entries': sum(len(entries) for entries in sections.values())
+            }
+            rebuilt.append(culture)
+        if rebuilt or not os.path.exists(os.path.join(path, 'manifest.json')):
+            cls._write_manifest(path, manifest)
+        # Old shards go only once the manifest no longer lists them
+        for directory in replaced:
+            shutil.rmtree(os.path.join(path, directory), ignore_errors=True)
+        return rebuilt
+
+    @classmethod
+    def remove(cls, path, culture):
+        """Drop a culture's shard from the index."""
+        manifest = cls._read_manifest(path)
+        shard = manifest['shards'].pop(culture, None)
+        if shard is None:
+            return False
+        cls._write_manifest(path, manifest)
+        shutil.rmtree(os.path.join(path, shard['directory']), ignore_errors=True)
+        return True
+
+def compile_pattern_files(paths, index_path=None):
+    """Load pattern dictionaries and compile them into the index; returns the rebuilt cultures."""
+    patterns = {}
+    for path in paths:
+        for culture, sections in load_pattern_file(path).items():
+            for section, entries in sections.items():
+                patterns.setdefault(culture, {}).setdefault(section, {}).update(entries)
+    return PatternIndex.update(index_path or get_env("CULTURAL_PATTERN_INDEX", DEFAULT_PATTERN_INDEX_PATH), patterns)
+
+def get_pattern_index(path=None):
+    """Open the external pattern index, or return None if none has been compiled."""
+    path = path or get_env("CULTURAL_PATTERN_INDEX", DEFAULT_PATTERN_INDEX_PATH)
+    if not os.path.exists(os.path.join(path, 'manifest.json')):
+        return None
+    return PatternIndex(path)
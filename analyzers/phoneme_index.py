@@ -0,0 +1,168 @@
+import os
+import zlib
+import numpy as np
+from utils.array_store import save_arrays, load_meta, load_arrays
+from utils.config import get_env
+
+DEFAULT_INDEX_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'phoneme_index'
+)
+
+class PhonemeIndex:
+    """Compact, memory-mapped CMUdict pronunciation index.
+
+    Stores the first pronunciation of every word (what pronouncing.phones_for_word
+    returns first) as uint8 phoneme IDs with an offsets table, plus an
+    open-addressing hash table over the word strings. Arrays are opened with
+    mmap, so loading takes milliseconds and worker processes share the same pages.
+    An index compiled with from_pronunciations lives in memory until saved.
+    """
+
+    VERSION = 1
+
+    # Array files making up an index directory
+    ARRAYS = ['words', 'word_offsets', 'phones', 'phone_offsets', 'slots']
+
+    def __init__(self, path):
+        self.path = path
+        meta = load_meta(path, self.VERSION, "Phoneme index")
+        self._attach(meta['symbols'], load_arrays(path, self.ARRAYS))
+
+    def _attach(self, symbols, arrays):
+        self.symbols = symbols
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+        # Memoryviews over the same pages for the scalar probe loop
+        self._words = memoryview(self.words)
+        self._word_offsets = memoryview(self.word_offsets)
+        self._slots = memoryview(self.slots)
+        self._phones = memoryview(self.phones)
+        self._phone_offsets = memoryview(self.phone_offsets)
+        self._mask = len(self.slots) - 1
+
+    def __len__(self):
+        return len(self.word_offsets) - 1
+
+    def __contains__(self, word):
+        return self._find(word) >= 0
+
+    def _find(self, word):
+        """Return the word's row in the index, or -1."""
+        key = word.lower().encode('utf-8')
+        slot = zlib.crc32(key) & self._mask
+        while True:
+            row = self._slots[slot]
+            if row < 0:
+                return -1
+            if self._words[self._word_offsets[row]:self._word_offsets[row + 1]] == key:
+                return row
+            slot = (slot + 1) & self._mask
+
+    def phoneme_ids(self, word):
+        """Phoneme IDs of the word's first pronunciation (a uint8 memoryview), or None if unknown."""
+        row = self._find(word)
+        if row < 0:
+            return None
+        return self._phones[self._phone_offsets[row]:self._phone_offsets[row + 1]]
+
+    def phones_for_word(self, word):
+        """First pronunciation as a phone string, like pronouncing.phones_for_word(word)[0]."""
+        ids = self.phoneme_ids(word)
+        if ids is None:
+            return None
+        return ' '.join(self.symbols[i] for i in ids)
+
+    def frequency_table(self, frequencies, default):
+        """Phoneme ID -> value list from a symbol mapping; unmapped symbols get default."""
+        return [frequencies.get(symbol, default) for symbol in self.symbols]
+
+    def frequencies_for_word(self, word, table):
+        """Map the word's phoneme IDs through a frequency_table, or None if unknown."""
+        ids = self.phoneme_ids(word)
+        if ids is None:
+            return None
+        return [table[i] for i in ids]
+
+    @classmethod
+    def build(cls, path, pronunciations=None):
+        """Compile (word, phones) pairs, by default all of CMUdict, into an index directory."""
+        return cls.from_pronunciations(pronunciations).save(path)
+
+    @classmethod
+    def from_pronunciations(cls, pronunciations=None):
+        """Compile (word, phones) pairs, by default all of CMUdict, into an in-memory index."""
+        if pronunciations is None:
+            import pronouncing
+            pronouncing.init_cmu()
+            pronunciations = pronouncing.pronunciations
+
+        # Keep the first pronunciation of each word, in dictionary order
+        first = {}
+        for word, phones in pronunciations:
+            first.setdefault(word.lower(), phones.split())
+
+        symbols = sorted({symbol for phones in first.values() for symbol in phones})
+        if len(symbols) > 256:
+            raise ValueError(f"{len(symbols)} phoneme symbols do not fit in uint8 IDs")
+        symbol_ids = {symbol: i for i, symbol in enumerate(symbols)}
+
+        words = list(first)
+        encoded = [word.encode('utf-8') for word in words]
+        word_offsets = np.zeros(len(words) + 1, dtype=np.int64)
+        np.cumsum([len(data) for data in encoded], out=word_offsets[1:])
+        phone_offsets = np.zeros(len(words) + 1, dtype=np.int64)
+        np.cumsum([len(first[word]) for word in words], out=phone_offsets[1:])
+        phones = np.array([symbol_ids[symbol] for word in words for symbol in first[word]], dtype=np.uint8)
+
+        # Open addressing with linear probing, at most half full
+        size = 1
+        while size < 2 * len(words):
+            size *= 2
+        slots = np.full(size, -1, dtype=np.int32)
+        for row, key in enumerate(encoded):
+            slot = zlib.crc32(key) & (size - 1)
+            while slots[slot] >= 0:
+                slot = (slot + 1) & (size - 1)
+            slots[slot] = row
+
+        arrays = {
+            'words': np.frombuffer(b''.join(encoded), dtype=np.uint8),
+            'word_offsets': word_offsets,
+            'phones': phones,
+            'phone_offsets': phone_offsets,
+            'slots': slots
+        }
+        index = cls.__new__(cls)
+        index.path = None
+        index._attach(symbols, arrays)
+        return index
+
+    def save(self, path):
+        """Write the index to a directory and return it opened from there."""
+        save_arrays(path, {name: getattr(self, name) for name in self.ARRAYS},
+                    {'version': self.VERSION, 'symbols': self.symbols, 'words': len(self)})
+        return type(self)(path)
+
+# Process-wide index, opened on first use
+_index = None
+
+def get_phoneme_index(path=None):
+    """Open the shared phoneme index, building it from CMUdict the first time.
+
+    If the index cannot be written (a read-only cache directory, say), the
+    compiled index is kept in memory for the rest of the process instead.
+    """
+    global _index
+    if _index is None:
+        path = path or get_env("PHONEME_INDEX_PATH", DEFAULT_INDEX_PATH)
+        try:
+            _index = PhonemeIndex(path)
+        except (OSError, ValueError, KeyError):
+            index = PhonemeIndex.from_pronunciations()
+            try:
+                os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+                _index = index.save(path)
+            except OSError as e:
+                print(f"Phoneme index error: {str(e)}; using an in-memory index")
+                _index = index
+    return _index
@@ -1,3 +1,5 @@
+from analyzers.name_token import NameToken, CONSONANT
+
 def get_syllable_count(word):
     """Calculate syllable count using vowel groups."""
     word = word.lower()
@@ -19,44 +21,49 @@ def get_syllable_count(word):
         
     return count
 
-def analyze_phonetics(name):
-    """Analyze phonetic patterns in a name."""
-    # Define sound categories
-    soft_sounds = set('aeiouy')
-    hard_sounds = set('bcdfghjklmnpqrstvwxz')
-    
-    # Convert to lowercase for analysis
-    name = name.lower()
-    
-    # Count soft and hard sounds
-    soft_count = sum(1 for char in name if char in soft_sounds)
-    hard_count = sum(1 for char in name if char in hard_sounds)
-    
-    # Generate sound code (enhanced version)
+# Consonant groups of the sound code; a consonant in none of them stands for itself
+SOUND_GROUPS = {
+    'labial': 'bfmpvw',    # Lip sounds
+    'dental': 'dtnl',      # Teeth sounds
+    'guttural': 'gkh',     # Throat sounds
+    'sibilant': 'szx',     # Hissing sounds
+    'liquid': 'lr',        # Flowing sounds
+}
+
+# Consonant -> its group's letter; the first group listing a consonant wins
+SOUND_LETTERS = {}
+for _group, _chars in SOUND_GROUPS.items():
+    for _char in _chars:
+        SOUND_LETTERS.setdefault(_char, _group[0])
+
+def get_sound_code(name):
+    """Sound code of a name (a string or NameToken): its first letter, then the
+    group letter of each following consonant, without immediate repeats."""
+    token = NameToken.of(name)
+    name = token.lowered
     sound_code = name[0].upper()
     prev_sound = None
-    sound_groups = {
-        'labial': 'bfmpvw',    # Lip sounds
-        'dental': 'dtnl',      # Teeth sounds
-        'guttural': 'gkh',     # Throat sounds
-        'sibilant': 'szx',     # Hissing sounds
-        'liquid': 'lr',        # Flowing sounds
-    }
-    
-    for char in name[1:]:
-        if char in hard_sounds:
-            # Determine sound group
-            current_sound = next(
-                (group[0] for group, chars in sound_groups.items() 
-                 if char in chars),
-                char
-            )
+    for char, char_class in zip(name[1:], token.mask[1:]):
+        if char_class == CONSONANT:
+            current_sound = SOUND_LETTERS.get(char, char)
             if current_sound != prev_sound:
                 sound_code += current_sound
                 prev_sound = current_sound
+    return sound_code
+
+def analyze_phonetics(name):
+    """Analyze phonetic patterns in a name (a string or NameToken)."""
+    token = NameToken.of(name)
+    name = token.lowered
+    
+    # Soft sounds (aeiouy) and hard sounds (the other consonants) come from the token's class mask
+    soft_count = token.vowel_count + token.semivowel_count
+    hard_count = token.consonant_count
+    
+    sound_code = get_sound_code(token)
     
     # Calculate syllable count for first word
-    first_word = name.split()[0] if name.split() else name
+    first_word = name[slice(*token.parts[0])] if token.parts else name
     syllable_count = get_syllable_count(first_word)
     
     # Determine dominant sound type
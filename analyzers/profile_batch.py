@@ -0,0 +1,252 @@
+import numpy as np
+from analyzers.name_analyzer import BATCH_COLUMNS
+
+# Storage for each analyze_many column; any other column (such as 'interpretation') is stored as text
+INT_COLUMNS = ['destiny_number', 'consonant_count', 'vowel_count', 'total_length', 'harmonic_count']
+FLOAT_COLUMNS = [
+    'base_frequency', 'resonance_strength', 'coherence', 'frequency_range',
+    'strongest_harmonic', 'cultural_influence', 'harmonic_ratio'
+]
+CATEGORICAL_COLUMNS = ['frequency_character', 'resonance_profile', 'vibration_type', 'error']
+
+# get_report layout: analysis category, its analysis_type and the columns it holds
+REPORT_LAYOUT = [
+    ('numerology', 'numerology', ['destiny_number']),
+    ('phonetics', 'phonetic', ['consonant_count', 'vowel_count', 'total_length']),
+    ('vibration', 'vibration', BATCH_COLUMNS[5:-2])
+]
+
+def _encode_text(values):
+    """UTF-8 bytes and int64 offsets of a list of strings, plus a validity mask if any are None."""
+    valid = np.fromiter((value is not None for value in values), dtype=bool, count=len(values))
+    encoded = [value.encode('utf-8') if value is not None else b'' for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+    data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return data, offsets, None if valid.all() else valid
+
+class ProfileBatch:
+    """Analysis results for many names, one typed NumPy array per column.
+
+    Counts are int32 with a validity mask only where a value is missing,
+    measurements are float64 with NaN for missing, and repetitive strings
+    (frequency_character, resonance_profile, vibration_type, error) are
+    dictionary-encoded as int32 codes (-1 for missing) into a category list.
+    Measurements that the analyzers returned as Python ints (frequency_range
+    and coherence of a single frequency) are flagged so value() gives ints back.
+    Names and other free text share one UTF-8 buffer with offsets. A row
+    costs a few dozen bytes instead of a NameProfile's nested dicts, and
+    get_report(i) rebuilds the NameProfile report for one row on demand.
+    """
+
+    def __init__(self, length, columns, arrays, valid=None, categories=None, text=None, integral=None):
+        self.length = length
+        self.columns = list(columns)
+        # Column -> values, codes (categoricals) or offsets (text)
+        self.arrays = arrays
+        # Column -> bool mask of present values, for int and text columns with gaps
+        self.valid = valid or {}
+        # Categorical column -> list of category strings
+        self.categories = categories or {}
+        # Text column -> uint8 UTF-8 buffer
+        self.text = text or {}
+        # Float column -> bool mask of values that were ints, for columns that had any
+        self.integral = integral or {}
+
+    def __len__(self):
+        return self.length
+
+    @property
+    def nbytes(self):
+        """Bytes held by the column arrays."""
+        arrays = (list(self.arrays.values()) + list(self.valid.values()) + list(self.text.values())
+                  + list(self.integral.values()))
+        return sum(array.nbytes for array in arrays)
+
+    @classmethod
+    def from_columns(cls, columns):
+        """Convert one dict of result columns, as yielded by analyze_many, into typed arrays."""
+        names = list(columns)
+        length = len(columns[names[0]]) if names else 0
+        arrays, valid, categories, text, integral = {}, {}, {}, {}, {}
+        for column in names:
+            values = columns[column]
+            if column in INT_COLUMNS:
+                present = np.fromiter((value is not None for value in values), dtype=bool, count=length)
+                if present.all():
+                    arrays[column] = np.array(values, dtype=np.int32)
+                else:
+                    arrays[column] = np.array([value if value is not None else 0 for value in values], dtype=np.int32)
+                    valid[column] = present
+            elif column in FLOAT_COLUMNS:
+                # None becomes NaN
+                arrays[column] = np.array(values, dtype=np.float64)
+                is_int = np.fromiter((type(value) is int for value in values), dtype=bool, count=length)
+                if is_int.any():
+                    integral[column] = is_int
+            elif column in CATEGORICAL_COLUMNS:
+                lookup = {}
+                arrays[column] = np.fromiter(
+                    (lookup.setdefault(value, len(lookup)) if value is not None else -1 for value in values),
+                    dtype=np.int32, count=length
+                )
+                categories[column] = list(lookup)
+            else:
+                text[column], arrays[column], present = _encode_text(values)
+                if present is not None:
+                    valid[column] = present
+        return cls(length, names, arrays, valid, categories, text, integral)
+
+    @classmethod
+    def concat(cls, batches):
+        """Join batches with the same columns into one, merging category lists."""
+        batches = list(batches)
+        if not batches:
+            return cls.from_columns({column: [] for column in BATCH_COLUMNS})
+        if len(batches) == 1:
+            return batches[0]
+        columns = batches[0].columns
+        length = sum(len(batch) for batch in batches)
+        arrays, valid, categories, text, integral = {}, {}, {}, {}, {}
+        for column in columns:
+            if any(column in batch.valid for batch in batches):
+                valid[column] = np.concatenate([
+                    batch.valid.get(column, np.ones(len(batch), dtype=bool)) for batch in batches
+                ])
+            if any(column in batch.integral for batch in batches):
+                integral[column] = np.concatenate([
+                    batch.integral.get(column, np.zeros(len(batch), dtype=bool)) for batch in batches
+                ])
+            if column in batches[0].categories:
+                # Remap each batch's codes into the merged category list; -1 stays -1
+                lookup = {}
+                parts = []
+                for batch in batches:
+                    remap = np.array([lookup.setdefault(value, len(lookup)) for value in batch.categories[column]]
+                                     + [-1], dtype=np.int32)
+                    parts.append(remap[batch.arrays[column]])
+                arrays[column] = np.concatenate(parts)
+                categories[column] = list(lookup)
+            elif column in batches[0].text:
+                text[column] = np.concatenate([batch.text[column] for batch in batches])
+                starts = np.cumsum([0] + [len(batch.text[column]) for batch in batches[:-1]])
+                arrays[column] = np.concatenate(
+                    [batches[0].arrays[column][:1]]
+                    + [batch.arrays[column][1:] + start for batch, start in zip(batches, starts)]
+                )
+            else:
+                arrays[column] = np.concatenate([batch.arrays[column] for batch in batches])
+        return cls(length, columns, arrays, valid, categories, text, integral)
+
+    @classmethod
+    def from_names(cls, names, analyzer=None, chunk_size=10000):
+        """Analyze names with analyze_many, keeping only the columnar form of each chunk."""
+        if analyzer is None:
+            from analyzers.name_analyzer import NameAnalyzer
+            analyzer = NameAnalyzer(use_llm=False)
+        return cls.concat(cls.from_columns(columns) for columns in analyzer.analyze_many(names, chunk_size))
+
+    def _text(self, column, i):
+        if column in self.valid and not self.valid[column][i]:
+            return None
+        offsets = self.arrays[column]
+        return self.text[column][offsets[i]:offsets[i + 1]].tobytes().decode('utf-8')
+
+    def value(self, column, i):
+        """One cell as a Python value, with None where it is missing."""
+        if column in self.categories:
+            code = self.arrays[column][i]
+            return self.categories[column][code] if code >= 0 else None
+        if column in self.text:
+            return self._text(column, i)
+        if column in self.valid and not self.valid[column][i]:
+            return None
+        value = self.arrays[column][i].item()
+        if value != value:
+            return None
+        return int(value) if column in self.integral and self.integral[column][i] else value
+
+    def column(self, column):
+        """A column as a NumPy array: values for numbers, Python objects (None where missing) otherwise."""
+        if column in self.categories:
+            lookup = np.array(self.categories[column] + [None], dtype=object)
+            return lookup[self.arrays[column]]
+        if column in self.text:
+            return np.array([self._text(column, i) for i in range(self.length)], dtype=object)
+        return self.arrays[column]
+
+    def get_report(self, i):
+        """Row i in the shape of NameProfile.get_report()."""
+        analyses = {}
+        for category, analysis_type, columns in REPORT_LAYOUT:
+            analyses[category] = {column: self.value(column, i) for column in columns}
+            analyses[category]['analysis_type'] = analysis_type
+        vibration_type = self.value('vibration_type', i)
+        error = self.value('error', i)
+        if vibration_type is None and error is None:
+            # A name without letters has no vibration result
+            analyses['vibration'] = {}
+        elif vibration_type is None:
+            analyses['vibration'] = {'error': error, 'analysis_type': 'vibration'}
+        else:
+            analyses['vibration']['analysis_type'] = vibration_type
+
+        interpretation = self.value('interpretation', i) if 'interpretation' in self.arrays else None
+        analyses['interpretation'] = interpretation or {}
+        return {
+            'name': self.value('name', i),
+            'analyses': analyses,
+            'insights': [interpretation] if interpretation else []
+        }
+
+    def reports(self):
+        """Iterate over get_report for every row."""
+        for i in range(self.length):
+            yield self.get_report(i)
+
+    def _arrow_text(self, column):
+        """A text column as a pyarrow large_string array over the same offsets and bytes."""
+        import pyarrow as pa
+        validity = pa.array(self.valid[column]).buffers()[1] if column in self.valid else None
+        return pa.LargeStringArray.from_buffers(
+            self.length, pa.py_buffer(self.arrays[column]), pa.py_buffer(self.text[column]), validity
+        )
+
+    def to_arrow(self):
+        """pyarrow Table sharing the numeric, code and text buffers; categoricals become dictionary arrays."""
+        import pyarrow as pa
+        fields = []
+        for column in self.columns:
+            values = self.arrays[column]
+            mask = ~self.valid[column] if column in self.valid else None
+            if column in self.categories:
+                indices = pa.array(values, mask=values < 0)
+                fields.append(pa.DictionaryArray.from_arrays(indices, pa.array(self.categories[column], type=pa.string())))
+            elif column in self.text:
+                fields.append(self._arrow_text(column))
+            elif column in FLOAT_COLUMNS:
+                fields.append(pa.array(values, from_pandas=True))
+            else:
+                fields.append(pa.array(values, mask=mask))
+        return pa.Table.from_arrays(fields, names=self.columns)
+
+    def to_pandas(self):
+        """pandas DataFrame: numeric columns wrap the arrays, categoricals become pandas Categoricals."""
+        import pandas as pd
+        data = {}
+        for column in self.columns:
+            values = self.arrays[column]
+            if column in self.categories:
+                data[column] = pd.Categorical.from_codes(values, self.categories[column])
+            elif column in self.text:
+                data[column] = self._arrow_text(column).to_pandas()
+            elif column in self.valid:
+                data[column] = pd.arrays.IntegerArray(values, ~self.valid[column])
+            else:
+                data[column] = values
+        return pd.DataFrame(data, copy=False)
+
+    def write_parquet(self, path):
+        """Write the batch to a Parquet file through to_arrow."""
+        import pyarrow.parquet as pq
+        pq.write_table(self.to_arrow(), path)
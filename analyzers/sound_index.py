@@ -0,0 +1,176 @@
+import os
+import numpy as np
+from analyzers.name_token import NameToken
+from analyzers.phonetics import get_sound_code
+from utils.array_store import save_arrays, load_meta, load_arrays
+
+DEFAULT_SOUND_INDEX_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'sound_index'
+)
+
+# Bytes of a sound code kept in the index; longer codes are matched on this prefix
+CODE_WIDTH = 16
+# Characters of a lowercased name compared by the edit-distance re-rank
+FOLD_WIDTH = 32
+
+def _code_points(text):
+    """The first FOLD_WIDTH characters of text as a uint32 array of code points."""
+    return np.frombuffer(text[:FOLD_WIDTH].encode('utf-32-le'), dtype='<u4')
+
+class SoundIndex:
+    """Memory-mapped inverted index from sound code to names, for similar-name lookup.
+
+    Names are stored grouped by sound code (get_sound_code) in code order, and
+    by length within a code, so every code and every prefix of a code maps to
+    one contiguous range of names; `keys` holds the distinct codes and
+    `key_offsets` where each one's names start. find_similar takes a fixed
+    window of candidates from the longest code prefix that has enough names
+    and re-ranks them by edit distance in characters on the lowercased names,
+    stored as fixed-width rows of code points in `folded`. Sound codes
+    keep the first letter, so names are only matched to names with the same
+    first letter ("Katherine" does not find "Catherine").
+    """
+
+    VERSION = 2
+
+    # Array files making up an index directory
+    ARRAYS = ['keys', 'key_offsets', 'names', 'name_offsets', 'folded', 'lengths']
+
+    # Names re-ranked per query unless find_similar is given another number
+    CANDIDATES = 64
+
+    def __init__(self, path):
+        self.path = path
+        load_meta(path, self.VERSION, "Sound index")
+        for name, array in load_arrays(path, self.ARRAYS).items():
+            setattr(self, name, array)
+        self._names = memoryview(self.names)
+
+    def __len__(self):
+        return len(self.name_offsets) - 1
+
+    def name(self, row):
+        """The original spelling of the name stored at row."""
+        return self._names[self.name_offsets[row]:self.name_offsets[row + 1]].tobytes().decode('utf-8')
+
+    def _key_range(self, prefix):
+        """Rows of keys starting with prefix."""
+        lo = int(np.searchsorted(self.keys, prefix, 'left'))
+        if len(prefix) < CODE_WIDTH:
+            # No UTF-8 byte is 0xff, so this sorts after every code with the prefix
+            hi = int(np.searchsorted(self.keys, prefix + b'\xff', 'left'))
+        else:
+            hi = int(np.searchsorted(self.keys, prefix, 'right'))
+        return lo, hi
+
+    def _window(self, code, length, size):
+        """[start, end) rows of the candidates for a sound code and name length.
+
+        Starts at the names with exactly this code and the nearest length, then
+        drops the last character of the code until its range holds `size`
+        names, and takes the `size` rows of that range centred on the previous one.
+        """
+        key_offsets = self.key_offsets
+        lo, hi = self._key_range(code)
+        start = int(key_offsets[lo])
+        if lo < hi and self.keys[lo] == code:
+            end = int(key_offsets[lo + 1])
+            start += int(np.searchsorted(self.lengths[start:end], length))
+        inner_lo = inner_hi = start
+
+        for prefix_length in range(len(code), 0, -1):
+            lo, hi = self._key_range(code[:prefix_length])
+            lo, hi = int(key_offsets[lo]), int(key_offsets[hi])
+            if hi - lo >= size:
+                start = (inner_lo + inner_hi) // 2 - size // 2
+                start = min(max(start, lo), hi - size)
+                return start, start + size
+            inner_lo, inner_hi = lo, hi
+        return inner_lo, inner_hi
+
+    def _edit_distances(self, query, start, end):
+        """Levenshtein distance from query code points to each folded name in [start, end).
+
+        One dynamic-programming row per query character, computed for every
+        candidate at once. Rows hold D[j] - j, which turns insertions into a
+        running minimum along the row.
+        """
+        count = end - start
+        lengths = self.lengths[start:end].astype(np.intp)
+        width = int(lengths.max()) if count else 0
+        strings = self.folded[start:end, :width]
+        # Substitution cost minus one, for each query character against every candidate character
+        costs = (strings != query[:, None, None]).astype(np.int16) - 1
+        previous = np.zeros((count, width + 1), dtype=np.int16)
+        for i, cost in enumerate(costs, 1):
+            row = np.empty((count, width + 1), dtype=np.int16)
+            row[:, 0] = i
+            # Substitution (or match), then deletion
+            np.add(previous[:, :-1], cost, out=row[:, 1:])
+            np.minimum(row[:, 1:], previous[:, 1:] + 1, out=row[:, 1:])
+            np.minimum.accumulate(row, axis=1, out=row)
+            previous = row
+        return previous[np.arange(count), lengths] + lengths
+
+    def find_similar(self, name, k=10, max_distance=None, candidates=None):
+        """Up to k (name, edit distance) pairs that sound like name, closest first.
+
+        Candidates come from the index (see _window) rather than a scan of the
+        corpus, so a query costs the same at any corpus size. A name in the
+        corpus is returned as its own match with distance 0.
+        """
+        token = NameToken.of(name.strip())
+        if not token.text or not len(self):
+            return []
+        code = get_sound_code(token).encode('utf-8')[:CODE_WIDTH]
+        query = _code_points(token.lowered)
+
+        start, end = self._window(code, len(query), candidates or self.CANDIDATES)
+        if start == end:
+            return []
+        distances = self._edit_distances(query, start, end)
+        # Closest first, then nearest in length, then in index order
+        length_gaps = np.abs(self.lengths[start:end].astype(np.int32) - len(query))
+        order = np.lexsort((length_gaps, distances))
+        if max_distance is not None:
+            order = order[distances[order] <= max_distance]
+        return [(self.name(start + i), int(distances[i])) for i in order[:k]]
+
+    @classmethod
+    def build(cls, path, names):
+        """Index an iterable of names into an index directory; blank and repeated names are skipped."""
+        names = [name for name in dict.fromkeys(name.strip() for name in names if name) if name]
+
+        # Group by sound code, then by length so each code's names can be searched by length
+        entries = []
+        for name in names:
+            token = NameToken(name)
+            folded = _code_points(token.lowered)
+            entries.append((get_sound_code(token).encode('utf-8')[:CODE_WIDTH], len(folded), folded.tobytes(), name))
+        entries.sort()
+
+        keys = []
+        key_offsets = []
+        for row, (code, _, _, _) in enumerate(entries):
+            if not keys or keys[-1] != code:
+                keys.append(code)
+                key_offsets.append(row)
+        key_offsets.append(len(entries))
+
+        encoded = [entry[3].encode('utf-8') for entry in entries]
+        name_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(data) for data in encoded], out=name_offsets[1:])
+        folded = np.zeros((len(entries), FOLD_WIDTH), dtype='<u4')
+        for row, entry in enumerate(entries):
+            folded[row, :entry[1]] = np.frombuffer(entry[2], dtype='<u4')
+
+        arrays = {
+            'keys': np.array(keys, dtype=f'S{CODE_WIDTH}'),
+            'key_offsets': np.array(key_offsets, dtype=np.int64),
+            'names': np.frombuffer(b''.join(encoded), dtype=np.uint8),
+            'name_offsets': name_offsets,
+            'folded': folded,
+            'lengths': np.array([entry[1] for entry in entries], dtype=np.uint8)
+        }
+        save_arrays(path, arrays, {'version': cls.VERSION, 'names': len(entries), 'codes': len(keys)})
+        return cls(path)
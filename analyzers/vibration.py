@@ -1,6 +1,8 @@
 import numpy as np
 from collections import defaultdict
-import pronouncing
+from analyzers.numerology import pack_names
+from analyzers.name_token import lowercase
+from analyzers.phoneme_index import get_phoneme_index
 
 class VibrationAnalyzer:
     # Base frequencies (Hz) for cultural tuning
@@ -50,6 +52,15 @@ class VibrationAnalyzer:
         'L': 380,   'R': 420,   'W': 180,
         'Y': 190,   'S': 800,   'Z': 750
     }
+
+    # Byte -> letter frequency tables: (base_frequency, culture) -> 256-entry array
+    _letter_tables = {}
+
+    # Phoneme ID -> frequency lists per base frequency
+    _phoneme_tables = {}
+
+    # Upper bound on (rows x n x n x ratios) elements per block of the pairwise kernels
+    PAIRWISE_BLOCK_ELEMENTS = 4000000
     
     @staticmethod
     def calculate_letter_frequency(letter, base_frequency):
@@ -67,6 +78,62 @@ class VibrationAnalyzer:
         freq = base_frequency * (basic_freq / 13) * qualities['frequency_mod']
         return freq
     
+    @staticmethod
+    def letter_frequency_table(base_frequency=None, culture='default'):
+        """256-entry byte -> letter frequency table, built once per (base_frequency, culture).
+
+        Entries match calculate_letter_frequency for the lowercase letters a-z and
+        are 0 for every other byte. base_frequency defaults to the culture's tuning.
+        """
+        if base_frequency is None:
+            base_frequency = VibrationAnalyzer.BASE_FREQUENCIES.get(
+                culture, VibrationAnalyzer.BASE_FREQUENCIES['default']
+            )
+        key = (float(base_frequency), culture)
+        table = VibrationAnalyzer._letter_tables.get(key)
+        if table is None:
+            table = np.zeros(256, dtype=np.float64)
+            for code in range(97, 123):
+                table[code] = VibrationAnalyzer.calculate_letter_frequency(chr(code), base_frequency)
+            table.setflags(write=False)
+            VibrationAnalyzer._letter_tables[key] = table
+        return table
+
+    @staticmethod
+    def letter_frequency_matrix(names, base_frequency=432, culture='default'):
+        """Gather letter frequencies for many ASCII names in one table lookup.
+
+        Returns a zero-padded (n_names, max_letters) matrix and the letter count
+        of each row.
+        """
+        table = VibrationAnalyzer.letter_frequency_table(base_frequency, culture)
+        buffer, offsets = pack_names(names)
+        values = table[buffer]
+        is_letter = values > 0
+
+        # Letters seen before each byte, sampled at the name boundaries
+        letters_before = np.zeros(len(buffer) + 1, dtype=np.int64)
+        np.cumsum(is_letter, out=letters_before[1:])
+        letter_offsets = letters_before[offsets]
+        lengths = np.diff(letter_offsets)
+
+        matrix = np.zeros((len(names), int(lengths.max()) if len(lengths) else 0), dtype=np.float64)
+        rows = np.repeat(np.arange(len(names)), lengths)
+        columns = np.arange(letter_offsets[-1]) - letter_offsets[:-1][rows]
+        matrix[rows, columns] = values[is_letter]
+        return matrix, lengths
+
+    @staticmethod
+    def analyze_letter_vibrations(names, base_frequency=432, cultural_weight=1.0, culture='default'):
+        """Letter-mode vibration for a batch of ASCII names.
+
+        Equivalent to the letter fallback of analyze_name_vibration for each name
+        (None where a name has no letters), computed from one table gather and
+        row-wise reductions.
+        """
+        matrix, lengths = VibrationAnalyzer.letter_frequency_matrix(names, base_frequency, culture)
+        return VibrationAnalyzer._analyze_frequency_matrix(matrix, lengths, cultural_weight, 'letter')
+
     @staticmethod
     def calculate_resonance(frequencies, cultural_weight=1.0):
         """Calculate resonance pattern using harmonic series."""
@@ -77,12 +144,12 @@ class VibrationAnalyzer:
         fundamental = np.mean(frequencies)
         
         # Generate harmonics with cultural weighting
-        harmonics = [fundamental * ratio * cultural_weight 
-                    for ratio in VibrationAnalyzer.HARMONIC_RATIOS]
+        harmonics = fundamental * np.array(VibrationAnalyzer.HARMONIC_RATIOS) * cultural_weight
         
-        # Calculate resonance strength
-        resonance = sum(1 / (1 + min(abs(f - h) for h in harmonics)) 
-                       for f in frequencies)
+        # Resonance strength from each frequency's distance to its closest harmonic,
+        # summed left to right like the original generator expression
+        distances = np.abs(np.asarray(frequencies, dtype=np.float64)[:, None] - harmonics[None, :]).min(axis=1)
+        resonance = np.float64(sum((1 / (1 + distances)).tolist()))
         
         return resonance / len(frequencies)
     
@@ -102,27 +169,30 @@ class VibrationAnalyzer:
         else:
             return "grounding/foundational"
     
+    @staticmethod
+    def phonetic_frequencies(name, base_frequency=432):
+        """Frequencies of the name's first CMUdict pronunciation, or None if it has none."""
+        index = get_phoneme_index()
+        table = VibrationAnalyzer._phoneme_tables.get(base_frequency)
+        if table is None:
+            table = index.frequency_table(VibrationAnalyzer.PHONETIC_FREQUENCIES, base_frequency)
+            VibrationAnalyzer._phoneme_tables[base_frequency] = table
+        return index.frequencies_for_word(lowercase(name), table)
+
     @staticmethod
     def analyze_name_vibration(name, base_frequency=432, cultural_weight=1.0):
-        """Perform comprehensive vibrational analysis of a name."""
-        name = name.lower()
+        """Perform comprehensive vibrational analysis of a name (a string or NameToken)."""
+        name = lowercase(name)
         
         # Try phonetic analysis first
-        try:
-            phones = pronouncing.phones_for_word(name)
-            if phones:
-                phonemes = phones[0].split()
-                phonetic_frequencies = [VibrationAnalyzer.PHONETIC_FREQUENCIES.get(p, base_frequency) 
-                                     for p in phonemes]
-                if phonetic_frequencies:
-                    return VibrationAnalyzer._analyze_frequencies(
-                        phonetic_frequencies, 
-                        base_frequency, 
-                        cultural_weight,
-                        analysis_type='phonetic'
-                    )
-        except Exception:
-            pass  # Fall back to letter-based analysis
+        phonetic_frequencies = VibrationAnalyzer.phonetic_frequencies(name, base_frequency)
+        if phonetic_frequencies:
+            return VibrationAnalyzer._analyze_frequencies(
+                phonetic_frequencies, 
+                base_frequency, 
+                cultural_weight,
+                analysis_type='phonetic'
+            )
         
         # Letter-based analysis (existing code)
         frequencies = []
@@ -144,27 +214,179 @@ class VibrationAnalyzer:
             analysis_type='letter'
         )
 
+    @staticmethod
+    def analyze_name_vibration_batch(names, base_frequency=432, cultural_weight=1.0):
+        """analyze_name_vibration for a batch of ASCII names.
+
+        Names found in CMUdict take the phonetic path one by one; all the others
+        share a single letter-table gather.
+        """
+        results = [None] * len(names)
+        letter_indices = []
+        for i, name in enumerate(names):
+            phonetic_frequencies = VibrationAnalyzer.phonetic_frequencies(name, base_frequency)
+            if phonetic_frequencies:
+                results[i] = VibrationAnalyzer._analyze_frequencies(
+                    phonetic_frequencies, base_frequency, cultural_weight, analysis_type='phonetic'
+                )
+            else:
+                letter_indices.append(i)
+
+        letter_results = VibrationAnalyzer.analyze_letter_vibrations(
+            [names[i] for i in letter_indices], base_frequency, cultural_weight
+        )
+        for i, result in zip(letter_indices, letter_results):
+            results[i] = result
+        return results
+
     @staticmethod
     def _analyze_frequencies(frequencies, base_frequency, cultural_weight, analysis_type='letter'):
         """Analyze a list of frequencies and return results."""
         # Calculate resonance with cultural weighting
         resonance = VibrationAnalyzer.calculate_resonance(frequencies, cultural_weight)
         
-        # Analyze harmonic patterns
-        harmonic_groups = defaultdict(list)
-        for i, freq in enumerate(frequencies):
-            for ratio in VibrationAnalyzer.HARMONIC_RATIOS:
-                if any(abs(freq/other - ratio) < 0.01 for other in frequencies[i+1:]):
-                    harmonic_groups[ratio].append(freq)
-        
-        # Calculate coherence
-        frequency_ratios = [f2/f1 for i, f1 in enumerate(frequencies) 
-                          for f2 in frequencies[i+1:]]
-        coherence = np.mean([min(abs(ratio - h) for h in VibrationAnalyzer.HARMONIC_RATIOS)
-                           for ratio in frequency_ratios]) if frequency_ratios else 1
+        harmonic_count, strongest_harmonic, coherence = VibrationAnalyzer._harmonic_structure(frequencies)
         
         # Analyze overall frequency character
         avg_freq = np.mean(frequencies)
+        
+        # Add harmonic ratio calculation from the new implementation
+        harmonic_ratio = 1.0
+        if len(frequencies) >= 2:
+            ratios = [f2/f1 for f1, f2 in zip(frequencies[:-1], frequencies[1:])]
+            harmonic_ratio = sum(ratios) / len(ratios)
+
+        return VibrationAnalyzer._build_result(
+            avg_freq, resonance, coherence, harmonic_count, max(frequencies) - min(frequencies),
+            strongest_harmonic, cultural_weight, harmonic_ratio, analysis_type
+        )
+
+    @staticmethod
+    def _analyze_frequency_matrix(matrix, lengths, cultural_weight, analysis_type):
+        """_analyze_frequencies for every row of a zero-padded (n_names, max_len) frequency matrix.
+
+        Rows are grouped by length so every kernel runs on an unpadded block in the
+        same element order as the list version. Sums match sum() exactly and means
+        match np.mean; within that, results are identical to _analyze_frequencies
+        for positive frequencies (zero frequencies have no defined ratios here).
+        """
+        results = [None] * len(lengths)
+        ratio_count = len(VibrationAnalyzer.HARMONIC_RATIOS)
+        for n in np.unique(lengths):
+            n = int(n)
+            if n == 0:
+                continue
+            indices = np.flatnonzero(lengths == n)
+            # Bound the (rows, n, n, ratios) temporaries of the pairwise kernels
+            block_rows = max(1, VibrationAnalyzer.PAIRWISE_BLOCK_ELEMENTS // (n * n * ratio_count))
+            for start in range(0, len(indices), block_rows):
+                rows = indices[start:start + block_rows]
+                block = np.ascontiguousarray(matrix[rows, :n], dtype=np.float64)
+                block_results = VibrationAnalyzer._analyze_frequency_block(block, cultural_weight, analysis_type)
+                for index, result in zip(rows, block_results):
+                    results[index] = result
+        return results
+
+    @staticmethod
+    def _analyze_frequency_block(block, cultural_weight, analysis_type):
+        """Vectorized _analyze_frequencies for a (rows, n) block of equal-length frequency lists."""
+        rows, n = block.shape
+        avg_freqs = block.mean(axis=1)
+        frequency_ranges = block.max(axis=1) - block.min(axis=1)
+
+        # Resonance against each row's weighted harmonic series
+        harmonics = avg_freqs[:, None] * np.array(VibrationAnalyzer.HARMONIC_RATIOS)[None, :] * cultural_weight
+        distances = np.abs(block[:, :, None] - harmonics[:, None, :]).min(axis=2)
+        resonances = VibrationAnalyzer._sequential_row_sums(1 / (1 + distances)) / n
+
+        # Mean ratio of consecutive frequencies
+        if n >= 2:
+            harmonic_ratios = VibrationAnalyzer._sequential_row_sums(block[:, 1:] / block[:, :-1]) / (n - 1)
+        else:
+            harmonic_ratios = np.ones(rows)
+
+        harmonic_counts, strongest, coherences = VibrationAnalyzer._harmonic_structure_block(block)
+
+        results = []
+        for row in range(rows):
+            # Range and ratio are plain floats in the list version, and round() differs by type
+            results.append(VibrationAnalyzer._build_result(
+                avg_freqs[row],
+                resonances[row],
+                coherences[row] if n >= 2 else 1,
+                int(harmonic_counts[row]),
+                float(frequency_ranges[row]),
+                VibrationAnalyzer.HARMONIC_RATIOS[strongest[row]] if strongest[row] >= 0 else None,
+                cultural_weight,
+                float(harmonic_ratios[row]),
+                analysis_type
+            ))
+        return results
+
+    @staticmethod
+    def _sequential_row_sums(values):
+        """Row sums accumulated column by column, i.e. left to right as sum() does."""
+        total = np.zeros(values.shape[0])
+        for column in range(values.shape[1]):
+            total += values[:, column]
+        return total
+
+    @staticmethod
+    def _harmonic_structure(frequencies):
+        """Harmonic group count, strongest harmonic ratio and raw coherence of a frequency list."""
+        block = np.asarray(frequencies, dtype=np.float64)[None, :]
+        # With two or more frequencies the list version divides by each of them (later ones in
+        # the harmonic grouping, earlier ones in the coherence ratios); a single one is never a divisor
+        if len(frequencies) >= 2 and not block.all():
+            raise ZeroDivisionError("float division by zero")
+        harmonic_counts, strongest, coherences = VibrationAnalyzer._harmonic_structure_block(block)
+        strongest_harmonic = VibrationAnalyzer.HARMONIC_RATIOS[strongest[0]] if strongest[0] >= 0 else None
+        coherence = coherences[0] if len(frequencies) >= 2 else 1
+        return int(harmonic_counts[0]), strongest_harmonic, coherence
+
+    @staticmethod
+    def _harmonic_structure_block(block):
+        """Harmonic grouping and coherence for a (rows, n) block via outer ratio matrices.
+
+        Returns per-row harmonic counts, the index into HARMONIC_RATIOS of the
+        strongest harmonic (-1 for none) and the raw coherence (NaN when n < 2).
+        """
+        rows, n = block.shape
+        ratios = np.array(VibrationAnalyzer.HARMONIC_RATIOS)
+        ratio_count = len(ratios)
+        if n < 2:
+            return np.zeros(rows, dtype=np.int64), np.full(rows, -1), np.full(rows, np.nan)
+
+        # matches[r, i, k]: a later frequency j has f_i / f_j within 0.01 of ratio k
+        later = np.triu(np.ones((n, n), dtype=bool), k=1)
+        outer = block[:, :, None] / block[:, None, :]
+        close = np.abs(outer[..., None] - ratios) < 0.01
+        matches = (close & later[None, :, :, None]).any(axis=2)
+
+        group_sizes = matches.sum(axis=1)
+        harmonic_counts = (group_sizes > 1).sum(axis=1)
+
+        # Largest group wins; ties go to the group created first (earliest i, then ratio order)
+        first_member = matches.argmax(axis=1)
+        score = np.where(
+            group_sizes > 0,
+            group_sizes * (n * ratio_count) + (n - 1 - first_member) * ratio_count
+            + (ratio_count - 1 - np.arange(ratio_count)),
+            -1
+        )
+        strongest = np.where(group_sizes.any(axis=1), score.argmax(axis=1), -1)
+
+        # Coherence over every later/earlier pair, in the list version's (i, j) order
+        earlier_index, later_index = np.triu_indices(n, k=1)
+        pair_ratios = block[:, later_index] / block[:, earlier_index]
+        coherences = np.abs(pair_ratios[..., None] - ratios).min(axis=2).mean(axis=1)
+
+        return harmonic_counts, strongest, coherences
+
+    @staticmethod
+    def _build_result(avg_freq, resonance, coherence, harmonic_count, frequency_range,
+                      strongest_harmonic, cultural_weight, harmonic_ratio, analysis_type):
+        """Assemble the vibration result dict from its computed parts."""
         frequency_character = VibrationAnalyzer.get_frequency_meaning(avg_freq)
         
         # Adjust resonance profile thresholds
@@ -173,21 +395,14 @@ class VibrationAnalyzer:
             else 'medium' if avg_freq > 300 or resonance > 0.4
             else 'low'
         )
-        
-        # Add harmonic ratio calculation from the new implementation
-        harmonic_ratio = 1.0
-        if len(frequencies) >= 2:
-            ratios = [f2/f1 for f1, f2 in zip(frequencies[:-1], frequencies[1:])]
-            harmonic_ratio = sum(ratios) / len(ratios)
 
         result = {
             "base_frequency": round(avg_freq, 2),
             "resonance_strength": round(resonance, 3),
             "coherence": round(1 - coherence, 3),
-            "harmonic_count": len([g for g in harmonic_groups.values() if len(g) > 1]),
-            "frequency_range": round(max(frequencies) - min(frequencies), 2),
-            "strongest_harmonic": max(harmonic_groups.items(), 
-                                   key=lambda x: len(x[1]))[0] if harmonic_groups else None,
+            "harmonic_count": harmonic_count,
+            "frequency_range": round(frequency_range, 2),
+            "strongest_harmonic": strongest_harmonic,
             "frequency_character": frequency_character,
             "cultural_influence": cultural_weight,
             "resonance_profile": resonance_profile,
@@ -1,8 +1,7 @@
 import streamlit as st
 from analyzers.name_analyzer import NameAnalyzer
-import plotly.graph_objects as go
-import pandas as pd
 from dotenv import load_dotenv
+from utils.sections import parse_sections
 
 # Load environment variables at the start
 load_dotenv(override=True)
@@ -21,6 +20,8 @@ def get_analyzer():
 
 def create_frequency_chart(frequencies):
     """Create an interactive frequency chart."""
+    # Plotly is only imported once a chart is drawn
+    import plotly.graph_objects as go
     fig = go.Figure()
     
     # Add frequency plot
@@ -42,6 +43,7 @@ def create_frequency_chart(frequencies):
 
 def plot_consonant_vowel_ratio(consonants, vowels):
     """Create a pie chart showing consonant/vowel distribution."""
+    import plotly.graph_objects as go
     fig = go.Figure(go.Pie(
         labels=['Consonants', 'Vowels'],
         values=[consonants, vowels],
@@ -56,8 +58,62 @@ def plot_consonant_vowel_ratio(consonants, vowels):
     )
     return fig
 
-def display_results(profile):
-    """Display analysis results."""
+def render_interpretation(interpretation):
+    """Render the interpretation sections; incomplete text renders what has arrived so far."""
+    if not interpretation:
+        st.warning("No interpretation available.")
+        return
+
+    try:
+        sections = parse_sections(interpretation)
+
+        # Overall Impression
+        st.markdown("### ✨ Overall Impression")
+        if sections.get('Overall Impression'):
+            st.markdown(sections['Overall Impression'])
+
+        # Two-column layout for strengths and growth areas
+        col1, col2 = st.columns(2)
+
+        # Key Strengths
+        with col1:
+            st.markdown("### 💪 Key Strengths")
+            render_numbered_points(sections.get('Key Strengths', ''))
+
+        # Growth Areas
+        with col2:
+            st.markdown("### 🌱 Growth Areas")
+            render_numbered_points(sections.get('Growth Areas', ''))
+
+        # Additional Insights
+        st.markdown("---")
+
+        # Life Path and Deeper Analysis in columns
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown("### 🌊 Life Path Insights")
+            if sections.get('Life Path Insights'):
+                st.markdown(sections['Life Path Insights'])
+
+        with col2:
+            st.markdown("### 🔮 Deeper Analysis")
+            if sections.get('Deeper Analysis'):
+                st.markdown(sections['Deeper Analysis'])
+
+    except Exception as e:
+        st.error(f"Error parsing interpretation: {str(e)}")
+        st.write(interpretation)
+
+def render_numbered_points(content):
+    """Render '1. point' lines as bullets."""
+    for line in content.split('\n'):
+        if line.strip() and line.strip()[0].isdigit() and '.' in line:
+            bullet_text = line.split('.', 1)[1].strip()
+            st.markdown(f"• {bullet_text}")
+
+def display_results(profile, stream=None):
+    """Display analysis results; stream yields interpretation chunks to render progressively."""
     results = profile.get_report()
     
     # Custom CSS for styling
@@ -131,7 +187,8 @@ def display_results(profile):
         </style>
     """, unsafe_allow_html=True)
     
-    # Create tabs for organized results
+    # Create tabs for organized results; the interpretation tab is filled last so
+    # the other tabs are visible while it streams
     tab1, tab2, tab3 = st.tabs(["📊 Analysis", "🔮 Interpretation", "📈 Visualizations"])
 
     with tab1:
@@ -176,71 +233,6 @@ def display_results(profile):
             - Relationship building strategies
             """)
 
-    with tab2:
-        interpretation = str(results['analyses'].get('interpretation', ''))
-        if interpretation:
-            try:
-                # Split the text into sections
-                sections = interpretation.split('\n\n')
-                
-                # Overall Impression
-                st.markdown("### ✨ Overall Impression")
-                for section in sections:
-                    if 'Overall Impression:' in section:
-                        content = section.split('Overall Impression:', 1)[1].strip()
-                        st.markdown(content)
-                
-                # Two-column layout for strengths and growth areas
-                col1, col2 = st.columns(2)
-                
-                # Key Strengths
-                with col1:
-                    st.markdown("### 💪 Key Strengths")
-                    for section in sections:
-                        if 'Key Strengths:' in section:
-                            content = section.split('Key Strengths:', 1)[1].strip()
-                            for line in content.split('\n'):
-                                if line.strip() and line.strip()[0].isdigit():
-                                    bullet_text = line.split('.', 1)[1].strip()
-                                    st.markdown(f"• {bullet_text}")
-                
-                # Growth Areas
-                with col2:
-                    st.markdown("### 🌱 Growth Areas")
-                    for section in sections:
-                        if 'Growth Areas:' in section:
-                            content = section.split('Growth Areas:', 1)[1].strip()
-                            for line in content.split('\n'):
-                                if line.strip() and line.strip()[0].isdigit():
-                                    bullet_text = line.split('.', 1)[1].strip()
-                                    st.markdown(f"• {bullet_text}")
-                
-                # Additional Insights
-                st.markdown("---")
-                
-                # Life Path and Deeper Analysis in columns
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.markdown("### 🌊 Life Path Insights")
-                    for section in sections:
-                        if 'Life Path Insights:' in section:
-                            content = section.split('Life Path Insights:', 1)[1].strip()
-                            st.markdown(content)
-                
-                with col2:
-                    st.markdown("### 🔮 Deeper Analysis")
-                    for section in sections:
-                        if 'Deeper Analysis:' in section:
-                            content = section.split('Deeper Analysis:', 1)[1].strip()
-                            st.markdown(content)
-                            
-            except Exception as e:
-                st.error(f"Error parsing interpretation: {str(e)}")
-                st.write(interpretation)
-        else:
-            st.warning("No interpretation available.")
-
     with tab3:
         st.subheader("Visual Analysis")
         
@@ -260,6 +252,19 @@ def display_results(profile):
                 frequencies = results['analyses']['vibration']['frequencies']
                 st.plotly_chart(create_frequency_chart(frequencies), use_container_width=True)
 
+    with tab2:
+        if stream is not None:
+            # Re-render the sections in place as tokens arrive
+            placeholder = st.empty()
+            interpretation = ''
+            for chunk in stream:
+                interpretation += chunk
+                with placeholder.container():
+                    render_interpretation(interpretation)
+        else:
+            interpretation = results['analyses'].get('interpretation', '')
+            render_interpretation(interpretation if isinstance(interpretation, str) else '')
+
 def main():
     st.title("🔮 Name Analysis Tool")
     st.write("Discover the hidden patterns and meanings in names through numerology, phonetics, and vibration analysis.")
@@ -274,16 +279,16 @@ def main():
     
     if submitted:
         if name and any(c.isalpha() for c in name):
-            with st.spinner("Analyzing name patterns..."):
-                try:
+            try:
+                with st.spinner("Analyzing name patterns..."):
                     # Perform analysis
-                    profile = analyzer.analyze_name(name)
-                    
-                    # Display results
-                    display_results(profile)
-                    
-                except Exception as e:
-                    st.error(f"An error occurred during analysis: {str(e)}")
+                    profile = analyzer.analyze_name(name, interpret=False)
+
+                # Display results, streaming the interpretation as it is generated
+                display_results(profile, stream=analyzer.stream_interpretation(profile))
+
+            except Exception as e:
+                st.error(f"An error occurred during analysis: {str(e)}")
         else:
             st.warning("Please enter a valid name containing letters.")
     
@@ -0,0 +1,86 @@
+import argparse
+import importlib.util
+import math
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.corpora import make_corpus, CORPUS_KINDS
+from analyzers.name_token import NameToken
+from analyzers.vibration import VibrationAnalyzer
+
+# Single letters outside a-z, each giving one zero letter frequency
+EDGE_NAMES = ['é', 'ß', 'ñ', 'Ø', 'ł', 'Я', 'a', 'Zoë', 'é é', 'Ana-María', "O'Brien", 'X Æ A-12']
+
+def load_baseline(revision):
+    """VibrationAnalyzer as it was at a git revision."""
+    source = subprocess.run(['git', 'show', f'{revision}:analyzers/vibration.py'],
+                            cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    with tempfile.NamedTemporaryFile('w', suffix='.py', delete=False, encoding='utf-8') as handle:
+        handle.write(source)
+    try:
+        spec = importlib.util.spec_from_file_location('baseline_vibration', handle.name)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        os.unlink(handle.name)
+    return module.VibrationAnalyzer
+
+def outcome(func, name):
+    """A result dict, or the name of the exception raised."""
+    try:
+        return func(name)
+    except Exception as e:
+        return type(e).__name__
+
+def same(expected, actual, tolerance):
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        return expected.keys() == actual.keys() and all(
+            same(expected[key], actual[key], tolerance) for key in expected
+        )
+    if isinstance(expected, (int, float)) and isinstance(actual, (int, float)) \
+            and not isinstance(expected, bool) and not isinstance(actual, bool):
+        return math.isclose(expected, actual, rel_tol=tolerance, abs_tol=tolerance)
+    return expected == actual
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare vibration results of the current tree against a baseline revision"
+    )
+    parser.add_argument('--baseline', default='4a782e7', help="Git revision to compare against (default: 4a782e7)")
+    parser.add_argument('--size', type=int, default=2000, help="Names per corpus (default: 2000)")
+    parser.add_argument('--tolerance', type=float, default=1e-9, help="Relative and absolute float tolerance")
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.baseline)
+    names = list(EDGE_NAMES)
+    for kind in CORPUS_KINDS:
+        names.extend(make_corpus(kind, args.size))
+
+    mismatches = 0
+    for name in names:
+        expected = outcome(baseline.analyze_name_vibration, name)
+        actual = outcome(VibrationAnalyzer.analyze_name_vibration, name)
+        if not same(expected, actual, args.tolerance):
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"{name!r}: baseline {expected} != current {actual}")
+
+    # The batch path only takes ASCII names; compare it against the baseline too
+    tokens = [NameToken(name) for name in names if NameToken(name).is_ascii]
+    for token, actual in zip(tokens, VibrationAnalyzer.analyze_name_vibration_batch(tokens)):
+        expected = outcome(baseline.analyze_name_vibration, token.text)
+        if not same(expected, actual, args.tolerance):
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"{token.text!r} (batch): baseline {expected} != current {actual}")
+
+    print(f"{len(names) + len(tokens)} results compared, {mismatches} mismatches")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
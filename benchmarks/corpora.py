@@ -0,0 +1,35 @@
+import random
+
+# Syllables used to generate pronounceable, name-like strings
+SYLLABLES = [
+    'an', 'na', 'ma', 'ri', 'el', 'la', 'jo', 'hn', 'mi', 'ka', 'el', 'sa',
+    'to', 'ver', 'os', 'lav', 'mir', 'bert', 'wald', 'cla', 'ra', 'vic', 'tor',
+    'da', 'vid', 'son', 'ber', 'ger', 'ste', 'phen', 'li', 'ly', 'ch', 'th'
+]
+
+# Accented Latin and Cyrillic syllables for the non-ASCII corpus
+NON_ASCII_SYLLABLES = [
+    'é', 'lo', 'dí', 'ñа', 'ção', 'ü', 'mül', 'ler', 'øy', 'ß', 'łu', 'kaś',
+    'Алек', 'сандр', 'Мар', 'ия', 'ø', 'stré', 'žan', 'čić'
+]
+
+def _word(rng, syllables, low, high):
+    return ''.join(rng.choice(syllables) for _ in range(rng.randint(low, high))).capitalize()
+
+def make_corpus(kind, size, seed=1234):
+    """Generate a reproducible list of names of the given kind."""
+    rng = random.Random(f"{kind}:{seed}")
+    if kind == 'short':
+        return [_word(rng, SYLLABLES, 1, 2) for _ in range(size)]
+    if kind == 'long':
+        return [_word(rng, SYLLABLES, 5, 9) for _ in range(size)]
+    if kind == 'multi_part':
+        return [' '.join(_word(rng, SYLLABLES, 1, 4) for _ in range(rng.randint(2, 4)))
+                for _ in range(size)]
+    if kind == 'non_ascii':
+        mixed = SYLLABLES + NON_ASCII_SYLLABLES
+        return [' '.join(_word(rng, mixed, 1, 3) for _ in range(rng.randint(1, 3)))
+                for _ in range(size)]
+    raise ValueError(f"Unknown corpus kind: {kind}")
+
+CORPUS_KINDS = ['short', 'long', 'multi_part', 'non_ascii']
@@ -0,0 +1,98 @@
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold-start scenarios: modules imported, import-time budget (ms), modules that must stay unloaded
+SCENARIOS = {
+    'cli': {
+        'imports': ['main'],
+        'budget_ms': 150,
+        'forbidden': ['numpy', 'openai', 'requests', 'httpx', 'pronouncing', 'nameparser']
+    },
+    'no_llm': {
+        'imports': ['main', 'analyzers.name_analyzer', 'utils.formatter'],
+        'budget_ms': 400,
+        'forbidden': ['openai', 'requests', 'httpx', 'pronouncing', 'plotly']
+    }
+}
+
+# Heavy modules whose cost is reported even when they are allowed
+WATCHED = ['numpy', 'nameparser', 'openai', 'requests', 'httpx', 'rich', 'pronouncing', 'plotly', 'streamlit']
+
+def measure(imports):
+    """Import modules in a fresh interpreter; returns (total_ms, {top-level module: cumulative_ms})."""
+    code = '; '.join(f'import {module}' for module in imports)
+    # No stdin: an import that prompts for input fails instead of hanging
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=ROOT, capture_output=True, text=True, stdin=subprocess.DEVNULL)
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {', '.join(imports)} failed: {result.stderr.strip().splitlines()[-1]}")
+
+    # Lines look like "import time:  self [us] | cumulative | [indent]package"
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # One separator space, then two more per nesting level
+        modules[name[1:].rstrip()] = int(cumulative)
+
+    # Top-level entries (no indent) add up to the whole import, minus interpreter startup
+    baseline = _startup_modules()
+    top_level = {name: us for name, us in modules.items() if not name.startswith(' ') and name not in baseline}
+    loaded = {name.strip(): us / 1000 for name, us in modules.items()}
+    return sum(top_level.values()) / 1000, loaded
+
+_startup = None
+
+def _startup_modules():
+    """Modules the bare interpreter imports anyway (site, encodings, ...)."""
+    global _startup
+    if _startup is None:
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'pass'],
+                                cwd=ROOT, capture_output=True, text=True)
+        _startup = {line.split('|')[2][1:].rstrip() for line in result.stderr.splitlines()
+                    if line.startswith('import time:') and 'cumulative' not in line}
+    return _startup
+
+def check(name, scenario, repeat, budget_ms=None):
+    """Best-of-N import time for a scenario; returns a list of failure messages."""
+    budget_ms = budget_ms or scenario['budget_ms']
+    try:
+        runs = [measure(scenario['imports']) for _ in range(repeat)]
+    except RuntimeError as e:
+        print(f"{name:<8} FAIL  import error")
+        return [f"{name}: {str(e)}"]
+    total_ms, loaded = min(runs, key=lambda run: run[0])
+
+    failures = []
+    if total_ms > budget_ms:
+        failures.append(f"{name}: {total_ms:.0f} ms exceeds the {budget_ms:.0f} ms budget")
+    for module in scenario['forbidden']:
+        if module in loaded:
+            failures.append(f"{name}: imports {module} ({loaded[module]:.0f} ms)")
+
+    watched = ', '.join(f"{module} {loaded[module]:.0f} ms" for module in WATCHED if module in loaded)
+    status = 'FAIL' if failures else 'ok'
+    print(f"{name:<8} {total_ms:7.1f} ms (budget {budget_ms:.0f} ms) {status}  [{watched or 'no heavy modules'}]")
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check cold-start import time with python -X importtime")
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per scenario; the fastest counts (default: 5)")
+    parser.add_argument('--budget-ms', type=float, default=None, help="Override every scenario's budget")
+    args = parser.parse_args(argv)
+
+    failures = []
+    for name in args.scenarios:
+        failures.extend(check(name, SCENARIOS[name], args.repeat, args.budget_ms))
+    for failure in failures:
+        print(f"  {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
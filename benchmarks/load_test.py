@@ -0,0 +1,127 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import httpx
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+from benchmarks.corpora import make_corpus
+from benchmarks.stub_llm import StubLLMServer
+
+console = Console()
+
+ENDPOINTS = ['analyze', 'batch', 'interpret']
+
+def _requests(endpoint, names, batch_size):
+    """(path, body) pairs for one endpoint over the corpus."""
+    if endpoint == 'analyze':
+        return [('/analyze', {'name': name}) for name in names]
+    if endpoint == 'batch':
+        return [('/analyze/batch', {'names': names[i:i + batch_size]}) for i in range(0, len(names), batch_size)]
+    if endpoint == 'interpret':
+        return [('/interpret', {'name': name}) for name in names]
+    raise ValueError(f"Unknown endpoint: {endpoint}")
+
+async def _drive(client, requests, concurrency, accept):
+    """Send requests with up to `concurrency` in flight; returns (latencies_ns, errors, seconds)."""
+    queue = iter(requests)
+    latencies = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        for path, body in queue:
+            start = time.perf_counter_ns()
+            try:
+                response = await client.post(path, content=json.dumps(body), headers={
+                    'content-type': 'application/json', 'accept': accept
+                })
+                failed = response.status_code != 200
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter_ns() - start)
+            errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+async def run_load_test(endpoints, names, concurrency, batch_size, url=None, accept='application/json'):
+    """Load-test each endpoint, against a running server at url or the in-process ASGI app."""
+    if url:
+        client = httpx.AsyncClient(base_url=url, timeout=60.0,
+                                   limits=httpx.Limits(max_connections=concurrency))
+    else:
+        from server import app
+        app.warm()
+        client = httpx.AsyncClient(base_url='http://server', transport=httpx.ASGITransport(app=app), timeout=60.0)
+
+    results = {}
+    async with client:
+        for endpoint in endpoints:
+            requests = _requests(endpoint, names, batch_size)
+            # A few untimed requests first, so connection setup and first-use costs stay out
+            await _drive(client, requests[:concurrency], concurrency, accept)
+            latencies, errors, seconds = await _drive(client, requests, concurrency, accept)
+            latencies = np.array(latencies, dtype=np.float64)
+            results[endpoint] = {
+                'requests': len(requests),
+                'requests_per_second': len(requests) / seconds,
+                'names_per_second': len(names) / seconds,
+                'p50_ms': float(np.percentile(latencies, 50)) / 1e6,
+                'p99_ms': float(np.percentile(latencies, 99)) / 1e6,
+                'errors': int(errors)
+            }
+        if not url:
+            await app.close()
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the HTTP service against a stub LLM")
+    parser.add_argument('--url', help="Base URL of a running server (default: drive server.app in-process)")
+    parser.add_argument('--endpoints', nargs='+', choices=ENDPOINTS, default=ENDPOINTS)
+    parser.add_argument('--requests', type=int, default=2000, help="Names sent to each endpoint (default: 2000)")
+    parser.add_argument('--concurrency', type=int, default=32, help="Requests in flight (default: 32)")
+    parser.add_argument('--batch-size', type=int, default=100, help="Names per /analyze/batch request (default: 100)")
+    parser.add_argument('--corpus', default='multi_part', help="Corpus kind from benchmarks/corpora.py")
+    parser.add_argument('--llm-delay', type=float, default=0.0, help="Stub LLM latency per request in seconds")
+    parser.add_argument('--msgpack', action='store_true', help="Ask for msgpack responses")
+    args = parser.parse_args(argv)
+
+    names = make_corpus(args.corpus, args.requests)
+    accept = 'application/x-msgpack' if args.msgpack else 'application/json'
+    with StubLLMServer(delay=args.llm_delay) as stub:
+        # Only the in-process app picks these up; a separate server needs them in its own environment
+        os.environ.update({
+            'LLM_PROVIDER': 'ollama',
+            'OLLAMA_MODEL': 'stub',
+            'OLLAMA_BASE_URL': stub.base_url,
+            'INTERPRETATION_CACHE_ENABLED': 'false'
+        })
+        # The analyzers and the interpreter print progress and errors; keep them out of the report
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            results = asyncio.run(run_load_test(
+                args.endpoints, names, args.concurrency, args.batch_size, url=args.url, accept=accept
+            ))
+
+    table = Table(title=f"{args.url or 'in-process'}: {len(names)} {args.corpus} names, concurrency {args.concurrency}")
+    for column in ['Endpoint', 'requests', 'req/sec', 'names/sec', 'p50 ms', 'p99 ms', 'errors']:
+        table.add_column(column)
+    for endpoint, stats in results.items():
+        table.add_row(endpoint, str(stats['requests']), f"{stats['requests_per_second']:,.0f}",
+                      f"{stats['names_per_second']:,.0f}", f"{stats['p50_ms']:.2f}", f"{stats['p99_ms']:.2f}",
+                      str(stats['errors']))
+    console.print(table)
+    return 1 if any(stats['errors'] for stats in results.values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
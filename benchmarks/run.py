@@ -0,0 +1,241 @@
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+from benchmarks.corpora import make_corpus, CORPUS_KINDS
+from benchmarks.stub_llm import StubLLMServer
+
+console = Console()
+
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+# Benchmarked entry points, in report order
+TARGETS = [
+    'get_numerology',
+    'analyze_phonetics',
+    'analyze_frequency',
+    'analyze_name_vibration',
+    'analyze_cultural_elements',
+    'analyze_name',
+    'analyze_many',
+    'find_similar'
+]
+
+def _has_error(result):
+    """True if an analyzer result reports an error instead of raising."""
+    if isinstance(result, dict):
+        return 'error' in result
+    if hasattr(result, 'analyses'):
+        return any(isinstance(value, dict) and 'error' in value for value in result.analyses.values())
+    return False
+
+def _make_target(target, names):
+    """Return a callable(name) for a per-name target; imports and setup happen here, outside the timings."""
+    if target == 'get_numerology':
+        from analyzers.numerology import get_numerology
+        return get_numerology
+    if target == 'analyze_phonetics':
+        from analyzers.phonetics import analyze_phonetics
+        return analyze_phonetics
+    if target == 'analyze_frequency':
+        from analyzers.frequency import analyze_frequency
+        return analyze_frequency
+    if target == 'analyze_name_vibration':
+        from analyzers.vibration import VibrationAnalyzer
+        return VibrationAnalyzer().analyze_name_vibration
+    if target == 'analyze_cultural_elements':
+        from analyzers.cultural_patterns import CulturalAnalyzer
+        return CulturalAnalyzer.analyze_cultural_elements
+    if target == 'analyze_name':
+        from analyzers.name_analyzer import NameAnalyzer
+        return NameAnalyzer().analyze_name
+    if target == 'find_similar':
+        # Look every name up in an index of the whole corpus
+        import tempfile
+        from analyzers.sound_index import SoundIndex
+        index = SoundIndex.build(os.path.join(tempfile.mkdtemp(), 'sound_index'), names)
+        return index.find_similar
+    raise ValueError(f"Unknown benchmark target: {target}")
+
+def _time_per_name(func, names, warmup):
+    latencies = []
+    errors = 0
+    for name in names[:warmup]:
+        with contextlib.suppress(Exception):
+            func(name)
+    for name in names:
+        start = time.perf_counter_ns()
+        try:
+            result = func(name)
+        except Exception:
+            result = {'error': True}
+        latencies.append(time.perf_counter_ns() - start)
+        errors += _has_error(result)
+    return latencies, errors, len(names)
+
+def _time_batch(names, chunk_size):
+    """Time NameAnalyzer.analyze_many; latency is per chunk, divided by its size."""
+    from analyzers.name_analyzer import NameAnalyzer
+    analyzer = NameAnalyzer(use_llm=False)
+    list(analyzer.analyze_many(names[:chunk_size], chunk_size=chunk_size))
+
+    latencies = []
+    errors = 0
+    chunks = analyzer.analyze_many(names, chunk_size=chunk_size)
+    while True:
+        start = time.perf_counter_ns()
+        columns = next(chunks, None)
+        elapsed = time.perf_counter_ns() - start
+        if columns is None:
+            break
+        rows = len(columns['name'])
+        latencies.extend([elapsed / rows] * rows)
+        errors += sum(error is not None for error in columns['error'])
+    return latencies, errors, len(names)
+
+def _run_target(target, kind, size, seed, warmup, env):
+    """Benchmark one target on one corpus; runs in a fresh process so peak RSS is its own."""
+    os.environ.update(env)
+    names = make_corpus(kind, size, seed)
+
+    # Analyzers print progress and errors; keep them out of the report
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        if target == 'analyze_many':
+            latencies, errors, count = _time_batch(names, chunk_size=max(1, size // 10))
+        else:
+            latencies, errors, count = _time_per_name(_make_target(target, names), names, warmup)
+
+    latencies = np.array(latencies, dtype=np.float64)
+    total_seconds = latencies.sum() / 1e9
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    peak_rss_mb = peak_rss / (1024 * 1024) if sys.platform == 'darwin' else peak_rss / 1024
+    return {
+        'names': count,
+        'names_per_second': count / total_seconds if total_seconds else 0.0,
+        'p50_ms': float(np.percentile(latencies, 50)) / 1e6,
+        'p99_ms': float(np.percentile(latencies, 99)) / 1e6,
+        'peak_rss_mb': peak_rss_mb,
+        'errors': int(errors)
+    }
+
+def _git(*args):
+    try:
+        return subprocess.run(['git', *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+def run_benchmarks(targets, kinds, size, seed=1234, warmup=20, delay=0.0):
+    """Run every target on every corpus kind and return the results document."""
+    results = {}
+    context = multiprocessing.get_context('spawn')
+    with StubLLMServer(delay=delay) as stub:
+        env = {
+            'LLM_PROVIDER': 'ollama',
+            'OLLAMA_MODEL': 'stub',
+            'OLLAMA_BASE_URL': stub.base_url,
+            'INTERPRETATION_CACHE_ENABLED': 'false'
+        }
+        with context.Pool(1, maxtasksperchild=1) as pool:
+            for target in targets:
+                results[target] = {}
+                for kind in kinds:
+                    console.print(f"[cyan]{target}[/cyan] on {kind} names...", end=' ')
+                    stats = pool.apply(_run_target, (target, kind, size, seed, warmup, env))
+                    results[target][kind] = stats
+                    console.print(f"{stats['names_per_second']:,.0f} names/sec")
+
+    return {
+        'commit': _git('rev-parse', 'HEAD'),
+        'dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'size': size,
+        'seed': seed,
+        'results': results
+    }
+
+def load_results(ref):
+    """Load a results file by path or by (abbreviated) commit hash."""
+    if os.path.exists(ref):
+        path = ref
+    else:
+        commit = _git('rev-parse', ref) or ref
+        path = os.path.join(RESULTS_DIR, f"{commit}.json")
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+def compare_results(baseline, current, threshold=0.1):
+    """Print a comparison table and return the (target, corpus, metric) triples that regressed."""
+    table = Table(title=f"{baseline['commit'][:10]} -> {current['commit'][:10]}")
+    for column in ['Target', 'Corpus', 'names/sec', 'p99 ms', 'peak RSS MB']:
+        table.add_column(column)
+
+    regressions = []
+    for target, kinds in current['results'].items():
+        for kind, stats in kinds.items():
+            old = baseline['results'].get(target, {}).get(kind)
+            if not old:
+                continue
+            cells = []
+            # Higher is better for throughput, lower for latency and memory
+            for metric, higher_is_better in (('names_per_second', True), ('p99_ms', False), ('peak_rss_mb', False)):
+                change = (stats[metric] - old[metric]) / old[metric] if old[metric] else 0.0
+                regressed = -change > threshold if higher_is_better else change > threshold
+                if regressed:
+                    regressions.append((target, kind, metric))
+                color = 'red' if regressed else 'white'
+                cells.append(f"[{color}]{stats[metric]:,.2f} ({change:+.1%})[/{color}]")
+            table.add_row(target, kind, *cells)
+
+    console.print(table)
+    return regressions
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Benchmark the analyzers and the end-to-end pipeline")
+    parser.add_argument('--size', type=int, default=1000, help="Names per corpus (default: 1000)")
+    parser.add_argument('--seed', type=int, default=1234, help="Corpus seed (default: 1234)")
+    parser.add_argument('--targets', nargs='+', choices=TARGETS, default=TARGETS)
+    parser.add_argument('--corpora', nargs='+', choices=CORPUS_KINDS, default=CORPUS_KINDS)
+    parser.add_argument('--llm-delay', type=float, default=0.0, help="Stub LLM latency per request in seconds")
+    parser.add_argument('--compare', metavar='REF', help="Commit hash or results file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.1, help="Relative change counted as a regression (default: 0.1)")
+    parser.add_argument('--output', help="Results file (default: benchmarks/results/<commit>.json)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv if argv is not None else sys.argv[1:])
+    current = run_benchmarks(args.targets, args.corpora, args.size, seed=args.seed, delay=args.llm_delay)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{current['commit'] or 'unknown'}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as handle:
+        json.dump(current, handle, indent=2)
+    console.print(f"[green]Results written to {output}[/green]")
+
+    if args.compare:
+        regressions = compare_results(load_results(args.compare), current, args.threshold)
+        if regressions:
+            console.print(f"[red]{len(regressions)} regression(s) above {args.threshold:.0%}[/red]")
+            return 1
+        console.print("[green]No regressions[/green]")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+import json
+import random
+import re
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Canned response with every section the formatter and the Streamlit app expect
+STUB_INTERPRETATION = """Overall Impression:
+A balanced name with a steady, open sound.
+
+Key Strengths:
+1. Clear communication
+2. Adaptability
+3. Calm presence
+
+Growth Areas:
+1. Decisiveness
+2. Patience with detail
+
+Life Path Insights:
+Suited to roles that combine structure with creativity.
+
+Deeper Analysis:
+The numbers, sounds and vibration point in the same direction."""
+
+def stub_batch_response(prompt):
+    """JSON reply to a batched interpretation prompt: one entry per "[id] name" line."""
+    sections = STUB_INTERPRETATION.split('\n\n')
+    text = [section.split('\n', 1)[1] for section in sections]
+    points = [[line.split('. ', 1)[1] for line in section.split('\n')] for section in text[1:3]]
+    return json.dumps({'interpretations': [
+        {
+            'id': int(item_id),
+            'overall_impression': text[0],
+            'key_strengths': points[0],
+            'growth_areas': points[1],
+            'life_path_insights': text[3],
+            'deeper_analysis': text[4]
+        }
+        for item_id in re.findall(r'^\[(\d+)\]', prompt, flags=re.MULTILINE)
+    ]})
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Minimal Ollama API: /api/tags, /api/show and /api/generate (streaming, JSON mode or plain)."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._send_json({'models': [{'name': 'stub'}]})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+        if self.path != '/api/generate':
+            self._send_json({'name': request.get('name', 'stub')})
+            return
+
+        self.server.requests += 1
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        if self.server.error_rate and self.server.random.random() < self.server.error_rate:
+            self.server.errors += 1
+            self._send_json({'error': 'server overloaded'}, status=503)
+            return
+
+        if request.get('format') == 'json':
+            self._send_json({'response': stub_batch_response(request.get('prompt', '')), 'done': True})
+            return
+
+        if not request.get('stream'):
+            self._send_json({'response': STUB_INTERPRETATION, 'done': True})
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.end_headers()
+        for line in STUB_INTERPRETATION.split('\n'):
+            self.wfile.write((json.dumps({'response': line + '\n', 'done': False}) + '\n').encode('utf-8'))
+        self.wfile.write((json.dumps({'response': '', 'done': True}) + '\n').encode('utf-8'))
+
+class StubLLMServer:
+    """Local stand-in for an Ollama server, run on a background thread.
+
+    Use as a context manager; base_url points NameInterpreter at it via
+    OLLAMA_BASE_URL. delay adds a fixed latency to every generation, and
+    error_rate is the share of generations answered with a 503 overload error.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, delay=0.0, error_rate=0.0, seed=1234):
+        self._server = ThreadingHTTPServer((host, port), _StubHandler)
+        self._server.daemon_threads = True
+        self._server.delay = delay
+        self._server.error_rate = error_rate
+        self._server.random = random.Random(seed)
+        self._server.requests = 0
+        self._server.errors = 0
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self):
+        """Number of generation requests served so far."""
+        return self._server.requests
+
+    @property
+    def errors(self):
+        """Number of generation requests answered with an injected error."""
+        return self._server.errors
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._server.shutdown()
+        self._server.server_close()
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Run the stub Ollama server in the foreground")
+    parser.add_argument('--port', type=int, default=11434)
+    parser.add_argument('--delay', type=float, default=0.0, help="Seconds of latency per generation")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Share of generations failing with a 503")
+    args = parser.parse_args()
+    with StubLLMServer(port=args.port, delay=args.delay, error_rate=args.error_rate) as server:
+        print(f"Stub LLM listening on {server.base_url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
@@ -1,14 +1,8 @@
-from analyzers.name_analyzer import NameAnalyzer
-from analyzers.numerology import get_numerology
-from analyzers.phonetics import analyze_phonetics
-from analyzers.frequency import analyze_frequency
-from analyzers.vibration import VibrationAnalyzer
-from analyzers.cultural_patterns import CulturalAnalyzer
-from utils.formatter import format_results
 from rich.console import Console
+from rich.panel import Panel
 from rich.prompt import Prompt
 from rich.progress import Progress, SpinnerColumn, TextColumn
-from analyzers.llm_interpreter import NameInterpreter
+import argparse
 import signal
 import sys
 import os
@@ -18,6 +12,9 @@ console = Console()
 # Global flag for interruption
 interrupted = False
 
+# Analyzer shared by every name of the interactive session, created on first use
+analyzer = None
+
 def signal_handler(signum, frame):
     """Handle interrupt signal."""
     global interrupted
@@ -31,7 +28,67 @@ def force_quit_handler(signum, frame):
     console.print("\n[red]Force quitting...[/red]")
     os._exit(1)  # More aggressive exit
 
-def analyze_name(name):
+def get_analyzer(use_llm=True):
+    """Create the session's NameAnalyzer, offering basic mode if the LLM cannot be set up."""
+    global analyzer
+    if analyzer is None:
+        # Imported here so --help and the other subcommands start without the analyzers
+        from analyzers.name_analyzer import NameAnalyzer
+        analyzer = NameAnalyzer(use_llm=use_llm)
+        if use_llm:
+            try:
+                analyzer.interpreter
+            except Exception as e:
+                console.print(Panel(
+                    f"[red]Error initializing AI mode:[/red]\n" +
+                    f"[yellow]{str(e)}[/yellow]\n\n" +
+                    "[white]Would you like to:[/white]\n" +
+                    "1. Continue in basic mode\n" +
+                    "2. Quit and fix Ollama setup",
+                    title="AI Setup Error"
+                ))
+                choice = console.input("\nEnter choice [1/2]: ")
+                if choice != "1":
+                    raise SystemExit(1)
+                analyzer = NameAnalyzer(use_llm=False)
+    return analyzer
+
+def enable_tracing():
+    """Record span timings in memory for print_trace_summary."""
+    from utils import tracing
+    tracer = tracing.get_tracer()
+    if tracer.find(tracing.HistogramExporter) is None:
+        tracer.add_exporter(tracing.HistogramExporter())
+
+def print_trace_summary():
+    """Print and reset the recorded span timings and counters, if tracing to memory."""
+    if 'utils.tracing' not in sys.modules:
+        return
+    from rich.table import Table
+    from utils import tracing
+    tracer = tracing.get_tracer()
+    histogram = tracer.find(tracing.HistogramExporter)
+    if histogram is None:
+        return
+    summary = histogram.summary()
+    if not summary and not tracer.counters:
+        return
+
+    table = Table(title="Stage Timings (ms)")
+    table.add_column("Stage", style="cyan", no_wrap=True)
+    for column in ("Calls", "Errors", "Total", "Mean", "p50", "p99"):
+        table.add_column(column, justify="right", no_wrap=True)
+    for name, stats in summary.items():
+        table.add_row(
+            name, f"{stats['count']:,}", f"{stats['errors']:,}", f"{stats['total_ms']:.1f}",
+            f"{stats['mean_ms']:.3f}", f"{stats['p50_ms']:.3f}", f"{stats['p99_ms']:.3f}"
+        )
+    console.print(table)
+    if tracer.counters:
+        console.print("[dim]" + ", ".join(f"{name}: {value:,}" for name, value in sorted(tracer.counters.items())) + "[/dim]")
+    tracer.reset()
+
+def analyze_name(name, use_llm=True):
     """Perform complete analysis of a name."""
     global interrupted
     
@@ -59,18 +116,22 @@ def analyze_name(name):
             if not name or not any(c.isalpha() for c in name):
                 raise ValueError("Please enter a valid name containing letters.")
                 
-            # Create analyzer instance
-            analyzer = NameAnalyzer()
+            from utils.formatter import format_results
+
+            analyzer = get_analyzer(use_llm)
             
             # Perform analysis
             progress.add_task("Analyzing name patterns...", total=None)
-            profile = analyzer.analyze_name(name)
+            profile = analyzer.analyze_name(name, interpret=False)
             
             if interrupted:
                 raise KeyboardInterrupt
-                
-            # Format and display results
-            format_results(name, profile.get_report())
+
+            # Hide the spinner, then stream the interpretation as it is generated
+            progress.stop()
+            stream = analyzer.stream_interpretation(profile) if analyzer.use_llm else None
+            format_results(name, profile.get_report(), stream=stream)
+            print_trace_summary()
             
         except KeyboardInterrupt:
             console.print("\n[red]Analysis interrupted by user.[/red]")
@@ -83,13 +144,224 @@ def analyze_name(name):
             # Reset the interrupt flag
             interrupted = False
 
-def main():
+def run_batch_command(args):
+    """Analyze a file of names and write columnar results."""
+    from analyzers.batch import run_batch
+
+    if args.workers == 0:
+        args.workers = os.cpu_count() or 1
+
+    console.print(f"[cyan]Analyzing names from {args.input} -> {args.output}[/cyan]")
+    try:
+        stats = run_batch(args.input, args.output, column=args.column,
+                          chunk_size=args.chunk_size, workers=args.workers,
+                          interpret=args.interpret, concurrency=args.concurrency,
+                          llm_batch_size=args.llm_batch_size, dedup=not args.no_dedup)
+    except (OSError, ImportError, ValueError, ConnectionError) as e:
+        console.print(f"[red]Batch Error: {str(e)}[/red]")
+        return 1
+
+    console.print(
+        f"[green]Analyzed {stats['rows']:,} names in {stats['seconds']:.2f}s "
+        f"({stats['names_per_second']:,.0f} names/sec)[/green]"
+    )
+    if not args.no_dedup:
+        console.print(
+            f"[dim]{stats['analyzed']:,} distinct names analyzed "
+            f"(dedup ratio {stats['dedup_ratio']:.1f}x)[/dim]"
+        )
+    if stats['lookup']:
+        console.print(
+            f"[dim]{stats['lookup']['coverage']:.1%} of analyzed names answered from the lookup table[/dim]"
+        )
+    return 0
+
+def run_reanalyze_command(args):
+    """Update stored results for a file of names, recomputing only changed analyzers and prompts."""
+    from rich.table import Table
+    from analyzers.batch import run_reanalysis
+    from utils.result_store import ResultStore
+
+    console.print(f"[cyan]Re-analyzing names from {args.input}[/cyan]")
+    try:
+        with ResultStore(args.store) as store:
+            stats = run_reanalysis(args.input, args.output, column=args.column, chunk_size=args.chunk_size,
+                                   store=store, interpret=args.interpret, concurrency=args.concurrency,
+                                   llm_batch_size=args.llm_batch_size, prune=args.prune)
+    except (OSError, ImportError, ValueError, ConnectionError) as e:
+        console.print(f"[red]Reanalyze Error: {str(e)}[/red]")
+        return 1
+
+    table = Table(title=f"{stats['rows']:,} names in {stats['seconds']:.2f}s")
+    for column in ['Analyzer', 'Fingerprint', 'Recomputed', 'Reused']:
+        table.add_column(column)
+    for analyzer_name, counts in stats['counts'].items():
+        table.add_row(analyzer_name, stats['fingerprints'].get(analyzer_name, 'per prompt'),
+                      f"{counts['computed']:,}", f"{counts['reused']:,}")
+    console.print(table)
+    if args.output:
+        console.print(f"[green]Results written to {args.output}[/green]")
+    return 0
+
+def run_patterns_command(args):
+    """Compile external cultural-pattern dictionaries into the on-disk index."""
+    from analyzers.pattern_index import PatternIndex, compile_pattern_files, DEFAULT_PATTERN_INDEX_PATH
+    from utils.config import get_env
+
+    index_path = args.index or get_env("CULTURAL_PATTERN_INDEX", DEFAULT_PATTERN_INDEX_PATH)
+    try:
+        for culture in args.remove:
+            if PatternIndex.remove(index_path, culture):
+                console.print(f"[yellow]Removed culture: {culture}[/yellow]")
+        rebuilt = compile_pattern_files(args.files, index_path)
+    except (OSError, ValueError) as e:
+        console.print(f"[red]Pattern Error: {str(e)}[/red]")
+        return 1
+
+    if rebuilt:
+        console.print(f"[green]Compiled {len(rebuilt)} culture(s) into {index_path}: {', '.join(rebuilt)}[/green]")
+    else:
+        console.print(f"[green]Pattern index at {index_path} is up to date[/green]")
+    return 0
+
+def run_lookup_command(args):
+    """Build the common-name lookup table, or report how much of a file of names it covers."""
+    from analyzers.lookup_table import LookupTable, DEFAULT_LOOKUP_TABLE_PATH
+    from analyzers.batch import read_names
+    from utils.config import get_env
+
+    table_path = args.table or get_env("LOOKUP_TABLE_PATH", DEFAULT_LOOKUP_TABLE_PATH)
+    try:
+        if args.build:
+            console.print(f"[cyan]Analyzing names from {args.input} -> {table_path}[/cyan]")
+            table = LookupTable.build(table_path, read_names(args.input, column=args.column), limit=args.limit)
+            console.print(f"[green]Stored {len(table):,} names in {table_path}[/green]")
+            return 0
+        table = LookupTable(table_path)
+        found, total = table.coverage(read_names(args.input, column=args.column))
+    except FileNotFoundError:
+        console.print(f"[red]Lookup Error: no lookup table at {table_path}; build one with --build[/red]")
+        return 1
+    except (OSError, ImportError, ValueError) as e:
+        console.print(f"[red]Lookup Error: {str(e)}[/red]")
+        return 1
+
+    coverage = found / total if total else 0.0
+    console.print(f"[green]{found:,} of {total:,} names ({coverage:.1%}) are answered from {table_path}[/green]")
+    return 0
+
+def run_similar_command(args):
+    """List names from an indexed corpus that sound like a name, building the index from --corpus first."""
+    from rich.table import Table
+    from analyzers.sound_index import SoundIndex, DEFAULT_SOUND_INDEX_PATH
+    from analyzers.phonetics import get_sound_code
+    from utils.config import get_env
+
+    index_path = args.index or get_env("SOUND_INDEX_PATH", DEFAULT_SOUND_INDEX_PATH)
+    try:
+        if args.corpus:
+            from analyzers.batch import read_names
+            index = SoundIndex.build(index_path, read_names(args.corpus, column=args.column))
+            console.print(f"[green]Indexed {len(index):,} names into {index_path}[/green]")
+        else:
+            index = SoundIndex(index_path)
+        matches = index.find_similar(args.name, k=args.limit, max_distance=args.max_distance)
+    except FileNotFoundError:
+        console.print(f"[red]Similar Error: no sound index at {index_path}; build one with --corpus[/red]")
+        return 1
+    except (OSError, ImportError, ValueError) as e:
+        console.print(f"[red]Similar Error: {str(e)}[/red]")
+        return 1
+
+    table = Table(title=f"Names that sound like {args.name} ({get_sound_code(args.name.strip())})")
+    for column in ['Name', 'Sound code', 'Edit distance']:
+        table.add_column(column)
+    for name, distance in matches:
+        table.add_row(name, get_sound_code(name), str(distance))
+    console.print(table)
+    return 0
+
+def parse_args(argv):
+    """Parse command line arguments; no subcommand starts the interactive prompt."""
+    parser = argparse.ArgumentParser(description="Name Analysis Tool")
+    parser.add_argument('--no-llm', action='store_true',
+                        help="Skip the AI interpretation; no LLM client is created or contacted")
+    parser.add_argument('--trace', action='store_true',
+                        help="Time each analysis stage and LLM request, and print a summary")
+    subparsers = parser.add_subparsers(dest='command')
+
+    batch_parser = subparsers.add_parser('batch', help="Analyze a CSV, Parquet or text file of names")
+    batch_parser.add_argument('input', help="Input file (.csv, .parquet or one name per line)")
+    batch_parser.add_argument('output', help="Output file (.parquet or .csv)")
+    batch_parser.add_argument('--column', default='name', help="Column holding the names (default: name)")
+    batch_parser.add_argument('--chunk-size', type=int, default=10000, help="Rows per chunk (default: 10000)")
+    batch_parser.add_argument('--workers', type=int, default=1,
+                              help="Worker processes; 0 uses every CPU core (default: 1)")
+    batch_parser.add_argument('--no-dedup', action='store_true',
+                              help="Analyze every row, even names that repeat (with different case)")
+    batch_parser.add_argument('--interpret', action='store_true',
+                              help="Add an LLM interpretation column (slow; uses the configured provider)")
+    batch_parser.add_argument('--concurrency', type=int, default=None,
+                              help="LLM requests kept in flight with --interpret (default: LLM_CONCURRENCY or 8)")
+    batch_parser.add_argument('--llm-batch-size', type=int, default=None,
+                              help="Names interpreted per LLM request with --interpret (default: LLM_BATCH_SIZE or 1)")
+
+    reanalyze_parser = subparsers.add_parser(
+        'reanalyze', help="Update stored results, recomputing only analyzers and prompts that changed"
+    )
+    reanalyze_parser.add_argument('input', help="Input file (.csv, .parquet or one name per line)")
+    reanalyze_parser.add_argument('output', nargs='?', default=None, help="Optional output file (.parquet or .csv)")
+    reanalyze_parser.add_argument('--column', default='name', help="Column holding the names (default: name)")
+    reanalyze_parser.add_argument('--chunk-size', type=int, default=10000, help="Rows per chunk (default: 10000)")
+    reanalyze_parser.add_argument('--store', default=None,
+                                  help="Result store (default: RESULT_STORE_PATH or .cache/results.sqlite3)")
+    reanalyze_parser.add_argument('--interpret', action='store_true',
+                                  help="Also interpret names whose prompt changed (uses the configured provider)")
+    reanalyze_parser.add_argument('--concurrency', type=int, default=None,
+                                  help="LLM requests kept in flight with --interpret (default: LLM_CONCURRENCY or 8)")
+    reanalyze_parser.add_argument('--llm-batch-size', type=int, default=None,
+                                  help="Names interpreted per LLM request with --interpret (default: LLM_BATCH_SIZE or 1)")
+    reanalyze_parser.add_argument('--prune', action='store_true',
+                                  help="Delete stored results from older analyzer versions")
+
+    lookup_parser = subparsers.add_parser(
+        'lookup', help="Build the common-name lookup table, or report its coverage of a file of names"
+    )
+    lookup_parser.add_argument('input', help="Names (.csv, .parquet or one name per line), most common first for --build")
+    lookup_parser.add_argument('--build', action='store_true', help="Precompute results for these names")
+    lookup_parser.add_argument('--limit', type=int, default=None, help="With --build, store only the first N distinct names")
+    lookup_parser.add_argument('--column', default='name', help="Column holding the names (default: name)")
+    lookup_parser.add_argument('--table', default=None,
+                               help="Table directory (default: LOOKUP_TABLE_PATH or .cache/lookup_table)")
+
+    similar_parser = subparsers.add_parser('similar', help="Find names that sound like a name")
+    similar_parser.add_argument('name', help="Name to look up")
+    similar_parser.add_argument('--corpus', default=None,
+                                help="Index this file of names first (.csv, .parquet or one name per line)")
+    similar_parser.add_argument('--column', default='name', help="Column holding the names (default: name)")
+    similar_parser.add_argument('--index', default=None,
+                                help="Index directory (default: SOUND_INDEX_PATH or .cache/sound_index)")
+    similar_parser.add_argument('-k', '--limit', type=int, default=10, help="Names to list (default: 10)")
+    similar_parser.add_argument('--max-distance', type=int, default=None,
+                                help="Leave out names more than this many edits away")
+
+    patterns_parser = subparsers.add_parser('patterns', help="Compile JSON/TSV cultural-pattern dictionaries")
+    patterns_parser.add_argument('files', nargs='*', help="Pattern dictionaries (.json or .tsv)")
+    patterns_parser.add_argument('--index', default=None,
+                                 help="Index directory (default: CULTURAL_PATTERN_INDEX or .cache/pattern_index)")
+    patterns_parser.add_argument('--remove', nargs='+', default=[], metavar='CULTURE',
+                                 help="Drop cultures from the index")
+
+    return parser.parse_args(argv)
+
+def main(use_llm=True):
     """Main program loop."""
     console.clear()
     console.print("[bold magenta]Name Analysis Tool - Advanced Edition[/bold magenta]")
     console.print("[dim]Analyzing names through numerology, phonetics, and vibration patterns[/dim]")
     console.print("[dim]Enter a name to analyze (or 'quit' to exit)[/dim]")
     console.print("[dim]Press Ctrl+C at any time to interrupt the analysis[/dim]\n")
+    get_analyzer(use_llm)
     
     while True:
         try:
@@ -103,7 +375,7 @@ def main():
                 console.print("[red]Please enter a valid name.[/red]")
                 continue
                 
-            analyze_name(name)
+            analyze_name(name, use_llm)
             
         except KeyboardInterrupt:
             console.print("\n[yellow]Goodbye![/yellow]")
@@ -114,4 +386,18 @@ def main():
             continue
 
 if __name__ == "__main__":
-    main()
+    args = parse_args(sys.argv[1:])
+    if args.trace:
+        enable_tracing()
+    commands = {
+        'batch': run_batch_command,
+        'reanalyze': run_reanalyze_command,
+        'lookup': run_lookup_command,
+        'similar': run_similar_command,
+        'patterns': run_patterns_command
+    }
+    if args.command in commands:
+        status = commands[args.command](args)
+        print_trace_summary()
+        sys.exit(status)
+    main(use_llm=not args.no_llm)
@@ -0,0 +1,252 @@
+import asyncio
+import json
+from collections import OrderedDict
+from analyzers.name_analyzer import NameAnalyzer, BATCH_COLUMNS
+from analyzers.dedup import DedupNameAnalyzer
+from analyzers.phoneme_index import get_phoneme_index
+from utils.config import get_env
+from utils import tracing
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON_TYPE = 'application/json'
+MSGPACK_TYPE = 'application/x-msgpack'
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class NameService:
+    """ASGI app serving the deterministic analyses from a warm NameAnalyzer.
+
+    Each worker process keeps one analyzer, its mapped phoneme index and
+    bounded result caches for repeated names. LLM interpretation is off the
+    hot path: /analyze never calls the LLM, and /interpret uses a lazily
+    created AsyncNameInterpreter. Responses are compact JSON, or msgpack when the
+    client accepts application/x-msgpack and msgpack is installed.
+    """
+
+    def __init__(self, max_batch=None, cache_size=None, max_body_bytes=None):
+        self.max_batch = max_batch or get_env("SERVER_MAX_BATCH", 1000, int)
+        self.cache_size = cache_size or get_env("SERVER_CACHE_SIZE", 100000, int)
+        self.max_body_bytes = max_body_bytes or get_env("SERVER_MAX_BODY_BYTES", 1048576, int)
+        self.analyzer = None
+        self.batch_analyzer = None
+        self._results = OrderedDict()
+        self._interpreter = None
+        self._interpreter_lock = None
+        self.routes = {
+            ('GET', '/health'): self.health,
+            ('GET', '/traces'): self.traces,
+            ('POST', '/analyze'): self.analyze,
+            ('POST', '/analyze/batch'): self.analyze_batch,
+            ('POST', '/interpret'): self.interpret
+        }
+
+    def warm(self):
+        """Map the phoneme index and run one name through every code path."""
+        if self.analyzer is not None:
+            return
+        get_phoneme_index()
+        analyzer = NameAnalyzer(use_llm=False)
+        analyzer.analyze_name('Warm Up', interpret=False)
+        self.batch_analyzer = DedupNameAnalyzer(analyzer, max_entries=self.cache_size)
+        for _ in self.batch_analyzer.analyze_many(['Warm Up']):
+            pass
+        self.analyzer = analyzer
+
+    async def close(self):
+        if self._interpreter is not None:
+            await self._interpreter.aclose()
+            self._interpreter = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    self.warm()
+                except Exception as e:
+                    await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                    return
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _http(self, scope, receive, send):
+        headers = {key.decode('latin-1').lower(): value.decode('latin-1') for key, value in scope['headers']}
+        use_msgpack = msgpack is not None and MSGPACK_TYPE in headers.get('accept', '')
+        try:
+            handler = self.routes.get((scope['method'], scope['path']))
+            if handler is None:
+                if any(path == scope['path'] for _, path in self.routes):
+                    raise HTTPError(405, f"Method {scope['method']} not allowed")
+                raise HTTPError(404, f"Not found: {scope['path']}")
+            # Servers without lifespan support warm up on the first request instead
+            self.warm()
+            body = await self._read_body(receive)
+            request = self._decode(body, headers.get('content-type', '')) if scope['method'] == 'POST' else None
+            status, payload = 200, await handler(request)
+        except HTTPError as e:
+            status, payload = e.status, {'error': str(e)}
+        except Exception as e:
+            print(f"Server error: {str(e)}")
+            status, payload = 500, {'error': str(e)}
+
+        if use_msgpack:
+            content_type, data = MSGPACK_TYPE, msgpack.packb(payload, use_bin_type=True)
+        else:
+            content_type, data = JSON_TYPE, json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', content_type.encode('latin-1')),
+                        (b'content-length', str(len(data)).encode('latin-1'))]
+        })
+        await send({'type': 'http.response.body', 'body': data})
+
+    async def _read_body(self, receive):
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                raise HTTPError(400, "Client disconnected")
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size > self.max_body_bytes:
+                raise HTTPError(413, f"Request body exceeds {self.max_body_bytes} bytes")
+            chunks.append(chunk)
+            if not message.get('more_body'):
+                return b''.join(chunks)
+
+    @staticmethod
+    def _decode(body, content_type):
+        try:
+            if MSGPACK_TYPE in content_type:
+                if msgpack is None:
+                    raise HTTPError(415, "msgpack is not installed on this server")
+                request = msgpack.unpackb(body, raw=False)
+            else:
+                request = json.loads(body or b'{}')
+        except HTTPError:
+            raise
+        except Exception:
+            raise HTTPError(400, "Request body is not valid JSON or msgpack")
+        if not isinstance(request, dict):
+            raise HTTPError(400, "Request body must be an object")
+        return request
+
+    @staticmethod
+    def _name(request):
+        name = request.get('name')
+        if not isinstance(name, str) or not name.strip():
+            raise HTTPError(400, "'name' must be a non-empty string")
+        return name.strip()
+
+    async def health(self, request):
+        health = {'status': 'ok', 'warm': self.analyzer is not None, 'msgpack': msgpack is not None}
+        if self.analyzer is not None and self.analyzer.lookup_table is not None:
+            # Share of this worker's names answered from the lookup table
+            health['lookup'] = self.analyzer.lookup_stats()
+        return health
+
+    async def traces(self, request):
+        """This worker's span timings and counters, if the histogram exporter is enabled."""
+        tracer = tracing.get_tracer()
+        histogram = tracer.find(tracing.HistogramExporter)
+        if histogram is None:
+            return {'enabled': False}
+        return {'enabled': True, 'spans': histogram.summary(), 'counters': dict(tracer.counters)}
+
+    def _analysis(self, name):
+        """Numerology, phonetics and vibration for a name, in the shape prompts are built from."""
+        results = self._results
+        analysis = results.get(name)
+        if analysis is not None:
+            results.move_to_end(name)
+            return dict(analysis)
+
+        analyses = self.analyzer.analyze_name(name, interpret=False).analyses
+        if 'error' in analyses:
+            raise HTTPError(500, analyses['error'].get('message', 'Analysis failed'))
+        analysis = {
+            'name': name,
+            'numerology': analyses['numerology'],
+            'phonetics': analyses['phonetics'],
+            'vibration': analyses['vibration']
+        }
+        results[name] = analysis
+        if len(results) > self.cache_size:
+            results.popitem(last=False)
+        # Callers get their own top-level dict; the cached analyses are never modified
+        return dict(analysis)
+
+    async def analyze(self, request):
+        """POST /analyze {"name": ...} -> the deterministic analyses for one name."""
+        return self._analysis(self._name(request))
+
+    async def analyze_batch(self, request):
+        """POST /analyze/batch {"names": [...]} -> one list per result column, in request order."""
+        names = request.get('names')
+        if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+            raise HTTPError(400, "'names' must be a list of strings")
+        if len(names) > self.max_batch:
+            raise HTTPError(413, f"At most {self.max_batch} names per batch")
+        if not names:
+            return {column: [] for column in BATCH_COLUMNS}
+        return next(self.batch_analyzer.analyze_many(names, chunk_size=len(names)))
+
+    async def _get_interpreter(self):
+        """AsyncNameInterpreter created on first use; the provider check runs off the event loop."""
+        if self._interpreter_lock is None:
+            self._interpreter_lock = asyncio.Lock()
+        async with self._interpreter_lock:
+            if self._interpreter is None:
+                from analyzers.llm_interpreter import NameInterpreter
+                from analyzers.async_interpreter import AsyncNameInterpreter
+                try:
+                    interpreter = await asyncio.get_running_loop().run_in_executor(None, NameInterpreter)
+                except Exception as e:
+                    raise HTTPError(503, f"LLM unavailable: {str(e)}")
+                self._interpreter = AsyncNameInterpreter(interpreter)
+        return self._interpreter
+
+    async def interpret(self, request):
+        """POST /interpret {"name": ...} or a /analyze result -> the analyses plus an interpretation."""
+        name = self._name(request)
+        if all(isinstance(request.get(key), dict) for key in ('numerology', 'phonetics', 'vibration')):
+            analysis = {key: request[key] for key in ('name', 'numerology', 'phonetics', 'vibration')}
+            analysis['name'] = name
+        else:
+            analysis = self._analysis(name)
+        interpreter = await self._get_interpreter()
+        analysis['interpretation'] = await interpreter.generate_interpretation(analysis)
+        return analysis
+
+app = NameService()
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Serve the name analyzers over HTTP (requires uvicorn)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=1, help="Worker processes, each with its own warm analyzer")
+    args = parser.parse_args()
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("uvicorn is required to run the server: pip install uvicorn")
+    uvicorn.run('server:app', host=args.host, port=args.port, workers=args.workers, log_level='warning')
@@ -0,0 +1,43 @@
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Revision the analyzers are compared against
+BASELINE = '4a782e7'
+
+def load_baseline(relative_path):
+    """A module as it was at the baseline revision, or skip the test without git history."""
+    try:
+        source = subprocess.run(['git', 'show', f'{BASELINE}:{relative_path}'],
+                                cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        pytest.skip(f"{relative_path} at {BASELINE} is not available")
+    with tempfile.NamedTemporaryFile('w', suffix='.py', delete=False, encoding='utf-8') as handle:
+        handle.write(source)
+    try:
+        spec = importlib.util.spec_from_file_location(f'baseline_{os.path.basename(relative_path)[:-3]}', handle.name)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        os.unlink(handle.name)
+    return module
+
+@pytest.fixture
+def baseline():
+    """load_baseline, for tests comparing against the baseline analyzers."""
+    return load_baseline
+
+@pytest.fixture(scope='session')
+def corpus():
+    """A few hundred generated names of every corpus kind."""
+    from benchmarks.corpora import make_corpus, CORPUS_KINDS
+    names = []
+    for kind in CORPUS_KINDS:
+        names.extend(make_corpus(kind, 300))
+    return names
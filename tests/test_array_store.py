@@ -0,0 +1,40 @@
+import os
+import numpy as np
+import pytest
+from utils.array_store import save_arrays, load_meta, load_arrays
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'index')
+    save_arrays(path, {'a': np.arange(5, dtype=np.int64), 'b': np.array([1.5], dtype=np.float64)}, {'version': 3})
+    arrays = load_arrays(path, ['a', 'b'])
+    assert type(arrays['a']) is np.ndarray
+    assert arrays['a'].tolist() == [0, 1, 2, 3, 4]
+    assert arrays['b'].tolist() == [1.5]
+    assert load_meta(path, 3, "Test index")['version'] == 3
+
+def test_version_mismatch(tmp_path):
+    path = str(tmp_path / 'index')
+    save_arrays(path, {'a': np.zeros(1)}, {'version': 1})
+    with pytest.raises(ValueError, match="Test index .* has version 1, expected 2"):
+        load_meta(path, 2, "Test index")
+
+def test_replace_keeps_mapped_arrays_readable(tmp_path):
+    path = str(tmp_path / 'index')
+    save_arrays(path, {'a': np.full(100, 1, dtype=np.int64)})
+    old = load_arrays(path, ['a'])['a']
+    save_arrays(path, {'a': np.full(100, 2, dtype=np.int64)})
+    assert load_arrays(path, ['a'])['a'].tolist() == [2] * 100
+    assert old.tolist() == [1] * 100
+    assert sorted(os.listdir(tmp_path)) == ['index']
+
+def test_failed_write_leaves_nothing_behind(tmp_path, monkeypatch):
+    path = str(tmp_path / 'index')
+    save_arrays(path, {'a': np.zeros(3)})
+
+    def fail(*args, **kwargs):
+        raise PermissionError(13, "Read-only file system")
+    monkeypatch.setattr(np, 'save', fail)
+    with pytest.raises(OSError):
+        save_arrays(path, {'a': np.ones(3)})
+    assert sorted(os.listdir(tmp_path)) == ['index']
+    assert load_arrays(path, ['a'])['a'].tolist() == [0, 0, 0]
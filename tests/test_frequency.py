@@ -0,0 +1,36 @@
+import math
+import numpy as np
+from analyzers.frequency import analyze_frequency, analyze_frequency_batch
+
+EDGE_NAMES = ['a', 'Zoë', 'Ana-María', "O'Brien", 'X Æ A-12', 'Александр', 'ßø', '   ', '']
+
+def close(expected, actual):
+    return math.isclose(expected, actual, rel_tol=1e-9, abs_tol=1e-9)
+
+def test_scalar_matches_baseline(baseline, corpus):
+    baseline = baseline('analyzers/frequency.py')
+    for name in EDGE_NAMES + corpus:
+        expected = baseline.analyze_frequency(name)
+        actual = analyze_frequency(name)
+        assert close(expected['average_frequency'], actual['average_frequency']), name
+        assert expected['character_distribution'].keys() == actual['character_distribution'].keys(), name
+        for char, value in expected['character_distribution'].items():
+            assert close(value, actual['character_distribution'][char]), name
+        assert expected['statistics'].keys() == actual['statistics'].keys(), name
+        for key, value in expected['statistics'].items():
+            assert close(value, actual['statistics'][key]), (name, key)
+
+def test_batch_matches_scalar(corpus):
+    names = EDGE_NAMES + corpus
+    batch = analyze_frequency_batch(names)
+    for i, name in enumerate(names):
+        scalar = analyze_frequency(name)
+        if not scalar['statistics']:
+            assert batch['total'][i] == 0 and np.isnan(batch['mean'][i]), name
+            continue
+        assert close(scalar['average_frequency'], batch['average_frequency'][i]), name
+        for key, value in scalar['statistics'].items():
+            assert close(value, batch[key][i]), (name, key)
+        row = dict(zip(batch['alphabet'], batch['counts'][i] / batch['total'][i]))
+        for char, value in scalar['character_distribution'].items():
+            assert close(value, row[char]), (name, char)
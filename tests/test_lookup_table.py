@@ -0,0 +1,56 @@
+import math
+import pytest
+from analyzers.lookup_table import LookupTable
+from analyzers.name_analyzer import NameAnalyzer
+
+def same(expected, actual):
+    """Equal values of the same kind: int stays int and None stays None; floats to 1e-12."""
+    if isinstance(expected, dict):
+        return isinstance(actual, dict) and expected.keys() == actual.keys() and all(
+            same(expected[key], actual[key]) for key in expected
+        )
+    if expected is None or actual is None or isinstance(expected, str):
+        return expected == actual
+    if isinstance(expected, int) != isinstance(actual, int):
+        return False
+    return math.isclose(expected, actual, rel_tol=1e-12, abs_tol=1e-12)
+
+@pytest.fixture(scope='module')
+def table(tmp_path_factory, corpus):
+    return LookupTable.build(str(tmp_path_factory.mktemp('lookup') / 'table'), corpus)
+
+def test_hits_equal_live_results(table, corpus):
+    analyzer = NameAnalyzer(use_llm=False, use_lookup=False)
+    hits = 0
+    for name in dict.fromkeys(name.strip().lower() for name in corpus):
+        stored = table.get(name)
+        if stored is None:
+            continue
+        hits += 1
+        live = analyzer.analyze_name(name, interpret=False).analyses
+        for key in ('numerology', 'phonetics', 'vibration'):
+            assert same(live[key], stored[key]), (name, key, live[key], stored[key])
+    # Names with analysis errors are left out, but most of the corpus is stored
+    assert hits == len(table) and hits > len(corpus) // 2
+
+def test_int_and_none_values_survive(tmp_path):
+    """Fields stored as float64 come back as int or None where the live result had one."""
+    table = LookupTable.build(str(tmp_path / 'table'), ['a', 'aa', 'bob', 'x'])
+    a, aa, x = (table.get(name)['vibration'] for name in ('a', 'aa', 'x'))
+    assert type(a['coherence']) is int and type(a['frequency_range']) is int
+    assert a['strongest_harmonic'] is None and x['strongest_harmonic'] is None
+    # A float that happens to be whole stays a float
+    assert type(aa['frequency_range']) is float and aa['frequency_range'] == 0.0
+    assert table.get('bob')['vibration']['frequency_character'] == 'balanced/harmonious'
+
+def test_lookups_by_case_and_misses(table, corpus):
+    name = next(name for name in corpus if table.get(name.lower()) is not None)
+    assert table.get(name.upper()) == table.get(name.lower())
+    assert table.get('Notinthecorpusatall') is None
+    # Lowercasing 'İ' changes the length, so such names are never answered from the table
+    assert table.get('İ' + name.lower()) is None
+
+def test_coverage(table, corpus):
+    found, total = table.coverage(corpus)
+    assert total == len(corpus)
+    assert found == sum(table.get(name) is not None for name in corpus)
@@ -0,0 +1,58 @@
+import os
+import pytest
+from analyzers.pattern_index import PatternIndex, MATCH_TYPES, SECTIONS
+
+PATTERNS = {
+    'testland': {
+        'endings': {'ce': 'grace', 'ina': 'little one', 'a': 'open'},
+        'elements': {'li': 'light', 'ali': ('noble', 'exalted')},
+        'roots': {'al': 'all', 'ce': 'sky'}
+    },
+    'otherland': {
+        'roots': {'zoë': 'life', 'ëli': 'height'}
+    }
+}
+
+def brute_force(sections, text):
+    """(match_type, pattern, meaning) of every pattern occurring in text, in dictionary order."""
+    return [(MATCH_TYPES[section], pattern, meaning)
+            for section in SECTIONS for pattern, meaning in sections.get(section, {}).items()
+            if pattern in text]
+
+@pytest.fixture
+def index_path(tmp_path):
+    path = str(tmp_path / 'patterns')
+    PatternIndex.update(path, PATTERNS)
+    return path
+
+def test_matches_equal_brute_force(index_path, corpus):
+    index = PatternIndex(index_path)
+    for text in [name.lower() for name in corpus] + ['alice', 'celina', 'zoëli', '']:
+        expected = [(culture, *match) for culture in index.cultures
+                    for match in brute_force(PATTERNS[culture], text)]
+        assert index.matches(text) == expected, text
+
+def test_unchanged_cultures_are_not_rebuilt(index_path):
+    assert PatternIndex.update(index_path, PATTERNS) == []
+    changed = dict(PATTERNS, otherland={'roots': {'zoë': 'alive'}})
+    assert PatternIndex.update(index_path, changed) == ['otherland']
+
+def test_update_keeps_open_shard_readable(index_path):
+    live = PatternIndex(index_path)
+    PatternIndex.update(index_path, {'testland': {'endings': {'ce': 'grace again'}}})
+    # The running index keeps its shard; a fresh one sees the update, and the old shard is gone
+    assert ('testland', 'endings', 'ce', 'grace') in live.matches('alice')
+    assert PatternIndex(index_path).matches('alice') == [('testland', 'endings', 'ce', 'grace again')]
+    directories = {shard['directory'] for shard in PatternIndex(index_path).manifest['shards'].values()}
+    assert set(os.listdir(index_path)) == directories | {'manifest.json'}
+
+def test_remove(index_path):
+    assert PatternIndex.remove(index_path, 'otherland')
+    assert not PatternIndex.remove(index_path, 'otherland')
+    index = PatternIndex(index_path)
+    assert index.cultures == ['testland']
+    assert len(os.listdir(index_path)) == 2
+
+def test_invalid_culture_name(tmp_path):
+    with pytest.raises(ValueError, match="Invalid culture name"):
+        PatternIndex.update(str(tmp_path / 'patterns'), {'../escape': {'roots': {'a': 'b'}}})
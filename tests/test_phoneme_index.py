@@ -0,0 +1,38 @@
+import pronouncing
+import pytest
+import analyzers.phoneme_index as phoneme_index
+from analyzers.phoneme_index import PhonemeIndex
+
+WORDS = ['alice', 'smith', 'zoe', 'katherine', 'o', 'mcdonald', 'xylophone', 'notaword', 'élodie']
+
+@pytest.fixture(scope='module')
+def index():
+    return PhonemeIndex.from_pronunciations()
+
+def test_matches_pronouncing(index):
+    pronouncing.init_cmu()
+    words = WORDS + [word for word, _ in pronouncing.pronunciations[::500]]
+    for word in words:
+        expected = pronouncing.phones_for_word(word)
+        assert index.phones_for_word(word) == (expected[0] if expected else None), word
+
+def test_saved_index_matches_in_memory(tmp_path):
+    pairs = [('alice', 'AE1 L AH0 S'), ('alice', 'AE1 L IH0 S'), ('bob', 'B AA1 B'), ('Zoe', 'Z OW1 IY0')]
+    memory = PhonemeIndex.from_pronunciations(pairs)
+    saved = memory.save(str(tmp_path / 'phonemes'))
+    assert saved.path == str(tmp_path / 'phonemes')
+    assert len(saved) == len(memory) == 3
+    for word in ['alice', 'BOB', 'zoe', 'carol']:
+        assert saved.phones_for_word(word) == memory.phones_for_word(word)
+    assert saved.phones_for_word('alice') == 'AE1 L AH0 S'
+
+def test_unwritable_cache_falls_back_to_memory(tmp_path, monkeypatch, capsys):
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    monkeypatch.setattr(phoneme_index, '_index', None)
+    index = phoneme_index.get_phoneme_index(str(blocker / 'phonemes'))
+    assert index.path is None
+    assert index.phones_for_word('alice') == pronouncing.phones_for_word('alice')[0]
+    # The failure is remembered for the rest of the process
+    assert phoneme_index.get_phoneme_index(str(blocker / 'phonemes')) is index
+    assert "using an in-memory index" in capsys.readouterr().out
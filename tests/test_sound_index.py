@@ -0,0 +1,58 @@
+import json
+import os
+import pytest
+from analyzers.name_token import NameToken
+from analyzers.sound_index import SoundIndex, FOLD_WIDTH
+
+def levenshtein(a, b):
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        row = [i]
+        for j, char_b in enumerate(b, 1):
+            row.append(min(previous[j] + 1, row[-1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = row
+    return previous[-1]
+
+def folded(name):
+    return NameToken(name.strip()).lowered[:FOLD_WIDTH]
+
+@pytest.fixture(scope='module')
+def index(tmp_path_factory, corpus):
+    return SoundIndex.build(str(tmp_path_factory.mktemp('sound') / 'index'), corpus)
+
+def test_distances_match_brute_force(index, corpus):
+    for query in corpus[::7]:
+        matches = index.find_similar(query, k=20)
+        assert matches, query
+        for name, distance in matches:
+            assert distance == levenshtein(folded(query), folded(name)), (query, name)
+        assert [distance for _, distance in matches] == sorted(distance for _, distance in matches)
+
+def test_corpus_names_find_themselves(index, corpus):
+    for name in corpus[::11]:
+        assert index.find_similar(name, k=1) == [(name.strip(), 0)]
+
+def test_distance_counts_characters(tmp_path):
+    index = SoundIndex.build(str(tmp_path / 'index'), ['Zoë', 'Zoe', 'Zak'])
+    assert dict(index.find_similar('zz')) == {'Zoë': 2, 'Zoe': 2, 'Zak': 2}
+    assert dict(index.find_similar('Zoe'))['Zoë'] == 1
+
+def test_max_distance_and_blank_query(index, corpus):
+    assert all(distance <= 1 for _, distance in index.find_similar(corpus[0], k=50, max_distance=1))
+    assert index.find_similar('   ') == []
+
+def test_rebuild_keeps_open_index_readable(tmp_path):
+    path = str(tmp_path / 'index')
+    old = SoundIndex.build(path, ['Anna', 'Anne'])
+    new = SoundIndex.build(path, ['Bob'])
+    assert old.find_similar('Anna', k=1) == [('Anna', 0)]
+    assert new.find_similar('Bob', k=1) == [('Bob', 0)]
+    assert sorted(os.listdir(tmp_path)) == ['index']
+
+def test_old_version_is_rejected(tmp_path):
+    path = str(tmp_path / 'index')
+    SoundIndex.build(path, ['Anna'])
+    with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as handle:
+        json.dump({'version': 1}, handle)
+    with pytest.raises(ValueError, match="version 1"):
+        SoundIndex(path)
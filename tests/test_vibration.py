@@ -0,0 +1,6 @@
+from benchmarks import check_vibration
+
+def test_matches_baseline(baseline):
+    # Skips without git history, like the other baseline comparisons
+    baseline('analyzers/vibration.py')
+    assert check_vibration.main(['--size', '200']) == 0
@@ -0,0 +1,54 @@
+import json
+import os
+import shutil
+import numpy as np
+
+def save_arrays(path, arrays, meta=None):
+    """Write {name: array} as .npy files, plus meta.json if given, to the directory at path.
+
+    The files go to a private directory that is then renamed to path, so
+    readers never see a half-written one. An existing directory is moved
+    aside first and removed once the new one is in place; processes that
+    already mapped its files keep their pages. If another process installs
+    a directory at path in between, its copy is kept and this one discarded.
+    """
+    temp_path = f"{path}.tmp-{os.getpid()}"
+    old_path = f"{path}.old-{os.getpid()}"
+    # Leftovers of a build that died midway
+    shutil.rmtree(temp_path, ignore_errors=True)
+    shutil.rmtree(old_path, ignore_errors=True)
+    try:
+        os.makedirs(temp_path)
+        for name, array in arrays.items():
+            np.save(os.path.join(temp_path, f'{name}.npy'), array)
+        if meta is not None:
+            with open(os.path.join(temp_path, 'meta.json'), 'w', encoding='utf-8') as handle:
+                json.dump(meta, handle)
+    except OSError:
+        shutil.rmtree(temp_path, ignore_errors=True)
+        raise
+
+    try:
+        os.replace(path, old_path)
+    except FileNotFoundError:
+        old_path = None
+    try:
+        os.replace(temp_path, path)
+    except OSError:
+        # Another process finished building first
+        shutil.rmtree(temp_path, ignore_errors=True)
+    if old_path is not None:
+        shutil.rmtree(old_path, ignore_errors=True)
+
+def load_meta(path, version, description):
+    """meta.json of a directory written by save_arrays, checked against the expected format version."""
+    with open(os.path.join(path, 'meta.json'), encoding='utf-8') as handle:
+        meta = json.load(handle)
+    if meta.get('version') != version:
+        raise ValueError(f"{description} at {path} has version {meta.get('version')}, expected {version}")
+    return meta
+
+def load_arrays(path, names):
+    """Memory-map the named .npy files of a directory written by save_arrays."""
+    # Plain ndarray views over the mapping avoid np.memmap's per-access overhead
+    return {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r').view(np.ndarray) for name in names}
@@ -0,0 +1,14 @@
+import os
+
+def get_env(name, default=None, cast=str):
+    """Read an environment setting, ignoring inline '# comments' left in .env values."""
+    raw_value = os.getenv(name)
+    if raw_value is None:
+        return default
+    value = raw_value.split('#')[0].strip()
+    if not value:
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        return default
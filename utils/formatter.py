@@ -1,32 +1,13 @@
 from rich.console import Console
 from rich.panel import Panel
 from rich.traceback import install
-from analyzers.cultural_patterns import CulturalAnalyzer
+from utils.sections import iter_sections
 
 # Install rich traceback handler
 install()
 
 console = Console()
 
-# Initialize LLM mode
-USE_LLM = True
-try:
-    from analyzers.llm_interpreter import NameInterpreter
-    interpreter = NameInterpreter()
-except Exception as e:
-    USE_LLM = False
-    console.print(Panel(
-        f"[red]Error initializing AI mode:[/red]\n" +
-        f"[yellow]{str(e)}[/yellow]\n\n" +
-        "[white]Would you like to:[/white]\n" +
-        "1. Continue in basic mode\n" +
-        "2. Quit and fix Ollama setup",
-        title="AI Setup Error"
-    ))
-    choice = console.input("\nEnter choice [1/2]: ")
-    if choice != "1":
-        raise SystemExit(1)
-
 def get_challenge_meaning(challenge):
     """Interpret challenge numbers."""
     meanings = {
@@ -42,8 +23,21 @@ def get_challenge_meaning(challenge):
     }
     return meanings.get(challenge, "personal growth")
 
-def format_results(name, report):
-    """Format analysis results for display using rich."""    
+# Display titles for each interpretation section
+SECTION_TITLES = {
+    'Overall Impression': "✨ Overall Impression",
+    'Key Strengths': "💪 Key Strengths",
+    'Growth Areas': "🌱 Growth Areas",
+    'Life Path Insights': "🌊 Life Path Insights",
+    'Deeper Analysis': "🔮 Deeper Analysis"
+}
+
+def format_results(name, report, stream=None):
+    """Format analysis results for display using rich.
+
+    When stream yields interpretation chunks, each section is printed as soon
+    as it is complete instead of waiting for the whole interpretation.
+    """    
     # Header with styling
     console.print(Panel(
         f"[bold cyan]Analysis Results for:[/bold cyan] [bold white]{name}[/bold white]",
@@ -64,38 +58,30 @@ def format_results(name, report):
     ))
     
     # Interpretation Section
-    interpretation = report.get('analyses', {}).get('interpretation', '')
-    if interpretation:
-        sections = interpretation.split('\n\n')
-        for section in sections:
-            section = section.strip()
-            if not section:
-                continue
-            
-            if section.lower().startswith('overall impression'):
-                title = "✨ Overall Impression"
-            elif section.lower().startswith('key strengths'):
-                title = "💪 Key Strengths"
-            elif section.lower().startswith('growth areas'):
-                title = "🌱 Growth Areas"
-            elif section.lower().startswith('life path insights'):
-                title = "🌊 Life Path Insights"
-            elif section.lower().startswith('deeper analysis'):
-                title = "🔮 Deeper Analysis"
-            else:
-                title = None
-            
-            if title:
-                content = section.split(':', 1)[1].strip() if ':' in section else section
-                console.print(f"\n[bold cyan]{title}[/bold cyan]")
-                if title in ["💪 Key Strengths", "🌱 Growth Areas"]:
-                    for line in content.split('\n'):
-                        if line.strip():
-                            console.print(f"• {line.strip()}")
-                else:
-                    console.print(content)
-            else:
-                console.print(section)
+    if stream is not None:
+        chunks = stream
+    else:
+        interpretation = report.get('analyses', {}).get('interpretation', '')
+        chunks = [interpretation] if isinstance(interpretation, str) and interpretation else []
+
+    for header, content in iter_sections(chunks):
+        _print_section(header, content)
+
+def _print_section(header, content):
+    """Print one interpretation section."""
+    title = SECTION_TITLES.get(header)
+    if not title:
+        if content:
+            console.print(content)
+        return
+
+    console.print(f"\n[bold cyan]{title}[/bold cyan]")
+    if header in ("Key Strengths", "Growth Areas"):
+        for line in content.split('\n'):
+            if line.strip():
+                console.print(f"• {line.strip()}")
+    else:
+        console.print(content)
 
 def _print_basic_interpretation(console, numerology, cultural, phonetics):
     """Fallback interpretation when AI is not available."""
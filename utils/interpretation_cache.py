@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from utils.config import get_env
+from utils import tracing
+
+# One cache file for every entry point (CLI, batch jobs and the Streamlit app)
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'interpretations.sqlite3'
+)
+
+class InterpretationCache:
+    """Disk-backed LLM interpretation cache with TTL and LRU size eviction.
+
+    Entries are keyed on a hash of the exact prompt plus provider, model and
+    temperature, so any change to the analysis data produces a new key.
+    Reads never write: access times for LRU eviction are kept in memory and
+    written in batches, at the latest by the next eviction pass or close().
+    """
+
+    # Eviction runs once every this many writes instead of on every insert
+    EVICTION_INTERVAL = 100
+
+    def __init__(self, path=None, ttl=None, max_entries=None):
+        self.path = path or get_env("INTERPRETATION_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.ttl = ttl if ttl is not None else get_env("INTERPRETATION_CACHE_TTL", 30 * 24 * 3600, float)
+        self.max_entries = max_entries or get_env("INTERPRETATION_CACHE_MAX_ENTRIES", 100000, int)
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        # {key: time} of hits whose accessed_at is not written yet
+        self._accessed = {}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS interpretations ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS interpretations_accessed ON interpretations (accessed_at)"
+        )
+
+    @staticmethod
+    def make_key(prompt, provider, model, temperature):
+        """Content address for one generation request."""
+        payload = json.dumps([provider, model, temperature, prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return the cached interpretation for key, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM interpretations WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                tracing.count('cache_misses')
+                return None
+            if self.ttl and now - row[1] > self.ttl:
+                # Expired rows are deleted by the next _evict, keeping reads free of writes
+                self.misses += 1
+                tracing.count('cache_misses')
+                return None
+            # Access times are written in batches, so a hit never takes the write lock
+            self._accessed[key] = now
+            if len(self._accessed) >= self.EVICTION_INTERVAL:
+                self._flush_accessed()
+            self.hits += 1
+            tracing.count('cache_hits')
+            return row[0]
+
+    def set(self, key, value):
+        """Store an interpretation, evicting least recently used entries over the size limit."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO interpretations (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            self._writes += 1
+            if self._writes % self.EVICTION_INTERVAL == 0:
+                self._evict()
+
+    def _flush_accessed(self):
+        """Write the access times of recent hits in one transaction."""
+        if not self._accessed:
+            return
+        updates = [(accessed_at, key, accessed_at) for key, accessed_at in self._accessed.items()]
+        self._accessed = {}
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.executemany(
+                "UPDATE interpretations SET accessed_at = ? WHERE key = ? AND accessed_at < ?", updates
+            )
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def _evict(self):
+        self._flush_accessed()
+        if self.ttl:
+            self._conn.execute("DELETE FROM interpretations WHERE created_at < ?", (time.time() - self.ttl,))
+        self._conn.execute(
+            "DELETE FROM interpretations WHERE key IN ("
+            "SELECT key FROM interpretations ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM interpretations")
+
+    def stats(self):
+        """Hit/miss counters for this process plus the current number of entries."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM interpretations").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries
+        }
+
+    def close(self):
+        with self._lock:
+            self._flush_accessed()
+            self._conn.close()
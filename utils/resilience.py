@@ -0,0 +1,249 @@
+import asyncio
+import random
+import threading
+import time
+from utils.config import get_env
+from utils import tracing
+
+# Error classes worth retrying, by name so neither openai, httpx nor requests has to be imported:
+# openai connection errors and timeouts, httpx transport errors, requests connection errors and timeouts
+RETRYABLE_ERROR_NAMES = {'APIConnectionError', 'APITimeoutError', 'TransportError', 'ConnectionError', 'Timeout'}
+
+class ProviderError(ConnectionError):
+    """An LLM provider answered with an HTTP error status."""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of calling a provider while its circuit breaker is open."""
+
+class Fallback(str):
+    """Text given in place of a provider's answer after ProviderGuard gave up; never cached or stored."""
+
+def is_retryable(error):
+    """True for rate limiting, overload, timeouts and connection failures; False for request errors."""
+    status_code = getattr(error, 'status_code', None)
+    if status_code is not None:
+        return status_code in (408, 429) or status_code >= 500
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, (ConnectionError, TimeoutError, asyncio.TimeoutError)):
+        return True
+    return any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(error).__mro__)
+
+def is_timeout(error):
+    """True if an error, or an error it was raised from, is a timeout."""
+    while error is not None:
+        if isinstance(error, (TimeoutError, asyncio.TimeoutError)):
+            return True
+        if any('Timeout' in cls.__name__ for cls in type(error).__mro__):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+def retry_after(error):
+    """Seconds asked for by a Retry-After header on the error's response, or None."""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """Refills `rate` units per minute up to `capacity`; a rate of 0 means unlimited."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount):
+        """Take amount units now, going into debt if needed; returns the seconds to wait first."""
+        if not self.rate:
+            return 0.0
+        # A request larger than the bucket waits for a full bucket rather than forever
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._level = min(self.capacity, self._level + (now - self._updated) * self.rate / 60.0)
+            self._updated = now
+            self._level -= amount
+            return max(0.0, -self._level * 60.0 / self.rate)
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute buckets in front of a provider."""
+
+    def __init__(self, requests_per_minute=0, tokens_per_minute=0):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    def _reserve(self, tokens):
+        return max(self.requests.reserve(1), self.tokens.reserve(tokens))
+
+    def acquire(self, tokens=0):
+        """Block until one request of about `tokens` tokens may be sent."""
+        delay = self._reserve(tokens)
+        if delay:
+            with tracing.span('llm.rate_limit', delay=delay):
+                time.sleep(delay)
+
+    async def acquire_async(self, tokens=0):
+        delay = self._reserve(tokens)
+        if delay:
+            with tracing.span('llm.rate_limit', delay=delay):
+                await asyncio.sleep(delay)
+
+class RetryPolicy:
+    """Exponential backoff with full jitter: attempt n waits uniform(0, min(max_delay, base_delay * 2**n))."""
+
+    def __init__(self, attempts=3, base_delay=0.5, max_delay=8.0):
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt, error=None):
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        # Honour a provider's Retry-After, within reason
+        requested = retry_after(error) if error is not None else None
+        if requested is not None:
+            delay = max(delay, min(requested, self.max_delay * 4))
+        return delay
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures and fails fast for `reset_timeout` seconds.
+
+    After the timeout one trial call is let through (half-open); its success
+    closes the circuit and its failure opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def check(self):
+        """Raise CircuitOpenError unless a call may go through now."""
+        if not self.failure_threshold:
+            return
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            # One trial call per reset_timeout; a trial that never reports back does not block the next
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._opened_at = time.monotonic()
+                return
+            tracing.count('llm_circuit_open')
+            raise CircuitOpenError("LLM provider unavailable (circuit open); retrying later")
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (self.failure_threshold and self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+class ProviderGuard:
+    """Rate limiting, retries and a circuit breaker around calls to one LLM provider.
+
+    Shared by the sync and async interpreters so both draw on the same limits
+    and see the same provider health.
+    """
+
+    def __init__(self, limiter=None, retry=None, breaker=None):
+        self.limiter = limiter or RateLimiter()
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        # Retried attempts so far, for reporting
+        self.retries = 0
+
+    @classmethod
+    def from_env(cls):
+        """Build a guard from the LLM_RATE_LIMIT_*, LLM_RETRY_* and LLM_BREAKER_* settings."""
+        return cls(
+            limiter=RateLimiter(
+                requests_per_minute=get_env("LLM_RATE_LIMIT_RPM", 0, int),
+                tokens_per_minute=get_env("LLM_RATE_LIMIT_TPM", 0, int)
+            ),
+            retry=RetryPolicy(
+                attempts=get_env("LLM_RETRY_ATTEMPTS", 3, int),
+                base_delay=get_env("LLM_RETRY_BASE_DELAY", 0.5, float),
+                max_delay=get_env("LLM_RETRY_MAX_DELAY", 8.0, float)
+            ),
+            breaker=CircuitBreaker(
+                failure_threshold=get_env("LLM_BREAKER_THRESHOLD", 5, int),
+                reset_timeout=get_env("LLM_BREAKER_RESET", 30.0, float)
+            )
+        )
+
+    def _record(self, error):
+        """Update the breaker after a failed attempt; returns True if it should be retried."""
+        if is_timeout(error):
+            tracing.count('llm_timeouts')
+        if is_retryable(error):
+            self.breaker.record_failure()
+            return True
+        # Any other answer (a bad request, an empty reply) still shows the provider is up
+        self.breaker.record_success()
+        return False
+
+    def call(self, func, tokens=0):
+        """Call func() with rate limiting and retries; raises its last error or CircuitOpenError."""
+        attempt = 0
+        while True:
+            self.breaker.check()
+            self.limiter.acquire(tokens)
+            try:
+                # One span per attempt, so retried requests show up separately
+                with tracing.span('llm.request', attempt=attempt + 1):
+                    result = func()
+            except Exception as e:
+                if not self._record(e) or attempt + 1 >= self.retry.attempts:
+                    raise
+                self.retries += 1
+                tracing.count('llm_retries')
+                time.sleep(self.retry.delay(attempt, e))
+                attempt += 1
+            else:
+                self.breaker.record_success()
+                return result
+
+    async def call_async(self, func, tokens=0):
+        """Await func() (a coroutine function) with rate limiting and retries."""
+        attempt = 0
+        while True:
+            self.breaker.check()
+            await self.limiter.acquire_async(tokens)
+            try:
+                # One span per attempt, so retried requests show up separately
+                with tracing.span('llm.request', attempt=attempt + 1):
+                    result = await func()
+            except Exception as e:
+                if not self._record(e) or attempt + 1 >= self.retry.attempts:
+                    raise
+                self.retries += 1
+                tracing.count('llm_retries')
+                await asyncio.sleep(self.retry.delay(attempt, e))
+                attempt += 1
+            else:
+                self.breaker.record_success()
+                return result
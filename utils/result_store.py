@@ -0,0 +1,122 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from utils.config import get_env
+
+DEFAULT_STORE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'results.sqlite3'
+)
+
+# Names per query; stays under SQLite's bound-parameter limit
+QUERY_CHUNK = 500
+
+class ResultStore:
+    """Per-name analysis results in SQLite, keyed on (name, analyzer, fingerprint).
+
+    Values are stored as JSON. Because the fingerprint is part of the key, a
+    changed analyzer starts with no results, and reverting the change makes
+    the older results valid again. prune() drops results from other versions.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or get_env("RESULT_STORE_PATH", DEFAULT_STORE_PATH)
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "name TEXT NOT NULL, analyzer TEXT NOT NULL, fingerprint TEXT NOT NULL, "
+            "value TEXT NOT NULL, updated_at REAL NOT NULL, "
+            "PRIMARY KEY (name, analyzer, fingerprint)) WITHOUT ROWID"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get_many(self, analyzer, fingerprint, names):
+        """{name: value} for the names that have a result under this analyzer version."""
+        names = list(names)
+        results = {}
+        with self._lock:
+            for start in range(0, len(names), QUERY_CHUNK):
+                chunk = names[start:start + QUERY_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT name, value FROM results WHERE analyzer = ? AND fingerprint = ? "
+                    f"AND name IN ({', '.join('?' * len(chunk))})",
+                    (analyzer, fingerprint, *chunk)
+                )
+                for name, value in rows:
+                    results[name] = json.loads(value)
+        return results
+
+    def get_keyed(self, analyzer, keys):
+        """{name: value} for (name, fingerprint) pairs, where each name has its own fingerprint."""
+        keys = list(keys)
+        results = {}
+        with self._lock:
+            # Two parameters per key
+            for start in range(0, len(keys), QUERY_CHUNK // 2):
+                chunk = keys[start:start + QUERY_CHUNK // 2]
+                rows = self._conn.execute(
+                    f"SELECT name, value FROM results WHERE analyzer = ? "
+                    f"AND (name, fingerprint) IN (VALUES {', '.join(['(?, ?)'] * len(chunk))})",
+                    (analyzer, *(part for key in chunk for part in key))
+                )
+                for name, value in rows:
+                    results[name] = json.loads(value)
+        return results
+
+    def put_many(self, analyzer, fingerprint, items):
+        """Store (name, value) pairs under one analyzer version in a single transaction."""
+        self.put_keyed(analyzer, ((name, fingerprint, value) for name, value in items))
+
+    def put_keyed(self, analyzer, items):
+        """Store (name, fingerprint, value) triples in a single transaction."""
+        now = time.time()
+        rows = [(name, analyzer, fingerprint, json.dumps(value, ensure_ascii=False), now)
+                for name, fingerprint, value in items]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO results (name, analyzer, fingerprint, value, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def prune(self, analyzer, fingerprint):
+        """Delete an analyzer's results from every version but this one; returns the rows removed."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM results WHERE analyzer = ? AND fingerprint != ?", (analyzer, fingerprint)
+            )
+            return cursor.rowcount
+
+    def stats(self):
+        """{analyzer: {fingerprint: result count}}."""
+        stats = {}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT analyzer, fingerprint, COUNT(*) FROM results GROUP BY analyzer, fingerprint"
+            ).fetchall()
+        for analyzer, fingerprint, count in rows:
+            stats.setdefault(analyzer, {})[fingerprint] = count
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,62 @@
+# Section headers the LLM is asked to produce, in display order
+SECTION_HEADERS = [
+    'Overall Impression',
+    'Key Strengths',
+    'Growth Areas',
+    'Life Path Insights',
+    'Deeper Analysis'
+]
+
+def match_header(line):
+    """Return (header, rest_of_line) if line starts an interpretation section, else (None, None)."""
+    stripped = line.strip().lstrip('#* ').strip()
+    for header in SECTION_HEADERS:
+        if stripped.lower().startswith(header.lower()):
+            rest = stripped[len(header):].lstrip(':* ').strip()
+            return header, rest
+    return None, None
+
+def iter_sections(chunks):
+    """Yield (header, content) pairs as soon as each section of the text is complete.
+
+    chunks can be a whole interpretation in a list or tokens streamed from the
+    LLM. A section is complete when the next header arrives or the text ends;
+    text before the first header is yielded with header None.
+    """
+    header = None
+    lines = []
+    buffer = ''
+
+    def feed(line):
+        nonlocal header, lines
+        new_header, rest = match_header(line)
+        if new_header is None:
+            lines.append(line)
+            return None
+        finished = (header, '\n'.join(lines).strip())
+        header, lines = new_header, [rest] if rest else []
+        return finished
+
+    for chunk in chunks:
+        buffer += chunk
+        *complete, buffer = buffer.split('\n')
+        for line in complete:
+            finished = feed(line)
+            if finished and (finished[0] or finished[1]):
+                yield finished
+
+    if buffer:
+        finished = feed(buffer)
+        if finished and (finished[0] or finished[1]):
+            yield finished
+
+    content = '\n'.join(lines).strip()
+    if header or content:
+        yield header, content
+
+def parse_sections(text):
+    """Split a complete interpretation into a {header: content} dict."""
+    sections = {}
+    for header, content in iter_sections([text]):
+        sections[header] = f"{sections[header]}\n{content}" if header in sections else content
+    return sections
@@ -0,0 +1,349 @@
+import atexit
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+import warnings
+from bisect import bisect_left
+from contextvars import ContextVar
+from utils.config import get_env
+
+DEFAULT_JSONL_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'traces.jsonl'
+)
+
+# The innermost open span of the current thread or asyncio task
+_current = ContextVar('current_span', default=None)
+_span_ids = itertools.count(1)
+# Wall-clock time at perf_counter_ns() == 0, so spans need only one clock read to start
+_EPOCH_OFFSET = time.time() - time.perf_counter_ns() / 1e9
+
+class Span:
+    """One timed stage; use as a context manager. Spans opened inside it become its children."""
+
+    __slots__ = ('tracer', 'name', 'attributes', 'counters', 'span_id', 'trace_id', 'parent',
+                 'start_ns', 'duration_ns', 'error', 'data', '_token')
+
+    def __init__(self, tracer, name, attributes):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        # Counters incremented while this span was the innermost one
+        self.counters = {}
+        self.error = None
+        # Per-exporter state, such as the matching OpenTelemetry span
+        self.data = {}
+
+    def __enter__(self):
+        self.parent = _current.get()
+        self.span_id = next(_span_ids)
+        self.trace_id = self.parent.trace_id if self.parent is not None else self.span_id
+        self._token = _current.set(self)
+        self.start_ns = time.perf_counter_ns()
+        for exporter in self.tracer.exporters:
+            exporter.start(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.duration_ns = time.perf_counter_ns() - self.start_ns
+        _current.reset(self._token)
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        for exporter in self.tracer.exporters:
+            exporter.end(self)
+        return False
+
+    @property
+    def start_time(self):
+        """Wall-clock start, in seconds since the epoch."""
+        return _EPOCH_OFFSET + self.start_ns / 1e9
+
+    def set(self, key, value):
+        self.attributes[key] = value
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent.span_id if self.parent is not None else None,
+            'start': self.start_time,
+            'duration_ms': self.duration_ns / 1e6,
+            'attributes': self.attributes,
+            'counters': self.counters,
+            'error': self.error
+        }
+
+class _NoOpSpan:
+    """What span() returns while tracing is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def set(self, key, value):
+        pass
+
+NOOP_SPAN = _NoOpSpan()
+
+class Exporter:
+    """Receives every span as it starts and ends, and every counter increment."""
+
+    def start(self, span):
+        pass
+
+    def end(self, span):
+        pass
+
+    def count(self, name, value):
+        pass
+
+    def close(self):
+        pass
+
+class HistogramExporter(Exporter):
+    """Latency histograms per span name, kept in memory with log-spaced buckets.
+
+    Bucket bounds grow by 2**(1/4) from 1 microsecond, so percentiles are
+    read to within about 19% in a few hundred bytes per span name.
+    """
+
+    BOUNDS_NS = [int(1000 * 2 ** (i / 4)) for i in range(128)]
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def end(self, span):
+        bucket = bisect_left(self.BOUNDS_NS, span.duration_ns)
+        with self._lock:
+            histogram = self._histograms.get(span.name)
+            if histogram is None:
+                histogram = self._histograms[span.name] = {
+                    'count': 0, 'errors': 0, 'total_ns': 0, 'max_ns': 0, 'buckets': [0] * (len(self.BOUNDS_NS) + 1)
+                }
+            histogram['count'] += 1
+            histogram['errors'] += span.error is not None
+            histogram['total_ns'] += span.duration_ns
+            histogram['max_ns'] = max(histogram['max_ns'], span.duration_ns)
+            histogram['buckets'][bucket] += 1
+
+    def _percentile(self, histogram, fraction):
+        """Upper bound of the bucket holding the given fraction of spans, capped at the maximum."""
+        target = fraction * histogram['count']
+        seen = 0
+        for bucket, count in enumerate(histogram['buckets']):
+            seen += count
+            if seen >= target:
+                bound = self.BOUNDS_NS[bucket] if bucket < len(self.BOUNDS_NS) else histogram['max_ns']
+                return min(bound, histogram['max_ns'])
+        return histogram['max_ns']
+
+    def summary(self):
+        """{span name: count, errors, mean, p50, p90, p99 and max in milliseconds}, slowest total first."""
+        with self._lock:
+            histograms = {name: dict(histogram, buckets=list(histogram['buckets']))
+                          for name, histogram in self._histograms.items()}
+        summary = {}
+        for name, histogram in sorted(histograms.items(), key=lambda item: -item[1]['total_ns']):
+            summary[name] = {
+                'count': histogram['count'],
+                'errors': histogram['errors'],
+                'total_ms': histogram['total_ns'] / 1e6,
+                'mean_ms': histogram['total_ns'] / histogram['count'] / 1e6,
+                'p50_ms': self._percentile(histogram, 0.5) / 1e6,
+                'p90_ms': self._percentile(histogram, 0.9) / 1e6,
+                'p99_ms': self._percentile(histogram, 0.99) / 1e6,
+                'max_ms': histogram['max_ns'] / 1e6
+            }
+        return summary
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+class JSONLinesExporter(Exporter):
+    """Appends one JSON object per finished span to a file, opened when the first span ends."""
+
+    def __init__(self, path=None):
+        self.path = path or get_env("TRACING_JSONL_PATH", DEFAULT_JSONL_PATH)
+        self._handle = None
+        self._lock = threading.Lock()
+
+    def end(self, span):
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            if self._handle is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                # Line buffered, so each span is written in one append
+                self._handle = open(self.path, 'a', encoding='utf-8', buffering=1)
+            self._handle.write(line + '\n')
+
+    def close(self):
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+class OpenTelemetryExporter(Exporter):
+    """Mirrors spans and counters into OpenTelemetry (requires opentelemetry-api).
+
+    Spans go to the globally configured tracer provider and counters to the
+    meter provider, so exporting them is set up the usual OpenTelemetry way.
+    """
+
+    def __init__(self, name='name-analyzer'):
+        try:
+            from opentelemetry import trace, metrics
+        except ImportError:
+            raise ImportError("OpenTelemetry tracing requires opentelemetry-api: pip install opentelemetry-api")
+        self._trace = trace
+        self._tracer = trace.get_tracer(name)
+        self._meter = metrics.get_meter(name)
+        self._counters = {}
+
+    def start(self, span):
+        parent = span.parent.data.get('otel') if span.parent is not None else None
+        context = self._trace.set_span_in_context(parent) if parent is not None else None
+        span.data['otel'] = self._tracer.start_span(
+            span.name, context=context, start_time=int(span.start_time * 1e9)
+        )
+
+    def end(self, span):
+        otel_span = span.data.pop('otel', None)
+        if otel_span is None:
+            return
+        for key, value in span.attributes.items():
+            otel_span.set_attribute(key, value if isinstance(value, (str, bool, int, float)) else str(value))
+        for key, value in span.counters.items():
+            otel_span.set_attribute(f"count.{key}", value)
+        if span.error is not None:
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, span.error))
+        otel_span.end()
+
+    def count(self, name, value):
+        counter = self._counters.get(name)
+        if counter is None:
+            counter = self._counters[name] = self._meter.create_counter(name)
+        counter.add(value)
+
+# Exporter names accepted in TRACING_EXPORTERS
+EXPORTERS = {
+    'histogram': HistogramExporter,
+    'jsonl': JSONLinesExporter,
+    'otel': OpenTelemetryExporter
+}
+
+class Tracer:
+    """Spans and counters fanned out to a list of exporters; disabled while the list is empty."""
+
+    def __init__(self, exporters=()):
+        self.exporters = list(exporters)
+        self.enabled = bool(self.exporters)
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """Build a tracer from TRACING_EXPORTERS, a comma-separated list such as 'histogram,jsonl'.
+
+        Unknown names and exporters whose dependencies are missing are skipped
+        with a warning, so a bad setting never stops the program.
+        """
+        names = [name.strip() for name in get_env("TRACING_EXPORTERS", "").split(',') if name.strip()]
+        exporters = []
+        for name in names:
+            if name not in EXPORTERS:
+                warnings.warn(f"Ignoring unknown tracing exporter: {name} (expected one of {', '.join(EXPORTERS)})")
+                continue
+            try:
+                exporters.append(EXPORTERS[name]())
+            except ImportError as e:
+                warnings.warn(f"Ignoring tracing exporter {name}: {str(e)}")
+        return cls(exporters)
+
+    def add_exporter(self, exporter):
+        self.exporters.append(exporter)
+        self.enabled = True
+        return exporter
+
+    def find(self, exporter_type):
+        """The first exporter of the given type, or None."""
+        return next((exporter for exporter in self.exporters if isinstance(exporter, exporter_type)), None)
+
+    def span(self, name, **attributes):
+        if not self.enabled:
+            return NOOP_SPAN
+        return Span(self, name, attributes)
+
+    def count(self, name, value=1):
+        """Add to a process-wide counter and to the innermost open span's counters."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+        current = _current.get()
+        if current is not None:
+            current.counters[name] = current.counters.get(name, 0) + value
+        for exporter in self.exporters:
+            exporter.count(name, value)
+
+    def reset(self):
+        """Clear the counters and any in-memory histograms."""
+        with self._lock:
+            self.counters.clear()
+        for exporter in self.exporters:
+            if isinstance(exporter, HistogramExporter):
+                exporter.reset()
+
+    def close(self):
+        for exporter in self.exporters:
+            exporter.close()
+        self.exporters = []
+        self.enabled = False
+
+# Process-wide tracer, configured from the environment on first use
+_tracer = None
+_tracer_lock = threading.Lock()
+
+def get_tracer():
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                tracer = Tracer.from_env()
+                atexit.register(tracer.close)
+                _tracer = tracer
+    return _tracer
+
+def span(name, **attributes):
+    """Context manager timing one stage; a shared no-op object while tracing is disabled."""
+    tracer = _tracer or get_tracer()
+    if not tracer.enabled:
+        return NOOP_SPAN
+    return Span(tracer, name, attributes)
+
+def count(name, value=1):
+    """Increment a counter such as cache_hits, llm_retries or llm_timeouts."""
+    tracer = _tracer or get_tracer()
+    if tracer.enabled:
+        tracer.count(name, value)
+
+def traced(name):
+    """Decorator running each call of a function inside span(name)."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer or get_tracer()
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with Span(tracer, name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator